@@ -0,0 +1,511 @@
+"""Arduino 직렬 통신 프로토콜 + 가상 장치 (하드웨어 없이 HIL 테스트)
+
+PC 쪽 시뮬레이터가 냉장고 물리(플랜트)를 돌리고, 제어 결정은 직렬선 건너편 Arduino 가 한다.
+- 위로 (PC → Arduino): SENSOR 프레임 - 온도 / 희망 온도 / 현재 액추에이터 상태
+- 아래로 (Arduino → PC): COMMAND 프레임 - 압축기 / 댐퍼 명령 + 어느 SENSOR 에 대한 답인지(ack)
+
+프레임 (little endian):
+    AA 55 | type(1) | seq(2) | len(1) | payload(len) | crc16(2)
+crc16 은 type ~ payload 에 대한 CRC-16/CCITT-FALSE (다항식 0x1021, 초기값 0xFFFF).
+수신 쪽은 CRC 가 틀리면 1바이트 밀어서 다시 동기를 찾고, seq 가 건너뛰면 잃은 프레임으로 센다.
+
+전송 계층 (write(bytes) / read() → 지금까지 온 bytes, 막히지 않음):
+- loopback_pair: 메모리 안의 가상 직렬선, baudrate 에 맞춰 전송 지연 (8N1 = 바이트당 10비트)
+- pty_pair: POSIX 의사 터미널 - 실제 직렬 포트와 같은 fd I/O (다른 프로세스가 device.name 을 열 수도 있음,
+  Windows 에서는 못 씀 - 모듈 import 는 되고 pty_pair() 를 부를 때만 ImportError)
+- SerialTransport: 실제 직렬 포트 (pyserial 필요)
+
+ArduinoBridge 를 FridgeEngine(link=...) 로 붙이면 제어기 자리에 들어간다.
+매 틱 센서 프레임을 보내고 (batch 개씩 모아서 한 번에 쓸 수 있음), 받은 명령을 적용하며,
+timeout 초 넘게 응답이 없으면 통신 두절(긴급 정지), 다시 응답이 오면 재연결로 처리한다.
+센서 프레임을 보낸 시각 → 그 답 명령을 받은 시각을 제어 루프 지연으로 집계한다.
+
+사용 예 (한 스레드, 시뮬레이션 시간 기준이라 결정론적):
+    clock = SimClock()
+    host, device = loopback_pair(115200, clock=lambda: clock.elapsed)
+    engine = FridgeEngine(seed=1, clock=clock, link=ArduinoBridge(host, timeout=1.0))
+    run_loopback(engine, VirtualArduino(device), ticks=6000)
+    print(engine.link.summary())
+"""
+import argparse
+import binascii
+import math
+import os
+import struct
+import threading
+import time
+from collections import deque, namedtuple
+
+import numpy as np
+
+from controllers import Controller, HysteresisController
+from fridge_engine import FridgeEngine, ControlState, ControlOutput
+from running_stats import RunningStats
+from sim_clock import SimClock, Pacer, TICK_SECONDS
+
+SYNC = b"\xaa\x55"
+HEADER = struct.Struct("<BHB")              # type, seq, len
+CRC = struct.Struct("<H")
+SENSOR_PAYLOAD = struct.Struct("<hhhhB")    # 온도 4개 (0.01°C 단위) + 상태 비트
+COMMAND_PAYLOAD = struct.Struct("<HB")      # ack(답하는 SENSOR seq) + 명령 비트
+FRAME_OVERHEAD = len(SYNC) + HEADER.size + CRC.size
+MAX_PAYLOAD = 32        # 이보다 긴 len 은 깨진 헤더 (긴 프레임을 기다리느라 멈추지 않게)
+
+# 프레임 종류
+SENSOR = 0x01
+COMMAND = 0x02
+
+# 상태 / 명령 비트
+COMPRESSOR_BIT = 0x01
+DAMPER_BIT = 0x02
+FRIDGE_OK_BIT = 0x04
+FREEZER_OK_BIT = 0x08
+
+BITS_PER_BYTE = 10      # 8N1: 시작 비트 + 8 데이터 + 정지 비트
+
+Frame = namedtuple("Frame", ["kind", "seq", "payload"])
+
+
+def crc16(data):
+    """CRC-16/CCITT-FALSE"""
+    return binascii.crc_hqx(data, 0xFFFF)
+
+
+def encode(kind, seq, payload):
+    """프레임 하나 → bytes"""
+    body = HEADER.pack(kind, seq & 0xFFFF, len(payload)) + payload
+    return SYNC + body + CRC.pack(crc16(body))
+
+
+def _centi(temp):
+    return 0 if math.isnan(temp) else int(round(temp * 100))
+
+
+def encode_sensor(seq, state, fridge_ok=True, freezer_ok=True):
+    """ControlState → SENSOR 프레임 (고장난 센서는 비트로 표시)"""
+    flags = ((COMPRESSOR_BIT if state.compressor_on else 0) |
+             (DAMPER_BIT if state.damper_open else 0) |
+             (FRIDGE_OK_BIT if fridge_ok else 0) |
+             (FREEZER_OK_BIT if freezer_ok else 0))
+    payload = SENSOR_PAYLOAD.pack(_centi(state.fridge_temp), _centi(state.freezer_temp),
+                                  _centi(state.fridge_target), _centi(state.freezer_target), flags)
+    return encode(SENSOR, seq, payload)
+
+
+def decode_sensor(payload):
+    """SENSOR payload → (ControlState, 두 센서 모두 정상인지)"""
+    fridge, freezer, fridge_target, freezer_target, flags = SENSOR_PAYLOAD.unpack(payload)
+    state = ControlState(fridge / 100, freezer / 100, fridge_target / 100, freezer_target / 100,
+                         bool(flags & COMPRESSOR_BIT), bool(flags & DAMPER_BIT))
+    return state, bool(flags & FRIDGE_OK_BIT) and bool(flags & FREEZER_OK_BIT)
+
+
+def encode_command(seq, ack, output):
+    flags = (COMPRESSOR_BIT if output.compressor_on else 0) | \
+            (DAMPER_BIT if output.damper_open else 0)
+    return encode(COMMAND, seq, COMMAND_PAYLOAD.pack(ack & 0xFFFF, flags))
+
+
+def decode_command(payload):
+    """COMMAND payload → (ack, ControlOutput)"""
+    ack, flags = COMMAND_PAYLOAD.unpack(payload)
+    return ack, ControlOutput(bool(flags & COMPRESSOR_BIT), bool(flags & DAMPER_BIT))
+
+
+class FrameDecoder:
+    """바이트 스트림 → 프레임 (조각나서 와도 되고, 깨진 부분은 건너뜀)"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.crc_errors = 0     # CRC / 헤더가 깨진 프레임
+        self.lost = 0           # seq 가 건너뛴 만큼 (중간에 잃은 프레임 수)
+        self._next_seq = {}     # 종류별 다음에 올 seq
+
+    def feed(self, data):
+        """받은 bytes 추가 → 완성된 프레임 리스트"""
+        buf = self.buffer
+        buf += data
+        frames = []
+        while True:
+            start = buf.find(SYNC)
+            if start < 0:
+                # 동기 바이트 앞부분만 온 경우를 위해 마지막 1바이트는 남김
+                del buf[:max(0, len(buf) - 1)]
+                break
+            if start:
+                del buf[:start]
+            if len(buf) < len(SYNC) + HEADER.size:
+                break
+            kind, seq, length = HEADER.unpack_from(buf, len(SYNC))
+            if length > MAX_PAYLOAD:
+                self.crc_errors += 1
+                del buf[:1]
+                continue
+            end = FRAME_OVERHEAD + length
+            if len(buf) < end:
+                break
+            body = bytes(buf[len(SYNC):end - CRC.size])
+            if CRC.unpack_from(buf, end - CRC.size)[0] != crc16(body):
+                self.crc_errors += 1
+                del buf[:1]
+                continue
+            del buf[:end]
+            self._count_seq(kind, seq)
+            frames.append(Frame(kind, seq, body[HEADER.size:]))
+        return frames
+
+    def _count_seq(self, kind, seq):
+        expected = self._next_seq.get(kind)
+        if expected is not None and seq != expected:
+            self.lost += (seq - expected) & 0xFFFF
+        self._next_seq[kind] = (seq + 1) & 0xFFFF
+
+
+# === 전송 계층 ===
+class LoopbackTransport:
+    """메모리 안의 가상 직렬선 한쪽 끝 (loopback_pair 로 생성)
+
+    보낸 bytes 는 baudrate 에 맞춘 전송 시간이 지나야 건너편에서 읽힌다 (선은 한 번에 하나씩).
+    byte_error_rate 를 주면 그 확률로 바이트를 깨뜨린다 (CRC 확인용).
+    """
+
+    def __init__(self, baudrate=115200, clock=time.monotonic, byte_error_rate=0.0, seed=None):
+        self.baudrate = baudrate
+        self.clock = clock
+        self.byte_error_rate = byte_error_rate
+        self.rng = np.random.default_rng(seed)
+        self.peer = None
+        self.inbox = deque()        # (도착 시각, bytes)
+        self.busy_until = -math.inf
+        self.bytes_sent = 0
+        self.name = "loopback"
+
+    def write(self, data):
+        now = self.clock()
+        start = max(now, self.busy_until)
+        done = start + len(data) * BITS_PER_BYTE / self.baudrate if self.baudrate else start
+        self.busy_until = done
+        if self.byte_error_rate:
+            data = bytearray(data)
+            for i in np.flatnonzero(self.rng.random(len(data)) < self.byte_error_rate):
+                data[i] ^= 0xFF
+        self.peer.inbox.append((done, bytes(data)))
+        self.bytes_sent += len(data)
+
+    def read(self):
+        now = self.clock()
+        inbox = self.inbox
+        out = bytearray()
+        while inbox and inbox[0][0] <= now:
+            out += inbox.popleft()[1]
+        return bytes(out)
+
+    def close(self):
+        pass
+
+
+def loopback_pair(baudrate=115200, clock=time.monotonic, byte_error_rate=0.0, seed=None):
+    """(PC 쪽, 장치 쪽) 가상 직렬선 한 쌍"""
+    host = LoopbackTransport(baudrate, clock, byte_error_rate, seed)
+    device = LoopbackTransport(baudrate, clock, byte_error_rate,
+                               None if seed is None else seed + 1)
+    host.peer, device.peer = device, host
+    return host, device
+
+
+class PtyTransport:
+    """POSIX 의사 터미널의 한쪽 fd (raw 모드, 막히지 않는 읽기)"""
+
+    def __init__(self, fd, name):
+        self.fd = fd
+        self.name = name
+        os.set_blocking(fd, False)
+        self.bytes_sent = 0
+
+    def write(self, data):
+        view = memoryview(data)
+        while view:
+            try:
+                n = os.write(self.fd, view)
+            except BlockingIOError:
+                time.sleep(0.001)   # 받는 쪽이 읽어서 자리가 날 때까지
+                continue
+            view = view[n:]
+        self.bytes_sent += len(data)
+
+    def read(self):
+        try:
+            return os.read(self.fd, 4096)
+        except (BlockingIOError, OSError):
+            return b""
+
+    def close(self):
+        os.close(self.fd)
+
+
+def pty_pair():
+    """(PC 쪽, 장치 쪽) 의사 터미널 한 쌍 - 장치 쪽 name 은 /dev/pts/N 경로 (POSIX 전용)"""
+    try:
+        import tty
+    except ImportError:
+        raise ImportError("pty_pair() 는 POSIX(리눅스 / macOS) 에서만 쓸 수 있습니다")
+    master, slave = os.openpty()
+    tty.setraw(master)
+    tty.setraw(slave)
+    return PtyTransport(master, "pty-master"), PtyTransport(slave, os.ttyname(slave))
+
+
+class SerialTransport:
+    """실제 직렬 포트 (pyserial 필요)"""
+
+    def __init__(self, port, baudrate=115200):
+        try:
+            import serial
+        except ImportError:
+            raise ImportError("SerialTransport 는 pyserial 이 필요합니다: pip install pyserial")
+        self.serial = serial.Serial(port, baudrate, timeout=0, write_timeout=1.0)
+        self.name = port
+        self.bytes_sent = 0
+
+    def write(self, data):
+        self.serial.write(data)
+        self.bytes_sent += len(data)
+
+    def read(self):
+        waiting = self.serial.in_waiting
+        return self.serial.read(waiting) if waiting else b""
+
+    def close(self):
+        self.serial.close()
+
+
+# === PC 쪽 ===
+class ArduinoBridge(Controller):
+    """PC(물리 시뮬레이터) 쪽 링크 - FridgeEngine(link=...) 로 붙임
+
+    poll(engine) 은 엔진이 매 틱 제어 전에 부른다 (통신 두절 중에도):
+    받은 명령 반영 → 타임아웃 확인 → 이번 틱 센서 프레임 전송.
+    decide() 는 가장 최근에 받은 명령을 돌려준다 (아직 없으면 현재 상태 유지).
+    clock 이 None 이면 엔진의 시뮬레이션 시간을 쓴다.
+    """
+
+    def __init__(self, transport, timeout=1.0, batch=1, clock=None):
+        self.transport = transport
+        self.timeout = timeout
+        self.batch = batch          # 센서 프레임 batch 개를 모아서 한 번에 씀
+        self.clock = clock
+        self.decoder = FrameDecoder()
+        self.seq = 0
+        self.pending = bytearray()
+        self.pending_frames = 0
+        self.sent_at = [math.nan] * 0x10000     # seq → 보낸 시각
+        self.command = None
+        self.now = 0.0
+        self.last_rx = None
+        self.frames_sent = 0
+        self.frames_received = 0
+        self.timeouts = 0
+        self.latency = RunningStats(percentiles=(0.5, 0.95, 0.99))
+
+    def poll(self, engine):
+        now = self.now = self.clock() if self.clock is not None else engine.clock.elapsed
+        if self.last_rx is None:
+            self.last_rx = now      # 타임아웃은 시작 시각부터
+
+        for frame in self.decoder.feed(self.transport.read()):
+            if frame.kind != COMMAND:
+                continue
+            ack, output = decode_command(frame.payload)
+            sent = self.sent_at[ack]
+            if not math.isnan(sent):
+                self.latency.add(now - sent)
+                self.sent_at[ack] = math.nan
+            self.command = output
+            self.last_rx = now
+            self.frames_received += 1
+
+        if now - self.last_rx > self.timeout:
+            if engine.arduino_connected and engine.lose_link():
+                self.timeouts += 1
+        elif not engine.arduino_connected:
+            engine.restore_link()
+
+        self.send(engine, now)
+
+    def send(self, engine, now):
+        """이번 틱 센서 프레임 추가 (batch 개가 모이면 전송)"""
+        fridge, freezer = engine.measured()
+        state = ControlState(fridge, freezer, engine.fridge_target, engine.freezer_target,
+                             engine.compressor_on, engine.damper_open)
+        seq = self.seq
+        self.pending += encode_sensor(seq, state, engine.fridge_sensor_ok, engine.freezer_sensor_ok)
+        self.sent_at[seq] = now
+        self.seq = (seq + 1) & 0xFFFF
+        self.pending_frames += 1
+        if self.pending_frames >= self.batch:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            self.transport.write(bytes(self.pending))
+            self.frames_sent += self.pending_frames
+            self.pending.clear()
+            self.pending_frames = 0
+
+    def init_memory(self, n=None):
+        return None
+
+    def decide(self, state, memory, dt):
+        if self.command is None:
+            return ControlOutput(state.compressor_on, state.damper_open), memory
+        return self.command, memory
+
+    def summary(self):
+        """링크 통계 dict (지연은 초)"""
+        latency = self.latency
+        return {
+            "frames_sent": self.frames_sent,
+            "frames_received": self.frames_received,
+            "bytes_sent": self.transport.bytes_sent,
+            "crc_errors": self.decoder.crc_errors,
+            "lost": self.decoder.lost,
+            "timeouts": self.timeouts,
+            "latency_mean": latency.mean if latency.count else math.nan,
+            "latency_p50": latency.percentile(0.5) if latency.count else math.nan,
+            "latency_p95": latency.percentile(0.95) if latency.count else math.nan,
+            "latency_p99": latency.percentile(0.99) if latency.count else math.nan,
+            "latency_max": latency.max if latency.count else math.nan,
+        }
+
+
+# === 장치 쪽 ===
+class VirtualArduino:
+    """가상 Arduino 펌웨어 - SENSOR 프레임마다 controller 로 결정해서 COMMAND 로 답함
+
+    한 번에 받은 프레임들의 답은 한 번에 쓴다 (배치로 오면 배치로 답함).
+    센서 고장 비트가 있으면 긴급 정지 명령. hung = True 면 받은 것을 버리고 답하지 않는다.
+    """
+
+    def __init__(self, transport, controller=None, params=None, dt=TICK_SECONDS):
+        self.transport = transport
+        self.controller = controller if controller is not None else HysteresisController(params)
+        self.memory = self.controller.init_memory()
+        self.dt = dt
+        self.decoder = FrameDecoder()
+        self.seq = 0
+        self.hung = False
+        self.frames_received = 0
+        self.frames_sent = 0
+
+    def poll(self):
+        data = self.transport.read()
+        if self.hung or not data:
+            return
+        out = bytearray()
+        for frame in self.decoder.feed(data):
+            if frame.kind != SENSOR:
+                continue
+            self.frames_received += 1
+            state, sensors_ok = decode_sensor(frame.payload)
+            if sensors_ok:
+                output, self.memory = self.controller.decide(state, self.memory, self.dt)
+            else:
+                output = ControlOutput(False, False)
+            out += encode_command(self.seq, frame.seq, output)
+            self.seq = (self.seq + 1) & 0xFFFF
+            self.frames_sent += 1
+        if out:
+            self.transport.write(bytes(out))
+
+    def serve(self, stop, interval=0.0005):
+        """stop(threading.Event) 이 설정될 때까지 poll 반복 (별도 스레드용)"""
+        while not stop.is_set():
+            self.poll()
+            time.sleep(interval)
+
+
+def run_loopback(engine, device, ticks, on_tick=None):
+    """한 스레드에서 가상 Arduino 와 엔진을 번갈아 진행 (시뮬레이션 시간이면 결정론적)"""
+    for _ in range(ticks):
+        if on_tick is not None:
+            on_tick(engine.clock.ticks)
+        device.poll()
+        engine.step()
+
+
+def format_summary(summary):
+    ms = 1000.0
+    return "\n".join([
+        f"프레임: 보냄 {summary['frames_sent']} / 받음 {summary['frames_received']} "
+        f"({summary['bytes_sent']} bytes)",
+        f"CRC 오류 {summary['crc_errors']} / 잃은 프레임 {summary['lost']} / "
+        f"타임아웃 {summary['timeouts']}",
+        f"제어 루프 지연 (ms): 평균 {summary['latency_mean'] * ms:.2f} / "
+        f"50% {summary['latency_p50'] * ms:.2f} / 95% {summary['latency_p95'] * ms:.2f} / "
+        f"99% {summary['latency_p99'] * ms:.2f} / 최대 {summary['latency_max'] * ms:.2f}",
+    ])
+
+
+# 실행
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="가상 Arduino 와 직렬 프로토콜로 HIL 실행")
+    parser.add_argument("--transport", choices=("loopback", "pty", "serial"), default="loopback")
+    parser.add_argument("--port", help="serial: 직렬 포트 (예: /dev/ttyACM0)")
+    parser.add_argument("--baud", type=int, default=115200)
+    parser.add_argument("--batch", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=1.0)
+    parser.add_argument("--seconds", type=float, default=600.0)
+    parser.add_argument("--speed", type=float, default=10.0, help="pty / serial: 벽시계 배속")
+    parser.add_argument("--hang-at", type=float, default=None, help="이 시각에 가상 장치 멈춤 (초)")
+    parser.add_argument("--hang-for", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="loopback: 바이트 오류 확률")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    clock = SimClock()
+    device = None
+    if args.transport == "loopback":
+        host, device_end = loopback_pair(args.baud, clock=lambda: clock.elapsed,
+                                          byte_error_rate=args.error_rate, seed=args.seed)
+        bridge = ArduinoBridge(host, args.timeout, args.batch)
+        device = VirtualArduino(device_end)
+    elif args.transport == "pty":
+        host, device_end = pty_pair()
+        bridge = ArduinoBridge(host, args.timeout, args.batch, clock=time.monotonic)
+        device = VirtualArduino(device_end)
+    else:
+        if not args.port:
+            parser.error("--transport serial 은 --port 가 필요합니다")
+        host = SerialTransport(args.port, args.baud)
+        bridge = ArduinoBridge(host, args.timeout, args.batch, clock=time.monotonic)
+
+    engine = FridgeEngine(seed=args.seed, clock=clock, link=bridge)
+    ticks = clock.seconds_to_ticks(args.seconds)
+
+    hang = None
+    if args.hang_at is not None and device is not None:
+        start = clock.seconds_to_ticks(args.hang_at)
+        hang = (start, start + clock.seconds_to_ticks(args.hang_for))
+
+    def on_tick(tick):
+        if hang is not None:
+            device.hung = hang[0] <= tick < hang[1]
+
+    if args.transport == "loopback":
+        run_loopback(engine, device, ticks, on_tick)
+    else:
+        stop = threading.Event()
+        if device is not None:
+            threading.Thread(target=device.serve, args=(stop,), daemon=True).start()
+        pacer = Pacer(args.speed)
+        for _ in range(ticks):
+            on_tick(clock.ticks)
+            engine.step()
+            pacer.wait(clock.elapsed)
+        stop.set()
+
+    print(f"전송: {args.transport} ({host.name}), {args.baud} baud, batch {args.batch}")
+    print(format_summary(bridge.summary()))
+    print(f"냉장실 평균 {engine.fridge_stats.mean:.2f}°C, 냉동실 평균 {engine.freezer_stats.mean:.2f}°C")
+    for event in list(engine.events)[-6:]:
+        print(engine.events.format(event))
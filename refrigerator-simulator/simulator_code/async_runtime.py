@@ -0,0 +1,234 @@
+"""asyncio 기반 시뮬레이션 런타임 (한 프로세스에 유닛 수천 대)
+
+physics_loop 처럼 유닛마다 OS 스레드를 쓰는 대신, 유닛마다 코루틴 하나가
+공유 이벤트 루프 위에서 FridgeEngine.step() (제어 → 물리 → 기록) 을 반복한다.
+
+- speed=None: 시뮬레이션 시계만 사용 (sleep 없음, CPU 가 허락하는 만큼 빠르게)
+- speed=1.0, 10.0, ...: 벽시계 기준 배속에 맞춰 asyncio.sleep
+
+유닛 하나의 메모리를 작게 유지하려고 기본 엔진은 이벤트 로그 event_capacity 개,
+노이즈 블록 block_size 개로 만든다 (기본 FridgeEngine 은 약 3.5MB, 여기서는 수십 KB).
+
+유닛 상태는 subscribe() 로 구독한다. 구독마다 크기 제한 큐가 있고,
+큐가 찼을 때 정책을 고른다:
+- BLOCK: 유닛이 기다린다 (느린 구독자가 그 유닛의 진행 속도를 늦춤 = 백프레셔)
+- DROP_OLDEST: 가장 오래된 프레임을 버리고 넣는다 (항상 최신 상태 유지)
+- DROP_NEWEST: 새 프레임을 버린다
+
+사용 예:
+    async def main():
+        runtime = AsyncRuntime()
+        for i in range(2000):
+            runtime.add_unit(i)
+        sub = runtime.subscribe(0, maxsize=8, policy=DROP_OLDEST)
+        await runtime.run(ticks=36000)
+
+    asyncio.run(main())
+"""
+import asyncio
+import time
+
+from fridge_engine import FridgeEngine
+
+# 큐가 찼을 때 정책
+BLOCK = "block"
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+
+# add_unit 이 만드는 기본 엔진 크기 (유닛 수천 대 기준)
+UNIT_EVENT_CAPACITY = 1024
+UNIT_BLOCK_SIZE = 1024
+
+
+class Subscription:
+    """유닛 하나의 StateFrame 스트림 (async for 로 읽음, 유닛이 멈추면 끝남)"""
+
+    _END = object()
+
+    def __init__(self, unit_id, maxsize=16, policy=BLOCK, every=1):
+        if policy not in (BLOCK, DROP_OLDEST, DROP_NEWEST):
+            raise ValueError(f"unknown policy: {policy}")
+        self.unit_id = unit_id
+        self.policy = policy
+        self.every = every          # every 틱마다 한 프레임
+        self.queue = asyncio.Queue(maxsize)
+        self.delivered = 0
+        self.dropped = 0
+        self.ended = False      # 유닛 쪽에서 더 보낼 프레임 없음 (또는 구독 해지)
+        self.closed = False     # 읽는 쪽에서 끝까지 다 읽음
+        self._ended = asyncio.Event()   # 꽉 찬 큐에서 기다리는 유닛을 깨우는 용도
+
+    async def offer(self, frame):
+        """유닛 쪽에서 프레임 넣기 (BLOCK 이면 자리가 나거나 구독이 끝날 때까지 대기)"""
+        if self.ended:
+            return
+        if self.policy == BLOCK:
+            if self.queue.full():
+                # 자리 나기 vs 구독 해지 중 먼저 오는 쪽 (해지되면 아무도 큐를 비우지 않음)
+                put = asyncio.ensure_future(self.queue.put(frame))
+                ended = asyncio.ensure_future(self._ended.wait())
+                await asyncio.wait((put, ended), return_when=asyncio.FIRST_COMPLETED)
+                ended.cancel()
+                if not put.done():
+                    put.cancel()
+                    return
+            else:
+                self.queue.put_nowait(frame)
+        elif self.queue.full():
+            if self.policy == DROP_NEWEST:
+                self.dropped += 1
+                return
+            self.queue.get_nowait()
+            self.dropped += 1
+            self.queue.put_nowait(frame)
+        else:
+            self.queue.put_nowait(frame)
+        self.delivered += 1
+
+    def end(self):
+        """스트림 끝 표시 (남은 프레임은 그대로 읽을 수 있음)"""
+        self.ended = True
+        self._ended.set()       # 꽉 찬 큐에 넣으려고 기다리던 유닛은 그 프레임을 버리고 진행
+        # 빈 큐에서 기다리는 쪽을 깨우기 위한 표시 (큐가 차 있으면 기다리는 쪽도 없음)
+        if not self.queue.full():
+            self.queue.put_nowait(self._END)
+
+    async def get(self):
+        """다음 프레임 (스트림이 끝났으면 None)"""
+        if self.closed or (self.ended and self.queue.empty()):
+            self.closed = True
+            return None
+        frame = await self.queue.get()
+        if frame is self._END:
+            self.closed = True
+            return None
+        return frame
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        frame = await self.get()
+        if frame is None:
+            raise StopAsyncIteration
+        return frame
+
+
+class Unit:
+    """런타임에 올라간 시뮬레이션 유닛 하나"""
+
+    def __init__(self, unit_id, engine):
+        self.unit_id = unit_id
+        self.engine = engine
+        self.subscriptions = []
+        self.task = None
+
+
+class AsyncRuntime:
+    """여러 FridgeEngine 을 하나의 이벤트 루프에서 돌리는 런타임"""
+
+    def __init__(self, speed=None, ticks_per_yield=10,
+                 event_capacity=UNIT_EVENT_CAPACITY, block_size=UNIT_BLOCK_SIZE):
+        self.speed = speed
+        # add_unit(engine=None) 이 만드는 엔진의 이벤트 로그 / 노이즈 블록 크기
+        self.event_capacity = event_capacity
+        self.block_size = block_size
+        # 시뮬레이션 시계 모드에서 몇 틱마다 다른 코루틴에 양보할지
+        self.ticks_per_yield = ticks_per_yield
+        self.units = {}
+        self.running = False
+        self._stop_tick = None
+
+    def add_unit(self, unit_id, engine=None):
+        if unit_id in self.units:
+            raise ValueError(f"unit {unit_id!r} already exists")
+        if engine is None:
+            engine = FridgeEngine(event_capacity=self.event_capacity, block_size=self.block_size)
+        unit = Unit(unit_id, engine)
+        self.units[unit_id] = unit
+        if self.running:
+            unit.task = asyncio.ensure_future(self._unit_loop(unit))
+        return unit.engine
+
+    def engine(self, unit_id):
+        return self.units[unit_id].engine
+
+    def subscribe(self, unit_id, maxsize=16, policy=BLOCK, every=1):
+        sub = Subscription(unit_id, maxsize, policy, every)
+        self.units[unit_id].subscriptions.append(sub)
+        return sub
+
+    def unsubscribe(self, sub):
+        self.units[sub.unit_id].subscriptions.remove(sub)
+        sub.end()
+
+    async def run(self, ticks=None):
+        """모든 유닛 실행 (ticks 를 주면 각 유닛이 그 틱에 도달하면 끝, 아니면 stop() 까지)"""
+        self.running = True
+        self._stop_tick = ticks
+        for unit in self.units.values():
+            unit.task = asyncio.ensure_future(self._unit_loop(unit))
+        try:
+            # 실행 중에 추가된 유닛까지 모두 끝날 때까지
+            while True:
+                tasks = [u.task for u in self.units.values() if u.task and not u.task.done()]
+                if not tasks:
+                    break
+                await asyncio.gather(*tasks)
+        finally:
+            self.running = False
+            for unit in self.units.values():
+                for sub in unit.subscriptions:
+                    sub.end()
+
+    def stop(self):
+        """모든 유닛을 다음 틱에서 멈춤"""
+        self.running = False
+
+    async def _unit_loop(self, unit):
+        engine = unit.engine
+        stop_tick = self._stop_tick
+        wall_start = time.monotonic()
+        sim_start = engine.elapsed
+
+        while self.running and (stop_tick is None or engine.tick_count < stop_tick):
+            # 제어 → 물리 → 기록
+            engine.step()
+
+            # 구독자에게 프레임 전달 (BLOCK 이면 여기서 백프레셔)
+            if unit.subscriptions:
+                frame = None
+                for sub in tuple(unit.subscriptions):     # 기다리는 동안 해지될 수 있음
+                    if engine.tick_count % sub.every == 0:
+                        if frame is None:
+                            frame = engine.snapshot()
+                        await sub.offer(frame)
+
+            # 시계: 배속에 맞춰 대기, 시뮬레이션 시계면 가끔 양보만
+            if self.speed is not None:
+                target = wall_start + (engine.elapsed - sim_start) / self.speed
+                await asyncio.sleep(max(0.0, target - time.monotonic()))
+            elif engine.tick_count % self.ticks_per_yield == 0:
+                await asyncio.sleep(0)
+
+
+# 실행
+if __name__ == "__main__":
+    async def main():
+        runtime = AsyncRuntime()
+        for i in range(1000):
+            runtime.add_unit(i)
+
+        # 0번 유닛을 1분(600틱)마다 출력
+        sub = runtime.subscribe(0, maxsize=4, policy=DROP_OLDEST, every=600)
+
+        async def printer():
+            async for frame in sub:
+                print(f"[{frame.elapsed:7.0f}s] 냉장실 {frame.fridge_temp:5.2f}°C "
+                      f"냉동실 {frame.freezer_temp:6.2f}°C 압축기 {'ON' if frame.compressor_on else 'OFF'}")
+
+        start = time.perf_counter()
+        await asyncio.gather(runtime.run(ticks=6000), printer())
+        print(f"유닛 {len(runtime.units)}대 x 10분: {time.perf_counter() - start:.1f}초")
+
+    asyncio.run(main())
@@ -0,0 +1,107 @@
+"""제어기 비교 벤치마크 (같은 seed 로 돌린 결과 비교)
+
+제어기마다 같은 seed 목록으로 헤드리스 FridgeEngine 을 돌리고 seed 평균을 표로 만든다.
+노이즈 스트림이 같으므로 차이는 제어기에서만 나온다. 실행은 ProcessPoolExecutor 로 나눠 돌린다.
+
+결과 항목:
+- switches: 압축기 ON/OFF 전환 횟수
+- short_cycles: 짧은 사이클 횟수 (energy.PowerModel.short_cycle_seconds)
+- damper_moves: 댐퍼 열림/닫힘 전환 횟수
+- duty: 압축기 가동률 (0~1)
+- wh: 소비 전력량 (Wh, engine.energy 의 전력 모델)
+- fridge_std / freezer_std: 온도 표준편차 (°C)
+- fridge_mean / freezer_mean: 평균 온도 (°C)
+- fridge_out / freezer_out: 칸별로 목표 범위를 벗어난 시간 비율 (param_sweep 과 같은 범위,
+  처음 온도를 끌어내리는 WARMUP_SECONDS 는 제외). 이 물리 모델에서는 냉동실이 목표보다
+  훨씬 차갑게 수렴하므로 (약 -29°C) freezer_out 은 제어기와 상관없이 1 에 가깝다
+
+사용 예:
+    rows = compare({"hysteresis": HysteresisController(), "pid": PIDController()}, hours=2)
+    print(format_table(rows, ["controller"] + RESULT_COLUMNS))
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+from fridge_engine import FridgeEngine
+from sim_clock import SimClock
+from controllers import HysteresisController, PIDController, MPCController
+from param_sweep import FRIDGE_BAND, FREEZER_BAND, format_table
+
+RESULT_COLUMNS = [
+    "switches", "short_cycles", "damper_moves", "duty", "wh",
+    "fridge_std", "freezer_std", "fridge_mean", "freezer_mean", "fridge_out", "freezer_out",
+]
+
+WARMUP_SECONDS = 600.0  # 시작 온도(7 / -10°C)에서 끌어내리는 구간 (범위 이탈 집계에서 제외)
+
+
+def run_case(controller, ticks, seed, power=None):
+    """제어기 하나 + seed 하나 실행 → 결과 dict (프로세스 풀 워커)"""
+    engine = FridgeEngine(seed=seed, controller=controller, power=power)
+
+    switches = fridge_out = freezer_out = 0
+    prev_compressor = engine.compressor_on
+    warmup = engine.clock.seconds_to_ticks(WARMUP_SECONDS)
+
+    for tick in range(ticks):
+        engine.step()
+
+        if engine.compressor_on != prev_compressor:
+            switches += 1
+            prev_compressor = engine.compressor_on
+        if tick < warmup:
+            continue
+        if abs(engine.fridge_temp - engine.fridge_target) > FRIDGE_BAND:
+            fridge_out += 1
+        if abs(engine.freezer_temp - engine.freezer_target) > FREEZER_BAND:
+            freezer_out += 1
+
+    measured = max(ticks - warmup, 1)
+    energy = engine.energy
+    return {
+        "switches": switches,
+        "short_cycles": energy.short_cycles,
+        "damper_moves": energy.damper_moves,
+        "duty": energy.duty,
+        "wh": energy.kwh * 1000,
+        "fridge_std": engine.fridge_stats.std,
+        "freezer_std": engine.freezer_stats.std,
+        "fridge_mean": engine.fridge_stats.mean,
+        "freezer_mean": engine.freezer_stats.mean,
+        "fridge_out": fridge_out / measured,
+        "freezer_out": freezer_out / measured,
+    }
+
+
+def compare(controllers, hours=2.0, seeds=(0, 1, 2, 3), power=None, max_workers=None):
+    """{이름: 제어기} 를 같은 seed 들로 실행 → 제어기별 seed 평균 dict 리스트"""
+    names = list(controllers)
+    ticks = SimClock().seconds_to_ticks(hours * 3600)
+    cases = [(name, seed) for name in names for seed in seeds]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(run_case,
+                                [controllers[name] for name, _ in cases],
+                                [ticks] * len(cases),
+                                [seed for _, seed in cases],
+                                [power] * len(cases)))
+
+    rows = []
+    for name in names:
+        runs = [r for (n, _), r in zip(cases, results) if n == name]
+        row = {"controller": name}
+        for col in RESULT_COLUMNS:
+            row[col] = sum(r[col] for r in runs) / len(runs)
+        rows.append(row)
+    return rows
+
+
+# 실행
+if __name__ == "__main__":
+    rows = compare({
+        "hysteresis": HysteresisController(),
+        "pid": PIDController(),
+        "pid (ff 없음)": PIDController(feedforward=False),
+        "pid (주기 10초)": PIDController(period=10.0),
+        "mpc": MPCController(),
+    })
+    print(format_table(rows, ["controller"] + RESULT_COLUMNS))
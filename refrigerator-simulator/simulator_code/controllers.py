@@ -0,0 +1,221 @@
+"""교체 가능한 제어기 (상태 → 액추에이터 명령)
+
+제어기는 순수 함수처럼 동작한다: 엔진 상태를 바꾸거나 로그를 남기지 않고
+ControlState 를 받아 ControlOutput 과 다음 틱에 쓸 내부 상태(memory)를 돌려준다
+(ControlState / ControlOutput 은 fridge_engine 에 있음).
+적용 / 이벤트 로그는 엔진(FridgeEngine.control_logic, FleetEngine.control_logic)이 한다.
+
+    output, memory = controller.decide(state, memory, dt)
+
+ControlState 의 각 필드는 float / bool 하나(FridgeEngine) 이거나
+(N,) 배열(FleetEngine) 이다. 같은 제어기 객체를 두 엔진에서 그대로 쓸 수 있도록
+조건 분기는 _select 로, 나머지는 스칼라 / 배열 모두 되는 산술로만 쓴다.
+
+제공하는 제어기:
+- HysteresisController: 기존 On/Off 로직 (기본값)
+- PIDController: 더 더운 칸 기준 PID + 피드포워드 → 압축기 듀티(PWM), 최소 ON/OFF 시간, 댐퍼 변조
+- MPCController: 틱당 변화량 모델로 horizon 틱 앞을 예측해 비용이 가장 작은 모드 선택
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from fridge_engine import SimParams, ControlOutput
+
+
+def _select(cond, a, b):
+    """cond ? a : b (배열이면 원소별)"""
+    if isinstance(cond, np.ndarray):
+        return np.where(cond, a, b)
+    return a if cond else b
+
+
+class Controller:
+    """제어기 인터페이스
+
+    - init_memory(n=None): 내부 상태 초기값 (n 을 주면 유닛 n 개 배열)
+    - decide(state, memory, dt): (ControlOutput, 새 memory)
+      입력(state, memory)을 바꾸지 않는다. dt 는 틱 길이(초).
+    """
+
+    def init_memory(self, n=None):
+        return None
+
+    def decide(self, state, memory, dt):
+        raise NotImplementedError
+
+
+class HysteresisController(Controller):
+    """실제 냉장고 방식 On/Off 제어 (Hysteresis 폭은 SimParams)"""
+
+    def __init__(self, params=None):
+        self.params = params if params is not None else SimParams()
+
+    def decide(self, state, memory, dt):
+        p = self.params
+        fridge, freezer = state.fridge_temp, state.freezer_temp
+        fridge_target, freezer_target = state.fridge_target, state.freezer_target
+
+        # === 1. 압축기 ===
+        # ON: 냉동실이 더우면 무조건, 냉장실이 너무 더우면 강제 (안전장치)
+        turn_on = ((freezer > freezer_target + p.freezer_band)
+                   | (fridge > fridge_target + p.fridge_force_on))
+        # OFF: 둘 다 충분히 차가우면 / 그 외: 현재 상태 유지
+        turn_off = ((freezer < freezer_target - p.freezer_band)
+                    & (fridge < fridge_target - p.fridge_off_band))
+        compressor = _select(turn_on, True, _select(turn_off, False, state.compressor_on))
+
+        # === 2. 댐퍼 (압축기가 돌 때만, 안 돌면 닫음) ===
+        damper = _select(fridge > fridge_target + p.damper_band, True,
+                         _select(fridge < fridge_target - p.damper_band, False, state.damper_open))
+        return ControlOutput(compressor, compressor & damper), memory
+
+
+# PID 내부 상태: 적분값, 이전 주기 평균 오차, 이번 주기 오차 누적(°C·s), PWM 주기 안 위치(초),
+# 이번 주기 압축기 / 댐퍼 듀티, 마지막 압축기 전환 후 지난 시간(초)
+PIDMemory = namedtuple("PIDMemory", ["integral", "prev_error", "error_sum", "phase",
+                                     "duty", "damper_duty", "since_switch"])
+
+
+class PIDController(Controller):
+    """온도 PID + 피드포워드 → 압축기 듀티 (주기 period 초의 PWM)
+
+    냉장실은 압축기가 돌 때만 식으므로 두 칸 중 희망 온도보다 더 더운 쪽을 오차로 쓴다.
+    오차 e = max(냉장실 오차, 냉동실 오차) (양수 = 더움)
+    PID 는 PWM 주기마다 한 번, 지난 주기의 평균 오차로 계산한다 (샘플 주기 = period).
+    듀티 = ff + kp*e + ki*∫e + kd*de/dt (0~1 로 제한)
+    - ff (피드포워드): 열 유입을 상쇄하는 정상 상태 듀티 (SimParams 로 계산, feedforward=False 면 0)
+    - anti-windup: 출력이 제한에 걸린 쪽으로는 적분하지 않음 (조건부 적분)
+    - 주기 안에서는 앞쪽 duty*period 초 동안 ON
+      (기본 20초: 가동률 ~25% 에서 기동 간격이 PowerModel 의 짧은 사이클 기준 15초보다 김)
+    - 첫 틱에 바로 주기를 시작 (지금 오차로 계산), 시작 전 듀티는 피드포워드 정상 상태
+    - 압축기 보호: ON 은 min_on 초, OFF 는 min_off 초 이상 유지 (PWM 명령보다 우선)
+    - 댐퍼 변조: 압축기 ON 시간 중 앞쪽 damper_duty 비율만 열림
+      damper_duty = 0.5 + damper_gain * (냉장실 오차 - 냉동실 오차) (0~1 로 제한)
+      → 냉장실이 상대적으로 더 더우면 찬 공기를 냉장실로 더 보냄
+      (gain 이 크면 처음처럼 냉동실이 훨씬 더울 때 댐퍼가 닫힌 채로 남아 냉장실이 치솟음)
+    """
+
+    def __init__(self, kp=0.1, ki=0.002, kd=0.0, period=20.0, feedforward=True,
+                 min_on=2.0, min_off=2.0, damper_gain=0.05, params=None):
+        self.kp, self.ki, self.kd = kp, ki, kd
+        self.period = period
+        self.min_on = min_on
+        self.min_off = min_off
+        self.damper_gain = damper_gain
+        self.params = params if params is not None else SimParams()
+        self.ff = self.feedforward_duty(self.params) if feedforward else 0.0
+
+    @staticmethod
+    def feedforward_duty(params):
+        """열 유입을 상쇄하는 데 필요한 압축기 듀티 (두 칸 중 큰 쪽)"""
+        p = params
+        fridge = p.fridge_heat_leak / p.damper_fridge_cooling
+        freezer = p.freezer_heat_leak / (p.freezer_cooling - p.damper_freezer_loss)
+        return min(1.0, max(fridge, freezer))
+
+    def init_memory(self, n=None):
+        """phase = NaN: 아직 시작 전 (첫 틱에 바로 주기를 시작), 듀티는 피드포워드 정상 상태"""
+        def full(value):
+            return value if n is None else np.full(n, value)
+        zero = full(0.0)
+        return PIDMemory(zero, zero, zero, full(np.nan), full(self.ff), full(0.5), full(np.inf))
+
+    def decide(self, state, memory, dt):
+        fridge_error = state.fridge_temp - state.fridge_target
+        freezer_error = state.freezer_temp - state.freezer_target
+        error_sum = memory.error_sum + np.maximum(fridge_error, freezer_error) * dt
+
+        # 주기가 시작될 때만 PID 계산 (지난 주기 평균 오차)
+        # 첫 틱은 지난 주기가 없으므로 바로 새 주기를 시작하고 지금 오차로 계산
+        first = np.isnan(memory.phase)
+        phase = _select(first, 0.0, (memory.phase + dt) % self.period)
+        new_period = phase < dt
+        error = _select(first, np.maximum(fridge_error, freezer_error), error_sum / self.period)
+        derivative = (error - _select(first, error, memory.prev_error)) / self.period
+
+        # 조건부 적분: 포화된 방향으로는 적분하지 않음
+        integral = memory.integral + error * self.period
+        raw = self.ff + self.kp * error + self.ki * integral + self.kd * derivative
+        saturated = ((raw > 1.0) & (error > 0)) | ((raw < 0.0) & (error < 0))
+        integral = _select(saturated, memory.integral, integral)
+        duty = np.clip(self.ff + self.kp * error + self.ki * integral + self.kd * derivative,
+                       0.0, 1.0)
+        damper_duty = np.clip(0.5 + self.damper_gain * (fridge_error - freezer_error), 0.0, 1.0)
+
+        integral = _select(new_period, integral, memory.integral)
+        prev_error = _select(new_period, error, memory.prev_error)
+        error_sum = _select(new_period, 0.0, error_sum)
+        duty = _select(new_period, duty, memory.duty)
+        damper_duty = _select(new_period, damper_duty, memory.damper_duty)
+        wanted = phase < duty * self.period
+
+        # 압축기 보호: 최소 ON / OFF 시간이 지나기 전에는 현재 상태 유지
+        since = memory.since_switch + dt
+        hold = since < _select(state.compressor_on, self.min_on, self.min_off)
+        compressor = _select(hold, state.compressor_on, wanted)
+        since = _select(compressor != state.compressor_on, 0.0, since)
+
+        damper = compressor & (phase < damper_duty * duty * self.period)
+        output = ControlOutput(compressor, damper)
+        memory = PIDMemory(integral, prev_error, error_sum, phase, duty, damper_duty, since)
+        return output, memory
+
+
+class MPCController(Controller):
+    """모델 예측 제어 (틱당 변화량 모델, horizon 틱 앞까지)
+
+    모드 3개(OFF / ON+댐퍼 닫힘 / ON+댐퍼 열림) 각각을 horizon 틱 동안 유지했을 때
+    예측 오차 제곱합 + 모드 변경 벌점이 가장 작은 모드를 고른다.
+    모드가 고정이면 온도가 직선으로 변하므로 비용을 닫힌 식으로 바로 계산한다 (반복 없음).
+
+    이 물리 모델에서는 냉장실을 식히는 동안 냉동실이 희망 온도보다 훨씬 차가워지므로
+    냉동실 가중치를 작게 둔다 (크면 냉장실을 덜 식히는 쪽으로 타협함).
+    """
+
+    def __init__(self, horizon=50, fridge_weight=1.0, freezer_weight=0.01,
+                 switch_penalty=200.0, params=None):
+        self.horizon = horizon
+        self.fridge_weight = fridge_weight
+        self.freezer_weight = freezer_weight
+        self.switch_penalty = switch_penalty
+        self.params = params if params is not None else SimParams()
+
+    def _mode_cost(self, fridge_error, freezer_error, fridge_drift, freezer_drift):
+        """sum_{k=1..H} w * (e + k*d)^2"""
+        h = self.horizon
+        s1 = h * (h + 1) / 2
+        s2 = h * (h + 1) * (2 * h + 1) / 6
+
+        def cost(e, d):
+            return h * e * e + 2 * e * d * s1 + d * d * s2
+
+        return (self.fridge_weight * cost(fridge_error, fridge_drift)
+                + self.freezer_weight * cost(freezer_error, freezer_drift))
+
+    def decide(self, state, memory, dt):
+        p = self.params
+        fridge_error = state.fridge_temp - state.fridge_target
+        freezer_error = state.freezer_temp - state.freezer_target
+
+        # 모드별 틱당 변화량 (update_physics 와 같은 모델)
+        cost_off = self._mode_cost(fridge_error, freezer_error,
+                                   p.fridge_heat_leak, p.freezer_heat_leak)
+        cost_closed = self._mode_cost(fridge_error, freezer_error,
+                                      p.fridge_heat_leak - p.closed_damper_cooling,
+                                      p.freezer_heat_leak - p.freezer_cooling)
+        cost_open = self._mode_cost(fridge_error, freezer_error,
+                                    p.fridge_heat_leak - p.damper_fridge_cooling,
+                                    p.freezer_heat_leak - p.freezer_cooling + p.damper_freezer_loss)
+
+        # 현재 모드에서 바꾸면 벌점 (산술로만: bool * 1 → 0/1)
+        on = state.compressor_on * 1
+        opened = (state.compressor_on & state.damper_open) * 1
+        penalty = self.switch_penalty
+        cost_off = cost_off + penalty * on
+        cost_closed = cost_closed + penalty * (1 - on + opened)
+        cost_open = cost_open + penalty * (1 - opened)
+
+        compressor = (cost_closed < cost_off) | (cost_open < cost_off)
+        damper = compressor & (cost_open < cost_closed)
+        return ControlOutput(compressor, damper), memory
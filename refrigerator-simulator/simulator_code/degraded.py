@@ -0,0 +1,100 @@
+"""센서 고장 시 성능 저하(degraded) 운전
+
+센서 하나가 고장 나도 긴급 정지하지 않고 남은 정보로 계속 냉각한다.
+정상 운전 중에 DutyLearner 가 압축기 가동률 / 댐퍼 열림 비율 / 사이클 길이를
+지수 이동 평균으로 배워두고 (틱당 O(1)), 고장 나면 그 값을 쓴다.
+
+모드 (ControlState 에서 고장난 센서 온도는 NaN):
+- 냉동실 센서 고장: 배운 가동률 * margin 으로 시간 기반 듀티 운전 (주기 = 배운 사이클 길이)
+  + 냉장실이 너무 더우면 강제 ON, 댐퍼는 냉장실 센서로 Hysteresis
+- 냉장실 센서 고장: 압축기 / 댐퍼 모두 시간 기반 듀티 운전 + 냉동실이 너무 더우면 강제 ON
+  (이 물리 모델에서는 냉장실을 식히느라 냉동실이 희망 온도보다 훨씬 차갑게 유지되므로
+  냉동실 온도로 Hysteresis 하면 압축기가 거의 안 돌아 냉장실이 더워진다)
+- 둘 다 고장: 압축기 / 댐퍼 모두 시간 기반 듀티 운전
+
+Arduino 통신 두절은 제어 자체가 안 되므로 기존처럼 긴급 정지.
+
+사용 예:
+    engine = FridgeEngine(degraded=DegradedController())
+"""
+import math
+
+from controllers import Controller
+from fridge_engine import SimParams, ControlOutput
+
+
+class DutyLearner:
+    """정상 운전 기록으로 배우는 값 (지수 이동 평균, 시정수 time_constant 초)"""
+
+    def __init__(self, time_constant=600.0, duty=0.25, damper_share=1.0, cycle=30.0):
+        self.time_constant = time_constant
+        self.duty = duty                    # 압축기 가동률
+        self.damper_share = damper_share    # 압축기 ON 중 댐퍼 열림 비율
+        self.cycle = cycle                  # 기동 → 다음 기동 간격 (초)
+        self.elapsed = 0.0
+        self._compressor = False
+        self._last_start = -math.inf
+
+    def update(self, compressor_on, damper_open, dt):
+        a = min(1.0, dt / self.time_constant)
+        self.duty += (compressor_on - self.duty) * a
+        if compressor_on:
+            self.damper_share += (damper_open - self.damper_share) * a
+            if not self._compressor:
+                # 사이클 길이는 사이클마다 한 번 갱신
+                if self._last_start > -math.inf:
+                    self.cycle += (self.elapsed - self._last_start - self.cycle) * 0.1
+                self._last_start = self.elapsed
+        self._compressor = compressor_on
+        self.elapsed += dt
+
+
+class DegradedController(Controller):
+    """센서 하나 또는 둘이 없을 때 쓰는 제어기 (없는 센서 온도 = NaN)
+
+    memory = 성능 저하 운전을 시작한 뒤 지난 시간 (초, 시간 기반 듀티의 위치)
+    """
+
+    def __init__(self, params=None, learner=None, margin=1.15):
+        self.params = params if params is not None else SimParams()
+        self.learner = learner if learner is not None else DutyLearner()
+        self.margin = margin    # 배운 가동률보다 조금 더 돌려서 안전 쪽으로
+
+    def init_memory(self, n=None):
+        return 0.0
+
+    def learn(self, compressor_on, damper_open, dt):
+        """정상 운전 중 틱마다 호출"""
+        self.learner.update(compressor_on, damper_open, dt)
+
+    def _pwm(self, elapsed, duty):
+        """주기 = 배운 사이클 길이, 앞쪽 duty 비율만 ON"""
+        cycle = max(self.learner.cycle, 1.0)
+        return (elapsed % cycle) < duty * cycle
+
+    def decide(self, state, memory, dt):
+        p, learner = self.params, self.learner
+        elapsed = memory + dt
+        fridge, freezer = state.fridge_temp, state.freezer_temp
+        fridge_ok, freezer_ok = not math.isnan(fridge), not math.isnan(freezer)
+        duty = min(1.0, learner.duty * self.margin)
+
+        if fridge_ok and not freezer_ok:
+            # 냉동실 센서 고장: 시간 기반 듀티 + 냉장실 안전장치
+            compressor = self._pwm(elapsed, duty) or fridge > state.fridge_target + p.fridge_force_on
+            if fridge > state.fridge_target + p.damper_band:
+                damper = True
+            elif fridge < state.fridge_target - p.damper_band:
+                damper = False
+            else:
+                damper = state.damper_open
+        elif freezer_ok and not fridge_ok:
+            # 냉장실 센서 고장: 시간 기반 듀티 + 냉동실 안전장치
+            compressor = self._pwm(elapsed, duty) or freezer > state.freezer_target + p.freezer_band
+            damper = self._pwm(elapsed, duty * learner.damper_share)
+        else:
+            # 둘 다 고장: 압축기 / 댐퍼 모두 시간 기반
+            compressor = self._pwm(elapsed, duty)
+            damper = self._pwm(elapsed, duty * learner.damper_share)
+
+        return ControlOutput(compressor, compressor and damper), elapsed
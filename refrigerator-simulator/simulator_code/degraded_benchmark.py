@@ -0,0 +1,73 @@
+"""센서 고장 처리 비교: 긴급 정지 vs 성능 저하 운전 (degraded.py)
+
+센서 고장(sensor_dropout) 시나리오마다 같은 seed 들로 두 방식을 몬테카를로 실행하고
+식품 안전 한계 초과 정도를 표로 비교한다 (fault_scenarios.run_replicas 사용).
+
+결과 항목:
+- exceed_p: 한계를 safety.seconds 초 넘게 연속으로 넘은 replica 비율
+- above_s: replica 당 한계를 넘은 시간 평균 (초)
+- fridge_max / freezer_max: replica 별 최고 온도의 평균 (°C)
+- recover_p90: 장애 발생 → 정상 범위 회복 시간 90% (초)
+
+사용 예:
+    rows = compare(SCENARIOS, replicas=20)
+    print(format_table(rows, ["scenario", "mode"] + RESULT_COLUMNS))
+"""
+import argparse
+
+from fault_scenarios import run_replicas, summarize
+from param_sweep import format_table
+
+RESULT_COLUMNS = ["exceed_p", "above_s", "fridge_max", "freezer_max", "recover_p90"]
+
+
+def dropout(compartment, rate_per_hour, repair):
+    """센서 응답 없음 장애 항목 하나"""
+    return {"kind": "sensor_dropout", "compartment": compartment,
+            "rate_per_hour": rate_per_hour, "repair": repair}
+
+
+SCENARIOS = {
+    "냉장실 센서 10분": {"hours": 1, "faults": [
+        dropout("fridge", 1.0, {"dist": "fixed", "value": 600})]},
+    "냉동실 센서 10분": {"hours": 1, "faults": [
+        dropout("freezer", 1.0, {"dist": "fixed", "value": 600})]},
+    "두 센서 (지수 분포)": {"hours": 1, "faults": [
+        dropout("fridge", 1.0, {"dist": "exponential", "mean": 600}),
+        dropout("freezer", 1.0, {"dist": "exponential", "mean": 600})]},
+    "짧은 끊김 반복": {"hours": 1, "faults": [
+        dropout("fridge", 20.0, {"dist": "uniform", "low": 5, "high": 60}),
+        dropout("freezer", 20.0, {"dist": "uniform", "low": 5, "high": 60})]},
+}
+
+
+def compare(scenarios, replicas=20, seed=0, max_workers=None):
+    """{이름: 시나리오} 마다 긴급 정지 / 성능 저하 운전 실행 → 행 dict 리스트"""
+    rows = []
+    for name, scenario in scenarios.items():
+        for mode, degraded in (("stop", False), ("degraded", True)):
+            results = run_replicas(scenario, replicas, seed, degraded=degraded,
+                                   max_workers=max_workers)
+            summary = summarize(results)
+            rows.append({
+                "scenario": name,
+                "mode": mode,
+                "exceed_p": summary["exceedance_probability"],
+                "above_s": summary["above_seconds_mean"],
+                "fridge_max": sum(r["fridge_max"] for r in results) / len(results),
+                "freezer_max": sum(r["freezer_max"] for r in results) / len(results),
+                "recover_p90": summary["recover_p90"],
+            })
+    return rows
+
+
+# 실행
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="센서 고장 처리 비교 (긴급 정지 vs 성능 저하 운전)")
+    parser.add_argument("--replicas", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    rows = compare(SCENARIOS, args.replicas, args.seed, args.workers)
+    print(format_table(rows, ["scenario", "mode"] + RESULT_COLUMNS))
@@ -0,0 +1,128 @@
+"""에너지 / 압축기 마모 집계 (틱당 O(1))
+
+틱마다 압축기 / 댐퍼 상태만 받아 누적값을 갱신한다.
+- 압축기 가동 시간, 기동 횟수
+- 짧은 사이클(short cycle): 직전 기동 후 short_cycle_seconds 안에 다시 기동한 횟수
+- 댐퍼 동작 횟수 (열림 / 닫힘 각각 1회)
+- 에너지 (kWh): 대기 전력 + 압축기 전력 * 가동 시간 + 기동 / 댐퍼 동작당 에너지
+
+전력 모델(PowerModel)은 바꿀 수 있고, 결과는 export() 로 실행마다 JSON 파일로 남긴다.
+트레이스 재생처럼 이미 기록된 상태 배열은 add_samples() 로 한 번에 넣는다 (NumPy).
+
+사용 예:
+    engine = FridgeEngine(power=PowerModel(compressor_watts=90.0))
+    engine.run_for(3600)
+    print(engine.energy.snapshot())
+    engine.energy.export("run.energy.json")
+"""
+import json
+import math
+from collections import namedtuple
+from dataclasses import dataclass, asdict
+
+import numpy as np
+
+JOULES_PER_KWH = 3.6e6
+
+
+@dataclass(frozen=True)
+class PowerModel:
+    """전력 / 마모 상수"""
+    compressor_watts: float = 120.0     # 압축기 가동 중 소비 전력 (W)
+    standby_watts: float = 2.0          # 제어기 / 센서 대기 전력 (W)
+    start_joules: float = 600.0         # 기동 1회 추가 에너지 (돌입 전류, J)
+    damper_joules: float = 5.0          # 댐퍼 동작 1회 에너지 (J)
+    short_cycle_seconds: float = 15.0   # 기동 간격이 이보다 짧으면 짧은 사이클
+
+
+# 불변 집계 스냅샷 (StateFrame.energy)
+EnergySnapshot = namedtuple("EnergySnapshot", [
+    "elapsed", "run_seconds", "starts", "short_cycles", "damper_moves", "kwh",
+])
+
+
+class EnergyMeter:
+    """압축기 / 댐퍼 상태를 틱마다 받아 에너지와 마모를 누적"""
+
+    def __init__(self, power=None, compressor_on=False, damper_open=False):
+        self.power = power if power is not None else PowerModel()
+        self.elapsed = 0.0
+        self.run_seconds = 0.0
+        self.starts = 0
+        self.short_cycles = 0
+        self.damper_moves = 0
+        self.joules = 0.0
+        self._compressor = compressor_on
+        self._damper = damper_open
+        self._last_start = -math.inf
+
+    @property
+    def kwh(self):
+        return self.joules / JOULES_PER_KWH
+
+    @property
+    def duty(self):
+        """압축기 가동률 (0~1)"""
+        return self.run_seconds / self.elapsed if self.elapsed > 0 else 0.0
+
+    def update(self, compressor_on, damper_open, seconds):
+        """seconds 초 동안 유지된 상태 하나 추가 (틱 한 번 또는 fast_forward 구간 하나)"""
+        p = self.power
+        if compressor_on and not self._compressor:
+            self.starts += 1
+            if self.elapsed - self._last_start < p.short_cycle_seconds:
+                self.short_cycles += 1
+            self._last_start = self.elapsed
+            self.joules += p.start_joules
+        if damper_open != self._damper:
+            self.damper_moves += 1
+            self.joules += p.damper_joules
+        self._compressor = compressor_on
+        self._damper = damper_open
+
+        if compressor_on:
+            self.run_seconds += seconds
+            self.joules += p.compressor_watts * seconds
+        self.joules += p.standby_watts * seconds
+        self.elapsed += seconds
+
+    def add_samples(self, compressor_on, damper_open, seconds):
+        """틱마다 기록된 상태 배열을 한 번에 추가 (update 를 원소마다 부른 것과 같음)"""
+        p = self.power
+        compressor = np.asarray(compressor_on, dtype=bool)
+        damper = np.asarray(damper_open, dtype=bool)
+        n = len(compressor)
+        if n == 0:
+            return
+
+        prev_compressor = np.concatenate(([self._compressor], compressor[:-1]))
+        prev_damper = np.concatenate(([self._damper], damper[:-1]))
+        start_times = self.elapsed + np.flatnonzero(compressor & ~prev_compressor) * seconds
+        if len(start_times):
+            gaps = np.diff(start_times, prepend=self._last_start)
+            self.short_cycles += int(np.count_nonzero(gaps < p.short_cycle_seconds))
+            self._last_start = float(start_times[-1])
+        starts = len(start_times)
+        moves = int(np.count_nonzero(damper != prev_damper))
+        on = int(np.count_nonzero(compressor))
+
+        self.starts += starts
+        self.damper_moves += moves
+        self.run_seconds += on * seconds
+        self.joules += (p.start_joules * starts + p.damper_joules * moves
+                        + p.compressor_watts * on * seconds + p.standby_watts * n * seconds)
+        self.elapsed += n * seconds
+        self._compressor = bool(compressor[-1])
+        self._damper = bool(damper[-1])
+
+    def snapshot(self):
+        return EnergySnapshot(self.elapsed, self.run_seconds, self.starts,
+                              self.short_cycles, self.damper_moves, self.kwh)
+
+    def to_dict(self):
+        """실행 결과 + 전력 모델 (export 용)"""
+        return {**self.snapshot()._asdict(), "duty": self.duty, "power": asdict(self.power)}
+
+    def export(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=1)
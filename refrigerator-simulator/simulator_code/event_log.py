@@ -0,0 +1,167 @@
+"""구조화된 이벤트 로그 (고정 크기 링 버퍼)
+
+문자열 대신 (틱, 시뮬레이션 시간, 이벤트 코드, 칸, 값) 을 타입 배열(array)에 저장한다.
+- 용량을 넘으면 가장 오래된 이벤트부터 덮어씀 → 며칠을 돌려도 메모리 고정
+- 화면에 보이는 문자열은 볼 때(format) / 내보낼 때(to_csv)만 만든다
+- 이벤트 코드로 바로 거를 수 있다 (문자열 파싱 없음)
+
+각 이벤트에는 0 부터 1씩 증가하는 번호(seq)가 붙는다.
+since(seq) 로 "마지막으로 본 번호 이후" 이벤트만 가져갈 수 있다.
+"""
+import csv
+import math
+from array import array
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+# === 이벤트 코드 ===
+SYSTEM_START = 1
+TARGET_CHANGED = 2
+SENSOR_FAIL = 3
+SENSOR_RECOVERED = 4
+ARDUINO_FAIL = 5
+ARDUINO_RECOVERED = 6
+EMERGENCY_STOP = 7
+COMPRESSOR_ON = 8
+COMPRESSOR_OFF = 9
+DAMPER_OPEN = 10
+DAMPER_CLOSED = 11
+DAMPER_CLOSED_STOP = 12     # 압축기 정지로 댐퍼 닫힘
+SPEED_CHANGED = 13
+DEGRADED_MODE = 14          # 센서 고장 시 성능 저하 운전 시작 (칸 = 고장난 센서)
+
+# === 칸 ===
+NONE = 0
+FRIDGE = 1
+FREEZER = 2
+
+COMPARTMENT_NAMES = {NONE: "", FRIDGE: "냉장실", FREEZER: "냉동실"}
+
+# 표시용 문자열 ({name} = 칸 이름, {value} = 값)
+MESSAGES = {
+    SYSTEM_START: "시스템 시작",
+    TARGET_CHANGED: "{name} 희망 온도 변경: {value}°C",
+    SENSOR_FAIL: "🚨 {name} 센서 고장 발생!",
+    SENSOR_RECOVERED: "✅ {name} 센서 복구 완료",
+    ARDUINO_FAIL: "🚨 제어기(Arduino) 통신 두절!",
+    ARDUINO_RECOVERED: "✅ 제어기(Arduino) 재연결 완료",
+    EMERGENCY_STOP: "⚠️ 긴급 정지 실행",
+    COMPRESSOR_ON: "압축기 ON",
+    COMPRESSOR_OFF: "압축기 OFF",
+    DAMPER_OPEN: "댐퍼 열림",
+    DAMPER_CLOSED: "댐퍼 닫힘",
+    DAMPER_CLOSED_STOP: "댐퍼 닫힘 (압축기 정지)",
+    SPEED_CHANGED: "시뮬레이션 속도 변경: {value}",
+    DEGRADED_MODE: "⚠️ 성능 저하 운전: {name} 센서 없이 제어",
+}
+
+Event = namedtuple("Event", ["seq", "tick", "time", "code", "compartment", "value"])
+
+
+CAPACITY = 100_000       # 기본 용량 (이벤트 하나 26바이트 → 약 2.6MB)
+
+
+class EventLog:
+    """고정 용량 링 버퍼에 이벤트를 쌓는 로그"""
+
+    def __init__(self, capacity=CAPACITY, start=None):
+        self.capacity = capacity
+        # format 시 시뮬레이션 시간 → 시각 변환 기준
+        self.start_datetime = start if start is not None else datetime.now()
+
+        # 열(column)마다 타입 배열 하나 (미리 할당)
+        self._tick = array('q', bytes(8 * capacity))
+        self._time = array('d', bytes(8 * capacity))
+        self._code = array('B', bytes(capacity))
+        self._compartment = array('b', bytes(capacity))
+        self._value = array('d', bytes(8 * capacity))
+
+        # 지금까지 들어온 이벤트 수 (= 다음 이벤트의 seq)
+        self.total = 0
+
+    def __len__(self):
+        """버퍼에 남아있는 이벤트 수"""
+        return min(self.total, self.capacity)
+
+    @property
+    def first_seq(self):
+        """버퍼에 남아있는 가장 오래된 이벤트 번호"""
+        return max(0, self.total - self.capacity)
+
+    def add(self, tick, sim_time, code, compartment=NONE, value=math.nan):
+        i = self.total % self.capacity
+        self._tick[i] = tick
+        self._time[i] = sim_time
+        self._code[i] = code
+        self._compartment[i] = compartment
+        self._value[i] = value
+        self.total += 1
+
+    def get(self, seq):
+        if not self.first_seq <= seq < self.total:
+            raise IndexError(f"event {seq} is not in the buffer")
+        i = seq % self.capacity
+        return Event(seq, self._tick[i], self._time[i], self._code[i],
+                     self._compartment[i], self._value[i])
+
+    def since(self, seq, end=None):
+        """seq 번 이후(포함) ~ end 번 이전 이벤트 리스트 (이미 덮어쓴 것은 건너뜀)
+
+        다른 스레드가 add 하는 중에 읽어도 된다: 읽은 뒤 그 사이 덮어써진
+        칸이 있는지 확인하고 버린다 (락 없음).
+        """
+        end = self.total if end is None else min(end, self.total)
+        result = []
+        for s in range(max(seq, self.first_seq), end):
+            i = s % self.capacity
+            result.append(Event(s, self._tick[i], self._time[i], self._code[i],
+                                self._compartment[i], self._value[i]))
+        # 읽는 동안 링 버퍼가 한 바퀴 돌아 덮어써진 이벤트 제외
+        oldest = self.first_seq
+        return [event for event in result if event.seq >= oldest]
+
+    def tail(self, count):
+        """최근 count 개 이벤트 튜플"""
+        return tuple(self.since(self.total - count))
+
+    def __iter__(self):
+        return iter(self.since(0))
+
+    def filter(self, codes=None, compartment=None):
+        """이벤트 코드 / 칸으로 거르기"""
+        if codes is not None and not isinstance(codes, (set, frozenset, list, tuple)):
+            codes = (codes,)
+        result = []
+        for seq in range(self.first_seq, self.total):
+            i = seq % self.capacity
+            if codes is not None and self._code[i] not in codes:
+                continue
+            if compartment is not None and self._compartment[i] != compartment:
+                continue
+            result.append(self.get(seq))
+        return result
+
+    def count(self, code):
+        """버퍼에 남아있는 code 이벤트 수"""
+        return sum(1 for seq in range(self.first_seq, self.total)
+                   if self._code[seq % self.capacity] == code)
+
+    # === 표시 / 내보내기 ===
+    def message(self, event):
+        value = event.value
+        if event.code == SPEED_CHANGED:
+            value = "최대" if math.isnan(value) else f"{value:g}x"
+        return MESSAGES[event.code].format(
+            name=COMPARTMENT_NAMES[event.compartment], value=value)
+
+    def format(self, event, fmt="%H:%M:%S"):
+        """"[HH:MM:SS] 메시지" 형태 문자열 (시각은 시뮬레이션 시간 기준)"""
+        timestamp = (self.start_datetime + timedelta(seconds=event.time)).strftime(fmt)
+        return f"[{timestamp}] {self.message(event)}"
+
+    def to_csv(self, path):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["seq", "tick", "time", "code", "compartment", "value", "message"])
+            for event in self:
+                writer.writerow([*event, self.message(event)])
@@ -0,0 +1,233 @@
+"""정상 구간 건너뛰기 (이벤트 기반 fast-forward)
+
+압축기 / 댐퍼 상태가 바뀌지 않는 동안 update_physics 는
+"틱당 일정한 변화량(drift) + 가우시안 노이즈" 일 뿐이다.
+n 틱 뒤의 온도는 정규분포 N(x + drift*n, (σ²)*n) 이므로 노이즈를 한 번만 뽑아 바로 건너뛸 수 있다.
+
+얼마나 건너뛸지는 제어 로직의 다음 문턱값까지 거리로 정한다.
+평균 경로 + SIGMAS 시그마 범위가 문턱값(또는 온도 제한 범위)에 닿기 전까지만 건너뛰고,
+문턱값 근처에서는 원래대로 한 틱씩 진행해서 정확한 전환 시점을 잡는다.
+→ 긴 대기 / 냉각 구간이 틱 수가 아니라 전환 횟수에 비례하는 비용이 된다.
+
+근사:
+- 건너뛰는 동안 경로가 중간에 문턱값을 넘었다 돌아올 확률은 무시 (SIGMAS=3 → 건너뛸 때마다 0.3% 미만)
+- 온도 제한 범위(-30°C 등)에 붙어 있는 칸은 drift 가 벽 쪽으로 충분히 세면 벽에 고정된 것으로 봄
+- 통계(평균/분산/최고/최저)는 건너뛴 구간을 한 덩어리로 합치고, 백분위수와 그래프는 끝점만 기록
+
+문턱값은 HysteresisController 기준이므로 다른 제어기(PID, MPC 등)를 쓰거나
+센서 모델(sensors.py)을 켜면 건너뛰지 않는다.
+기록기(recorder) / 텔레메트리 / Arduino 링크가 붙어 있어도 건너뛰지 않는다:
+트레이스 / 재생 / 에너지 재집계는 틱마다 레코드 하나를 가정하고, 링크는 틱마다 poll 해야 한다.
+
+실행: python fast_forward.py (하루 동안 한 틱씩 진행한 결과와 시간 / 통계 비교)
+"""
+import math
+
+from controllers import HysteresisController
+from fridge_engine import FRIDGE_RANGE, FREEZER_RANGE
+
+SIGMAS = 3.0        # 문턱값까지 남겨둘 여유 (노이즈 표준편차 배수)
+MIN_JUMP = 4        # 이보다 짧게 건너뛸 수 있으면 그냥 한 틱씩 진행
+
+
+def drift_per_tick(engine):
+    """현재 압축기 / 댐퍼 상태에서 틱당 온도 변화량 (냉장실, 냉동실)"""
+    p = engine.params
+    fridge = p.fridge_heat_leak
+    freezer = p.freezer_heat_leak
+    if engine.compressor_on:
+        freezer -= p.freezer_cooling
+        if engine.damper_open:
+            fridge -= p.damper_fridge_cooling
+            freezer += p.damper_freezer_loss
+        else:
+            fridge -= p.closed_damper_cooling
+    return fridge, freezer
+
+
+def control_region(engine):
+    """현재 압축기 / 댐퍼 상태가 유지되는 온도 범위
+
+    (fridge_lo, fridge_hi, freezer_lo, freezer_hi) 를 돌려준다.
+    이번 틱에 바로 상태가 바뀔 상황이면 None.
+    """
+    p = engine.controller.params
+    fridge, freezer = engine.fridge_temp, engine.freezer_temp
+    fridge_target, freezer_target = engine.fridge_target, engine.freezer_target
+    fridge_lo = freezer_lo = -math.inf
+    fridge_hi = freezer_hi = math.inf
+
+    if not engine.compressor_on:
+        if engine.damper_open:
+            return None  # 압축기가 꺼져 있으면 댐퍼를 바로 닫음
+        # ON 조건에 닿기 전까지 유지
+        freezer_hi = freezer_target + p.freezer_band
+        fridge_hi = fridge_target + p.fridge_force_on
+    else:
+        # OFF 는 두 칸이 동시에 차가울 때만 → 지금 만족 안 된 쪽 하나를 장벽으로
+        if freezer >= freezer_target - p.freezer_band:
+            freezer_lo = freezer_target - p.freezer_band
+        elif fridge >= fridge_target - p.fridge_off_band:
+            fridge_lo = fridge_target - p.fridge_off_band
+        else:
+            return None
+        # 댐퍼
+        if engine.damper_open:
+            fridge_lo = max(fridge_lo, fridge_target - p.damper_band)
+        else:
+            fridge_hi = min(fridge_hi, fridge_target + p.damper_band)
+
+    if not (fridge_lo <= fridge <= fridge_hi and freezer_lo <= freezer <= freezer_hi):
+        return None
+    return fridge_lo, fridge_hi, freezer_lo, freezer_hi
+
+
+def _ticks_to_barrier(distance, speed, spread):
+    """speed * n + spread * sqrt(n) < distance 를 만족하는 최대 n (실수)
+
+    distance: 장벽까지 거리 (> 0), speed: 장벽 쪽으로의 틱당 drift,
+    spread: SIGMAS * σ
+    """
+    if distance <= 0:
+        return 0.0
+    if speed > 0:
+        s = (-spread + math.sqrt(spread * spread + 4 * speed * distance)) / (2 * speed)
+    elif speed == 0:
+        if spread == 0:
+            return math.inf
+        s = distance / spread
+    else:
+        # 장벽 반대쪽으로 흐름: 최대로 다가가도 못 닿으면 무한
+        away = -speed
+        disc = spread * spread - 4 * away * distance
+        if disc < 0:
+            return math.inf
+        s = (spread - math.sqrt(disc)) / (2 * away)
+    return s * s
+
+
+def _plan(x, speed, sigma, lo, hi, clamp_lo, clamp_hi, sigmas):
+    """칸 하나에 대해 (건너뛸 수 있는 최대 틱, 벽에 고정된 값 또는 None)"""
+    spread = sigmas * sigma
+    pinned = None
+    lo_eff = max(lo, clamp_lo)
+    hi_eff = min(hi, clamp_hi)
+
+    # 제한 범위 벽에 붙어서 벽 쪽으로 (틱당 σ 이상) 밀리는 중이면 벽에 고정
+    wall_push = max(sigma, 1e-12)
+    if x <= clamp_lo + sigma and speed <= -wall_push and lo <= clamp_lo:
+        pinned, lo_eff = clamp_lo, -math.inf
+    elif x >= clamp_hi - sigma and speed >= wall_push and hi >= clamp_hi:
+        pinned, hi_eff = clamp_hi, math.inf
+
+    n_hi = _ticks_to_barrier(hi_eff - x, speed, spread)
+    n_lo = _ticks_to_barrier(x - lo_eff, -speed, spread)
+    return min(n_hi, n_lo), pinned
+
+
+def can_fast_forward(engine):
+    """틱당 변화량 모델 + Hysteresis 제어기 + 센서 모델 없음, 틱마다 레코드가 필요한 것
+    (기록기 / 텔레메트리 / 링크) 없음, 장애 / 대기 중인 명령이 없을 때만"""
+    return (engine.thermal is None and engine.sensors is None
+            and type(engine.controller) is HysteresisController
+            and engine.recorder is None and engine.telemetry is None and engine.link is None
+            and not engine.commands
+            and engine.fridge_sensor_ok and engine.freezer_sensor_ok and engine.arduino_connected
+            and engine.fridge_sensor_fail_timer == 0 and engine.freezer_sensor_fail_timer == 0
+            and engine.arduino_fail_timer == 0)
+
+
+def plan_jump(engine, limit, sigmas=SIGMAS):
+    """지금 한 번에 건너뛸 수 있는 틱 수 (0 이면 한 틱씩 진행해야 함)"""
+    if not can_fast_forward(engine):
+        return 0, None, None
+    region = control_region(engine)
+    if region is None:
+        return 0, None, None
+    fridge_lo, fridge_hi, freezer_lo, freezer_hi = region
+
+    sigma = engine.params.noise_std
+    fridge_speed, freezer_speed = drift_per_tick(engine)
+    n_fridge, fridge_pin = _plan(engine.fridge_temp, fridge_speed, sigma,
+                                 fridge_lo, fridge_hi, *FRIDGE_RANGE, sigmas)
+    n_freezer, freezer_pin = _plan(engine.freezer_temp, freezer_speed, sigma,
+                                   freezer_lo, freezer_hi, *FREEZER_RANGE, sigmas)
+    n = min(n_fridge, n_freezer, limit)
+    return int(n), fridge_pin, freezer_pin
+
+
+def jump(engine, n, fridge_pin=None, freezer_pin=None):
+    """n 틱을 한 번에 진행 (노이즈는 칸마다 한 번만 뽑음)"""
+    sigma = engine.params.noise_std
+    fridge_speed, freezer_speed = drift_per_tick(engine)
+    spread = sigma * math.sqrt(n)
+
+    start_fridge, start_freezer = engine.fridge_temp, engine.freezer_temp
+    if fridge_pin is None:
+        engine.fridge_temp += fridge_speed * n + spread * engine.noise.fridge.next()
+    else:
+        engine.fridge_temp = fridge_pin
+    if freezer_pin is None:
+        engine.freezer_temp += freezer_speed * n + spread * engine.noise.freezer.next()
+    else:
+        engine.freezer_temp = freezer_pin
+    engine.clamp_temps()
+
+    engine.clock.advance(n)
+    engine.record_block(n, start_fridge, start_freezer, sigma)
+
+
+def fast_forward(engine, ticks, sigmas=SIGMAS, min_jump=MIN_JUMP):
+    """ticks 만큼 진행. 상태가 바뀔 수 없는 구간은 건너뛰고 나머지는 한 틱씩.
+
+    (건너뛴 횟수, 한 틱씩 진행한 틱 수) 를 돌려준다.
+    """
+    end = engine.clock.ticks + ticks
+    jumps = steps = 0
+    while engine.clock.ticks < end:
+        n, fridge_pin, freezer_pin = plan_jump(engine, end - engine.clock.ticks, sigmas)
+        if n >= min_jump:
+            jump(engine, n, fridge_pin, freezer_pin)
+            jumps += 1
+        else:
+            # 문턱값 근처: 매 틱 다시 계산하지 않고 min_jump 틱을 그대로 진행
+            count = min(min_jump, end - engine.clock.ticks)
+            engine.run(count)
+            steps += count
+    return jumps, steps
+
+
+def fast_forward_for(engine, seconds, sigmas=SIGMAS, min_jump=MIN_JUMP):
+    """시뮬레이션 시간 seconds 초 만큼 fast_forward"""
+    return fast_forward(engine, engine.clock.seconds_to_ticks(seconds), sigmas, min_jump)
+
+
+# 실행: 하루 동안 한 틱씩 진행 vs fast_forward 비교
+if __name__ == "__main__":
+    import time
+
+    from fridge_engine import FridgeEngine
+
+    seconds = 24 * 3600
+    full = FridgeEngine(seed=1)
+    start = time.perf_counter()
+    full.run_for(seconds)
+    full_time = time.perf_counter() - start
+
+    fast = FridgeEngine(seed=1)
+    start = time.perf_counter()
+    jumps, steps = fast_forward_for(fast, seconds)
+    fast_time = time.perf_counter() - start
+
+    print(f"시뮬레이션 {seconds / 3600:.0f}시간 ({full.tick_count}틱)")
+    print(f"한 틱씩:      {full_time:6.2f}초")
+    print(f"fast_forward: {fast_time:6.2f}초 (건너뛰기 {jumps}번, 한 틱씩 {steps}틱) "
+          f"→ {full_time / fast_time:.1f}배")
+    for name, a, b in (
+            ("냉장실 평균 (°C)", full.fridge_stats.mean, fast.fridge_stats.mean),
+            ("냉장실 표준편차", full.fridge_stats.std, fast.fridge_stats.std),
+            ("냉동실 평균 (°C)", full.freezer_stats.mean, fast.freezer_stats.mean),
+            ("냉동실 표준편차", full.freezer_stats.std, fast.freezer_stats.std),
+            ("압축기 기동 (회)", full.energy.starts, fast.energy.starts),
+            ("전력량 (Wh)", full.energy.kwh * 1000, fast.energy.kwh * 1000)):
+        print(f"{name}: 한 틱씩 {a:.3f} / fast_forward {b:.3f} (차이 {b - a:+.3f})")
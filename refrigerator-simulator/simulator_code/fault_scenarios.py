@@ -0,0 +1,404 @@
+"""장애 주입 시나리오 + 몬테카를로 신뢰성 실행
+
+시나리오는 JSON 으로 저장할 수 있는 dict 하나다. 장애 종류마다
+발생 빈도(시간당 평균 횟수, 포아송 도착)와 지속 시간 분포(repair)를 적는다.
+
+    {
+      "hours": 1,
+      "faults": [
+        {"kind": "sensor_stuck", "compartment": "fridge", "rate_per_hour": 0.5,
+         "repair": {"dist": "lognormal", "median": 300, "sigma": 0.5}},
+        {"kind": "door_open", "compartment": "fridge", "rate_per_hour": 4,
+         "heat_per_second": 0.3, "repair": {"dist": "uniform", "low": 5, "high": 40}}
+      ],
+      "safety": {"fridge_limit": 8.0, "freezer_limit": -12.0, "seconds": 60.0}
+    }
+
+장애 종류 (kind):
+- sensor_stuck: 센서 값이 고장 순간 값에 고정 (제어기는 모름)
+- sensor_drift: 센서 값이 drift_per_hour °C/시간 씩 어긋남 (제어기는 모름)
+- sensor_dropout: 센서 응답 없음 → 기존 센서 고장 처리 (긴급 정지 + 제어 중단,
+  degraded=True 면 성능 저하 운전)
+- controller_hang: 제어기가 멈춤 → 액추에이터가 그 상태로 고정 (긴급 정지 없음)
+- door_open: 문 열림 → 해당 칸에 heat_per_second °C/초 열 유입
+
+지속 시간 분포 (dist): fixed(value), exponential(mean), uniform(low, high),
+lognormal(median, sigma), weibull(shape, scale). 단위는 초.
+
+센서 고장 / 제어기 멈춤은 엔진의 controller 를 FaultyController 로 감싸서
+제어기가 보는 온도 / 결정만 바꾼다 (실제 온도는 그대로).
+난수는 엔진의 장애 주입 스트림(noise.fault_rng)을 쓰므로 같은 seed 면 같은 결과.
+
+결과 (replica 여러 개를 프로세스 풀에서 실행):
+- exceedance_probability: 식품 안전 한계를 safety.seconds 초 넘게 연속으로 넘은 replica 비율
+- recover_p50 / p90 / p99: 장애 발생부터 수리 후 온도가 정상 범위로 돌아올 때까지 걸린 시간 (초)
+
+사용 예:
+    results = run_replicas(DEFAULT_SCENARIO, replicas=1000, seed=0)
+    print(format_report(summarize(results)))
+"""
+import argparse
+import json
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from controllers import Controller
+from degraded import DegradedController
+from fridge_engine import FridgeEngine, ControlOutput
+from param_sweep import FRIDGE_BAND, FREEZER_BAND
+
+FAULT_KINDS = ("sensor_stuck", "sensor_drift", "sensor_dropout", "controller_hang", "door_open")
+COMPARTMENTS = ("fridge", "freezer")
+# 장애 종류마다 꼭 있어야 하는 숫자 항목 (FaultInjector 가 읽음)
+FAULT_KEYS = {
+    "sensor_stuck": (),
+    "sensor_drift": ("drift_per_hour",),
+    "sensor_dropout": (),
+    "controller_hang": (),
+    "door_open": ("heat_per_second",),
+}
+
+DEFAULT_SAFETY = {"fridge_limit": 8.0, "freezer_limit": -12.0, "seconds": 60.0}
+
+DEFAULT_SCENARIO = {
+    "hours": 1,
+    "faults": [
+        {"kind": "sensor_stuck", "compartment": "fridge", "rate_per_hour": 0.5,
+         "repair": {"dist": "lognormal", "median": 300, "sigma": 0.5}},
+        {"kind": "sensor_drift", "compartment": "freezer", "rate_per_hour": 0.2,
+         "drift_per_hour": 20.0, "repair": {"dist": "exponential", "mean": 900}},
+        {"kind": "sensor_dropout", "compartment": "fridge", "rate_per_hour": 6,
+         "repair": {"dist": "uniform", "low": 1, "high": 10}},
+        {"kind": "controller_hang", "rate_per_hour": 0.3,
+         "repair": {"dist": "weibull", "shape": 1.5, "scale": 120}},
+        {"kind": "door_open", "compartment": "fridge", "rate_per_hour": 4,
+         "heat_per_second": 0.3, "repair": {"dist": "uniform", "low": 5, "high": 40}},
+    ],
+    "safety": DEFAULT_SAFETY,
+}
+
+
+def sample_duration(rng, spec):
+    """지속 시간 분포 spec 에서 하나 뽑기 (초)"""
+    dist = spec["dist"]
+    if dist == "fixed":
+        return float(spec["value"])
+    if dist == "exponential":
+        return float(rng.exponential(spec["mean"]))
+    if dist == "uniform":
+        return float(rng.uniform(spec["low"], spec["high"]))
+    if dist == "lognormal":
+        return float(rng.lognormal(math.log(spec["median"]), spec["sigma"]))
+    if dist == "weibull":
+        return float(spec["scale"] * rng.weibull(spec["shape"]))
+    raise ValueError(f"unknown distribution: {dist}")
+
+
+def validate(scenario, name=None):
+    """시나리오 형식 검사 (틀리면 어느 시나리오의 몇 번째 장애인지 담은 ValueError)
+
+    name: 메시지에 쓸 시나리오 이름 (없으면 scenario["name"], 그것도 없으면 "scenario")
+    """
+    name = name if name is not None else scenario.get("name", "scenario")
+    for i, fault in enumerate(scenario.get("faults", [])):
+        kind = fault.get("kind")
+        where = f"{name}: faults[{i}] ({kind})"
+        if kind not in FAULT_KINDS:
+            raise ValueError(f"{where}: unknown fault kind: {kind}")
+        if kind != "controller_hang" and fault.get("compartment") not in COMPARTMENTS:
+            raise ValueError(f"{where}: compartment must be one of {COMPARTMENTS}")
+        for key in FAULT_KEYS[kind]:
+            if not _is_number(fault.get(key)):
+                raise ValueError(f"{where}: {key} must be a number")
+        rate = fault.get("rate_per_hour", 0)
+        if not _is_number(rate) or rate < 0:
+            raise ValueError(f"{where}: rate_per_hour must be a number >= 0")
+        repair = fault.get("repair")
+        if not isinstance(repair, dict):
+            raise ValueError(f"{where}: missing repair distribution")
+        try:
+            sample_duration(np.random.default_rng(0), repair)
+        except KeyError as e:
+            raise ValueError(f"{where}: repair is missing {e.args[0]!r}") from None
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"{where}: repair: {e}") from None
+    return scenario
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def load_scenario(path):
+    with open(path) as f:
+        return validate(json.load(f), name=path)
+
+
+class FaultProcess:
+    """시나리오의 장애 항목 하나 (다음 발생 / 수리 시각을 들고 있음)"""
+
+    def __init__(self, spec, rng, tick_seconds):
+        self.spec = spec
+        self.kind = spec["kind"]
+        self.compartment = spec.get("compartment")
+        self.rng = rng
+        self.tick_seconds = tick_seconds
+        self.active = False
+        self.start_tick = 0
+        self.next_tick = self._arrival(0)
+
+    def _arrival(self, tick):
+        """tick 이후 다음 발생 틱 (포아송 도착, 빈도 0 이면 없음)"""
+        rate = self.spec.get("rate_per_hour", 0.0)
+        if rate <= 0:
+            return math.inf
+        wait = self.rng.exponential(3600.0 / rate)
+        return tick + max(1, int(round(wait / self.tick_seconds)))
+
+    def start(self, tick):
+        self.active = True
+        self.start_tick = tick
+        repair = sample_duration(self.rng, self.spec["repair"])
+        self.duration_ticks = max(1, int(round(repair / self.tick_seconds)))
+        self.next_tick = tick + self.duration_ticks
+
+    def stop(self, tick):
+        self.active = False
+        self.next_tick = self._arrival(tick)
+
+
+class FaultInjector:
+    """장애 항목들을 틱마다 진행시키고 엔진 / 제어기에 반영"""
+
+    def __init__(self, faults, rng, tick_seconds):
+        self.tick_seconds = tick_seconds
+        self.processes = [FaultProcess(spec, rng, tick_seconds) for spec in faults]
+        self.next_tick = min((p.next_tick for p in self.processes), default=math.inf)
+        self.hung = False
+        self.corrupted = False
+        self.sensors = {}           # 칸 → ("stuck", 값) / ("drift", °C/초, 시작 틱)
+        self.door_heat = [0.0, 0.0]  # 칸별 틱당 열 유입 (°C)
+        self.episodes = []          # 수리된 장애: [시작 틱, 수리 틱]
+        self.started = 0
+
+    def tick(self, engine):
+        """이번 틱에 시작 / 수리되는 장애 처리 + 문 열림 열 유입 (engine.step 전에 호출)"""
+        tick = engine.clock.ticks
+        if tick >= self.next_tick:
+            for process in self.processes:
+                if tick >= process.next_tick:
+                    if process.active:
+                        self._stop(engine, process, tick)
+                    else:
+                        self._start(engine, process, tick)
+            self.next_tick = min(p.next_tick for p in self.processes)
+
+        if self.door_heat[0]:
+            engine.fridge_temp += self.door_heat[0]
+        if self.door_heat[1]:
+            engine.freezer_temp += self.door_heat[1]
+
+    def _start(self, engine, process, tick):
+        process.start(tick)
+        self.started += 1
+        kind, spec = process.kind, process.spec
+        if kind == "sensor_stuck":
+            value = engine.fridge_temp if process.compartment == "fridge" else engine.freezer_temp
+            self.sensors[process.compartment] = ("stuck", value)
+        elif kind == "sensor_drift":
+            self.sensors[process.compartment] = ("drift", spec["drift_per_hour"] / 3600.0, tick)
+        elif kind == "sensor_dropout":
+            seconds = process.duration_ticks * self.tick_seconds
+            if process.compartment == "fridge":
+                engine.fail_fridge_sensor(seconds)
+            else:
+                engine.fail_freezer_sensor(seconds)
+        elif kind == "controller_hang":
+            self.hung = True
+        elif kind == "door_open":
+            index = COMPARTMENTS.index(process.compartment)
+            self.door_heat[index] += spec["heat_per_second"] * self.tick_seconds
+        self.corrupted = bool(self.sensors)
+
+    def _stop(self, engine, process, tick):
+        self.episodes.append([process.start_tick, tick])
+        kind = process.kind
+        if kind in ("sensor_stuck", "sensor_drift"):
+            self.sensors.pop(process.compartment, None)
+        elif kind == "controller_hang":
+            self.hung = any(p.active and p.kind == "controller_hang"
+                            for p in self.processes if p is not process)
+        elif kind == "door_open":
+            index = COMPARTMENTS.index(process.compartment)
+            self.door_heat[index] -= process.spec["heat_per_second"] * self.tick_seconds
+            if not any(p.active and p.kind == "door_open" and p.compartment == process.compartment
+                       for p in self.processes if p is not process):
+                self.door_heat[index] = 0.0  # 누적 오차 제거
+        process.stop(tick)
+        self.corrupted = bool(self.sensors)
+
+    def reading(self, compartment, value, tick):
+        """센서 고장을 반영한 측정값"""
+        fault = self.sensors.get(compartment)
+        if fault is None:
+            return value
+        if fault[0] == "stuck":
+            return fault[1]
+        return value + fault[1] * (tick - fault[2]) * self.tick_seconds
+
+
+class FaultyController(Controller):
+    """장애 주입기를 거쳐서 보는 제어기 (센서 값 왜곡, 제어기 멈춤)"""
+
+    def __init__(self, inner, injector, clock):
+        self.inner = inner
+        self.injector = injector
+        self.clock = clock
+
+    def init_memory(self, n=None):
+        return self.inner.init_memory(n)
+
+    def decide(self, state, memory, dt):
+        injector = self.injector
+        if injector.hung:
+            # 멈춘 제어기: 출력이 그대로 남음
+            return ControlOutput(state.compressor_on, state.damper_open), memory
+        if injector.corrupted:
+            tick = self.clock.ticks
+            state = state._replace(
+                fridge_temp=injector.reading("fridge", state.fridge_temp, tick),
+                freezer_temp=injector.reading("freezer", state.freezer_temp, tick))
+        return self.inner.decide(state, memory, dt)
+
+
+def run_replica(scenario, seed, controller=None, degraded=False):
+    """시나리오 replica 하나 실행 → 결과 dict (프로세스 풀 워커)
+
+    degraded=True 면 센서 고장 때 긴급 정지 대신 성능 저하 운전 (degraded.py).
+    """
+    safety = {**DEFAULT_SAFETY, **scenario.get("safety", {})}
+    engine = FridgeEngine(seed=seed, controller=controller,
+                          degraded=DegradedController() if degraded else None)
+    dt = engine.clock.tick_seconds
+    injector = FaultInjector(scenario.get("faults", []), engine.noise.fault_rng, dt)
+    engine.controller = FaultyController(engine.controller, injector, engine.clock)
+
+    ticks = engine.clock.seconds_to_ticks(scenario.get("hours", 1) * 3600)
+    limit_ticks = max(1, int(round(safety["seconds"] / dt)))
+    fridge_limit, freezer_limit = safety["fridge_limit"], safety["freezer_limit"]
+
+    above = 0                   # 한계를 넘은 연속 틱 수
+    above_ticks = 0
+    exceeded = False
+    recover_seconds = []
+    waiting = 0                 # injector.episodes 중 아직 회복 안 된 첫 번째
+
+    for _ in range(ticks):
+        injector.tick(engine)
+        engine.step()
+
+        fridge, freezer = engine.fridge_temp, engine.freezer_temp
+        if fridge > fridge_limit or freezer > freezer_limit:
+            above += 1
+            above_ticks += 1
+            if above >= limit_ticks:
+                exceeded = True
+        else:
+            above = 0
+
+        # 수리된 장애: 온도가 정상 범위로 돌아오면 회복
+        if waiting < len(injector.episodes) and \
+           fridge <= engine.fridge_target + FRIDGE_BAND and \
+           freezer <= engine.freezer_target + FREEZER_BAND and \
+           not injector.hung and not injector.corrupted:
+            tick = engine.clock.ticks
+            for start, _ in injector.episodes[waiting:]:
+                recover_seconds.append((tick - start) * dt)
+            waiting = len(injector.episodes)
+
+    return {
+        "seed": seed,
+        "exceeded": exceeded,
+        "above_seconds": above_ticks * dt,
+        "faults": injector.started,
+        "recover_seconds": recover_seconds,
+        "unrecovered": len(injector.episodes) - waiting,
+        "fridge_max": engine.fridge_stats.max,
+        "freezer_max": engine.freezer_stats.max,
+    }
+
+
+def run_replicas(scenario, replicas=100, seed=0, controller=None, degraded=False,
+                 max_workers=None):
+    """replica 여러 개를 프로세스 풀에서 실행 (replica i 의 seed = seed + i)"""
+    validate(scenario)
+    seeds = [seed + i for i in range(replicas)]
+    chunksize = max(1, replicas // 64)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(run_replica, [scenario] * replicas, seeds,
+                             [controller] * replicas, [degraded] * replicas,
+                             chunksize=chunksize))
+
+
+def summarize(results):
+    """replica 결과 → 신뢰성 요약 dict"""
+    n = len(results)
+    exceeded = sum(r["exceeded"] for r in results)
+    p = exceeded / n if n else math.nan
+    # Wilson 95% 구간
+    z = 1.96
+    if n:
+        center = (p + z * z / (2 * n)) / (1 + z * z / n)
+        half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+    else:
+        center = half = math.nan
+    recover = np.array([s for r in results for s in r["recover_seconds"]])
+    if len(recover):
+        p50, p90, p99 = (float(x) for x in np.percentile(recover, (50, 90, 99)))
+    else:
+        p50 = p90 = p99 = math.nan
+    return {
+        "replicas": n,
+        "exceedance_probability": p,
+        "exceedance_ci95": (max(0.0, center - half), min(1.0, center + half)),
+        "faults_per_replica": sum(r["faults"] for r in results) / n if n else math.nan,
+        "recovered": len(recover),
+        "unrecovered": sum(r["unrecovered"] for r in results),
+        "recover_p50": p50,
+        "recover_p90": p90,
+        "recover_p99": p99,
+        "above_seconds_mean": sum(r["above_seconds"] for r in results) / n if n else math.nan,
+    }
+
+
+def format_report(summary):
+    lo, hi = summary["exceedance_ci95"]
+    return "\n".join([
+        f"replica 수: {summary['replicas']}",
+        f"식품 안전 한계 초과 확률: {summary['exceedance_probability']:.3f} "
+        f"(95% 구간 {lo:.3f} ~ {hi:.3f})",
+        f"replica 당 장애 수: {summary['faults_per_replica']:.2f}",
+        f"회복 시간 (초): 50% {summary['recover_p50']:.1f} / 90% {summary['recover_p90']:.1f} "
+        f"/ 99% {summary['recover_p99']:.1f} (회복 {summary['recovered']}건, "
+        f"미회복 {summary['unrecovered']}건)",
+        f"한계 초과 시간 평균: {summary['above_seconds_mean']:.1f}초",
+    ])
+
+
+# 실행
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="장애 주입 몬테카를로 신뢰성 실행")
+    parser.add_argument("--scenario", help="시나리오 JSON 파일 (없으면 DEFAULT_SCENARIO)")
+    parser.add_argument("--replicas", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--degraded", action="store_true",
+                        help="센서 고장 때 긴급 정지 대신 성능 저하 운전")
+    args = parser.parse_args()
+
+    scenario = load_scenario(args.scenario) if args.scenario else DEFAULT_SCENARIO
+    results = run_replicas(scenario, args.replicas, args.seed, degraded=args.degraded,
+                           max_workers=args.workers)
+    print(format_report(summarize(results)))
@@ -0,0 +1,254 @@
+"""여러 대의 냉장고를 한 번에 시뮬레이션하는 배치 엔진 (NumPy)
+
+FridgeEngine 을 한 대씩 돌리는 대신 상태를 (N,) 배열로 들고
+같은 물리 / 제어 규칙을 배열 연산으로 적용한다.
+- 열 유입, 압축기, 댐퍼, 범위 제한, 가우시안 노이즈: FridgeEngine.update_physics 와 동일
+- 압축기 / 댐퍼 Hysteresis: FridgeEngine.control_logic 와 동일 (마스크로 갱신)
+- 장애 타이머: 고장난 유닛은 긴급 정지 후 복구될 때까지 제어 생략
+- controller 를 주면 그 제어기(controllers.py)의 decide 를 배열 상태로 한 번 호출해
+  active 유닛에만 적용한다 (None 이면 위의 내장 Hysteresis, 작업 버퍼만 쓰는 빠른 경로)
+- sensors 에 SensorModel(n=N) 을 주면 제어 로직은 센서가 읽은 값을 본다
+  (단선 / 단락 값이 읽히는 동안 그 유닛은 센서 고장, 정상 값이 다시 읽히면 복구)
+
+로그와 틱별 기록은 남기지 않고 통계용 누적값만 들고 간다 (유닛당 O(1) 메모리).
+
+사용 예:
+    fleet = FleetEngine(100_000, seed=1)
+    fleet.run(36000)
+    print(fleet.summary())
+"""
+import numpy as np
+
+from sim_clock import SimClock
+from fridge_engine import FAIL_SECONDS, FRIDGE_RANGE, FREEZER_RANGE, SimParams, ControlState
+
+
+class FleetEngine:
+    """N 대의 냉장고 상태를 배열로 들고 한 틱씩 진행시키는 엔진"""
+
+    def __init__(self, n, params=None, seed=None, dtype=np.float64, clock=None, controller=None,
+                 sensors=None):
+        self.n = n
+        self.params = params if params is not None else SimParams()
+        self.sensors = sensors
+        self.controller = controller
+        self.control_memory = controller.init_memory(n) if controller is not None else None
+        self.dtype = dtype
+        self.rng = np.random.default_rng(seed)
+        self.clock = clock if clock is not None else SimClock()
+        self.fail_ticks = max(1, self.clock.seconds_to_ticks(FAIL_SECONDS))
+
+        # 물리 상태 변수
+        self.fridge_temp = np.full(n, 7.0, dtype=dtype)
+        self.freezer_temp = np.full(n, -10.0, dtype=dtype)
+        self.fridge_target = np.full(n, 3.0, dtype=dtype)
+        self.freezer_target = np.full(n, -18.0, dtype=dtype)
+
+        # 액추에이터 상태
+        self.compressor_on = np.zeros(n, dtype=bool)
+        self.damper_open = np.zeros(n, dtype=bool)
+
+        # 장애 타이머 (0 이면 정상)
+        self.fridge_sensor_fail_timer = np.zeros(n, dtype=np.int32)
+        self.freezer_sensor_fail_timer = np.zeros(n, dtype=np.int32)
+        self.arduino_fail_timer = np.zeros(n, dtype=np.int32)
+        # 센서가 단선 / 단락 값을 읽고 있는 유닛 (타이머 없이 정상 값이 읽힐 때까지 고장)
+        self.fridge_sensor_lost = np.zeros(n, dtype=bool)
+        self.freezer_sensor_lost = np.zeros(n, dtype=bool)
+
+        # 통계 누적값
+        self.fridge_sum = np.zeros(n)
+        self.freezer_sum = np.zeros(n)
+        self.fridge_max = np.full(n, -np.inf)
+        self.freezer_max = np.full(n, -np.inf)
+        self.compressor_on_ticks = np.zeros(n, dtype=np.int64)
+        self.compressor_switches = np.zeros(n, dtype=np.int64)
+
+        # 매 틱 재사용하는 작업 버퍼 (할당 없이 in-place 연산)
+        self._noise = np.empty((2, n), dtype=dtype)
+        self._tmp = np.empty(n, dtype=dtype)
+        self._mask = np.empty(n, dtype=bool)
+        self._prev = np.empty(n, dtype=bool)
+
+    @property
+    def tick_count(self):
+        return self.clock.ticks
+
+    @property
+    def elapsed(self):
+        return self.clock.elapsed
+
+    @property
+    def control_active(self):
+        """제어 로직이 도는 유닛 (센서 2개 정상 + Arduino 연결)"""
+        return ((self.fridge_sensor_fail_timer == 0)
+                & (self.freezer_sensor_fail_timer == 0)
+                & (self.arduino_fail_timer == 0)
+                & ~self.fridge_sensor_lost & ~self.freezer_sensor_lost)
+
+    # === 장애 시뮬레이션 ===
+    def fail_fridge_sensor(self, units):
+        self._fail(self.fridge_sensor_fail_timer, units)
+
+    def fail_freezer_sensor(self, units):
+        self._fail(self.freezer_sensor_fail_timer, units)
+
+    def fail_arduino(self, units):
+        self._fail(self.arduino_fail_timer, units)
+
+    def _fail(self, timer, units):
+        """units (인덱스 또는 bool 마스크) 에 장애 발생 + 긴급 정지"""
+        mask = np.zeros(self.n, dtype=bool)
+        mask[units] = True
+        mask &= timer == 0  # 이미 고장 중인 유닛은 그대로
+        timer[mask] = self.fail_ticks
+        self.compressor_on[mask] = False
+        self.damper_open[mask] = False
+
+    # === 한 틱 진행 ===
+    def step(self):
+        """장애 타이머 → 제어 로직 → 물리 → 통계 순서로 한 틱 진행"""
+        self.update_fault_timers()
+        if self.sensors is not None:
+            self.read_sensors()
+        self.control_logic(self.control_active)
+        self.update_physics()
+        self.clock.advance()
+        self.record()
+
+    def run(self, ticks):
+        for _ in range(ticks):
+            self.step()
+
+    def run_for(self, seconds):
+        self.run(self.clock.seconds_to_ticks(seconds))
+
+    def update_fault_timers(self):
+        for timer in (self.fridge_sensor_fail_timer,
+                      self.freezer_sensor_fail_timer,
+                      self.arduino_fail_timer):
+            np.subtract(timer, 1, out=timer, where=timer > 0)
+
+    def read_sensors(self):
+        """센서 모델 한 틱 진행, 새로 읽은 값으로 유닛별 센서 고장 / 복구
+
+        단선 / 단락 값이 읽히는 동안은 고장 유지 (복구 타이머 없음), 새로 고장난 유닛만 긴급 정지.
+        """
+        sensors = self.sensors
+        if not sensors.update(self.fridge_temp, self.freezer_temp, self.clock.tick_seconds):
+            return
+        for lost, valid in ((self.fridge_sensor_lost, sensors.fridge.valid),
+                            (self.freezer_sensor_lost, sensors.freezer.valid)):
+            np.logical_and(~valid, ~lost, out=self._mask)
+            self.compressor_on[self._mask] = False
+            self.damper_open[self._mask] = False
+            np.logical_not(valid, out=lost)
+
+    def measured(self):
+        """제어 로직이 보는 온도 (센서 모델이 있으면 읽은 값)"""
+        if self.sensors is None:
+            return self.fridge_temp, self.freezer_temp
+        return self.sensors.fridge.reading, self.sensors.freezer.reading
+
+    def control_logic(self, active):
+        """제어 로직 (controller 또는 내장 Hysteresis) - active 인 유닛만 갱신"""
+        if self.controller is not None:
+            self.apply_controller(active)
+            return
+
+        fridge, freezer = self.measured()
+        fridge_target, freezer_target = self.fridge_target, self.freezer_target
+        p = self.params
+        np.copyto(self._prev, self.compressor_on)
+
+        # === 1. 압축기 제어 ===
+        # ON: 냉동실이 더우면 무조건, 냉장실이 너무 더우면 강제 (안전장치)
+        turn_on = ((freezer > freezer_target + p.freezer_band)
+                   | (fridge > fridge_target + p.fridge_force_on))
+        # OFF: 둘 다 충분히 차가우면 (ON 조건이 우선)
+        turn_off = ((freezer < freezer_target - p.freezer_band)
+                    & (fridge < fridge_target - p.fridge_off_band) & ~turn_on)
+        # 그 외: 현재 상태 유지
+        self.compressor_on[turn_on & active] = True
+        self.compressor_on[turn_off & active] = False
+
+        np.not_equal(self._prev, self.compressor_on, out=self._mask)
+        self.compressor_switches += self._mask
+
+        # === 2. 댐퍼 제어 ===
+        # 압축기가 돌 때만 댐퍼 제어, 안 돌면 닫음
+        open_ = (fridge > fridge_target + p.damper_band) & self.compressor_on & active
+        close = ((fridge < fridge_target - p.damper_band) | ~self.compressor_on) & active
+        self.damper_open[open_] = True
+        self.damper_open[close] = False
+
+    def apply_controller(self, active):
+        """controller.decide 를 전체 유닛에 한 번 호출하고 active 인 유닛만 적용
+
+        제어기 내부 상태(memory)는 모든 유닛이 같이 진행한다.
+        """
+        fridge, freezer = self.measured()
+        state = ControlState(fridge, freezer,
+                             self.fridge_target, self.freezer_target,
+                             self.compressor_on, self.damper_open)
+        output, self.control_memory = self.controller.decide(
+            state, self.control_memory, self.clock.tick_seconds)
+
+        np.copyto(self._prev, self.compressor_on)
+        np.copyto(self.compressor_on, output.compressor_on, where=active)
+        np.copyto(self.damper_open, output.damper_open, where=active)
+        np.not_equal(self._prev, self.compressor_on, out=self._mask)
+        self.compressor_switches += self._mask
+
+    def update_physics(self):
+        """물리 시뮬레이션 - FridgeEngine.update_physics 와 같은 규칙"""
+        fridge, freezer, tmp = self.fridge_temp, self.freezer_temp, self._tmp
+        compressor, damper = self.compressor_on, self.damper_open
+        p = self.params
+
+        # 자연 상승 (외부 열 유입)
+        fridge += p.fridge_heat_leak
+        freezer += p.freezer_heat_leak
+
+        # 압축기 작동: 냉동실 냉각
+        np.multiply(compressor, p.freezer_cooling, out=tmp)
+        freezer -= tmp
+
+        # 댐퍼 열림: 냉장실 냉각 + 냉동실 찬 공기 손실 / 닫힘: 냉장실 약간 냉각
+        np.logical_and(compressor, damper, out=self._mask)
+        np.multiply(self._mask, p.damper_freezer_loss, out=tmp)
+        freezer += tmp
+        np.multiply(self._mask, p.damper_fridge_cooling - p.closed_damper_cooling, out=tmp)
+        tmp += p.closed_damper_cooling
+        tmp *= compressor
+        fridge -= tmp
+
+        # 가우시안 노이즈
+        self.rng.standard_normal(out=self._noise, dtype=self.dtype)
+        self._noise *= p.noise_std
+        fridge += self._noise[0]
+        freezer += self._noise[1]
+
+        # 온도 범위 제한
+        np.clip(fridge, *FRIDGE_RANGE, out=fridge)
+        np.clip(freezer, *FREEZER_RANGE, out=freezer)
+
+    def record(self):
+        """통계 누적값 갱신"""
+        self.fridge_sum += self.fridge_temp
+        self.freezer_sum += self.freezer_temp
+        np.maximum(self.fridge_max, self.fridge_temp, out=self.fridge_max)
+        np.maximum(self.freezer_max, self.freezer_temp, out=self.freezer_max)
+        self.compressor_on_ticks += self.compressor_on
+
+    def summary(self):
+        """유닛별 통계 (dict of (N,) 배열)"""
+        ticks = max(self.tick_count, 1)
+        return {
+            "fridge_mean": self.fridge_sum / ticks,
+            "freezer_mean": self.freezer_sum / ticks,
+            "fridge_max": self.fridge_max.copy(),
+            "freezer_max": self.freezer_max.copy(),
+            "compressor_duty": self.compressor_on_ticks / ticks,
+            "compressor_switches": self.compressor_switches.copy(),
+        }
@@ -0,0 +1,499 @@
+"""냉장고 시뮬레이션 엔진 (GUI 없음)
+
+step6_complete.py 의 물리 엔진 / 제어 로직 / 장애 타이머를 Tk 에서 분리한 모듈.
+tkinter, matplotlib 를 import 하지 않으므로 디스플레이가 없는 서버에서도 돌릴 수 있다.
+
+시간은 SimClock (틱 수) 으로 센다. 장애 타이머와 로그 타임스탬프도 시뮬레이션
+시간을 따르므로 sleep 없이 돌리면 CPU 가 허락하는 만큼 빠르게 진행된다.
+
+thermal 에 ThermalModel 을 넘기면 고정 틱당 변화량 대신 RC 열 모델로 적분한다.
+이때는 틱 크기를 키워도 된다 (예: SimClock(tick_seconds=10.0)).
+
+제어는 controller (controllers.py) 가 결정하고 엔진은 그 결과를 적용 / 로그만 한다.
+기본값은 원래 On/Off 로직인 HysteresisController(params).
+
+sensors 에 SensorModel (sensors.py) 을 넘기면 제어 로직은 실제 온도 대신
+센서가 읽은 값(지연 + ADC 양자화 + 고장)을 본다. 단선 / 단락은 센서 고장으로 처리한다.
+
+degraded 에 DegradedController (degraded.py) 를 넘기면 센서 고장 때 긴급 정지 대신
+남은 센서 + 정상 운전 때 배운 가동률로 계속 냉각한다 (None 이면 원래대로 긴급 정지).
+
+사용 예:
+    engine = FridgeEngine()
+    engine.run_for(24 * 3600)   # 하루치를 sleep 없이 진행
+    print(engine.fridge_temp, engine.freezer_temp)
+"""
+import math
+from collections import deque, namedtuple
+from dataclasses import dataclass
+
+from sim_clock import SimClock, TICK_SECONDS
+from running_stats import RunningStats
+import event_log as ev
+from event_log import CAPACITY as EVENT_CAPACITY, EventLog
+from state_frame import EVENT_TAIL, StateFrame
+from noise import BLOCK_SIZE, NoiseStreams
+from energy import EnergyMeter
+
+FAIL_SECONDS = 5.0      # 장애 복구까지 걸리는 시뮬레이션 시간
+FAIL_TICKS = int(round(FAIL_SECONDS / TICK_SECONDS))
+HISTORY_LEN = 100       # 그래프용 데이터 개수
+FRIDGE_RANGE = (-5.0, 15.0)     # 온도 제한 범위 (°C)
+FREEZER_RANGE = (-30.0, -5.0)
+
+
+@dataclass(frozen=True)
+class SimParams:
+    """제어 / 물리 상수 (기본값 = 원래 하드코딩 값)"""
+    # 제어 (Hysteresis 폭, °C)
+    freezer_band: float = 2.0           # 냉동실 목표 ±2 에서 압축기 ON/OFF
+    fridge_force_on: float = 3.0        # 냉장실 목표 +3 이상이면 강제 ON
+    fridge_off_band: float = 1.0        # 냉장실 목표 -1 이하여야 OFF
+    damper_band: float = 1.0            # 댐퍼 목표 ±1 에서 열림/닫힘
+
+    # 물리 (틱당 온도 변화, °C)
+    fridge_heat_leak: float = 0.02      # 냉장실 자연 상승
+    freezer_heat_leak: float = 0.01     # 냉동실 자연 상승
+    freezer_cooling: float = 0.15       # 압축기 작동 시 냉동실 냉각
+    damper_fridge_cooling: float = 0.08  # 댐퍼 열림: 냉장실 냉각
+    damper_freezer_loss: float = 0.05   # 댐퍼 열림: 냉동실 찬 공기 손실
+    closed_damper_cooling: float = 0.01  # 댐퍼 닫힘: 냉장실 냉각
+    noise_std: float = 0.05             # 가우시안 노이즈 표준편차
+
+
+# 제어기 입력 / 출력 (필드는 스칼라, FleetEngine 에서는 (N,) 배열)
+ControlState = namedtuple("ControlState", [
+    "fridge_temp", "freezer_temp", "fridge_target", "freezer_target",
+    "compressor_on", "damper_open",
+])
+ControlOutput = namedtuple("ControlOutput", ["compressor_on", "damper_open"])
+
+
+class FridgeEngine:
+    """냉장고 상태를 들고 한 틱씩 진행시키는 엔진"""
+
+    def __init__(self, params=None, clock=None, seed=None, thermal=None, controller=None,
+                 power=None, sensors=None, degraded=None, link=None,
+                 event_capacity=EVENT_CAPACITY, block_size=BLOCK_SIZE):
+        # 제어 / 물리 상수
+        self.params = params if params is not None else SimParams()
+
+        # Arduino 직렬 링크 (arduino_link.ArduinoBridge, None 이면 제어를 엔진 안에서)
+        self.link = link
+
+        # 제어기 (controllers.py 가 SimParams 를 import 하므로 기본값은 여기서 import)
+        # 링크가 있으면 링크 건너편 Arduino 의 결정을 따른다
+        if controller is None and link is not None:
+            controller = link
+        if controller is None:
+            from controllers import HysteresisController
+            controller = HysteresisController(self.params)
+        self.controller = controller
+        self.control_memory = controller.init_memory()
+
+        # 열 모델 (None 이면 SimParams 의 틱당 변화량 사용)
+        self.thermal = thermal
+
+        # 센서 모델 (None 이면 제어 로직이 실제 온도를 그대로 읽음)
+        self.sensors = sensors
+        self.sensor_valid = (True, True)    # 마지막으로 읽은 값이 범위 안인지 (냉장실, 냉동실)
+
+        # 센서 고장 시 성능 저하 운전 (None 이면 긴급 정지)
+        self.degraded = degraded
+        self.degraded_memory = None
+        self.degraded_lost = (False, False)     # (냉장실, 냉동실) 센서 없이 운전 중
+
+        # 난수 스트림 (같은 seed 면 같은 결과)
+        # (block_size: 스트림마다 미리 뽑아두는 개수, 유닛을 많이 띄우면 줄여서 메모리 절약)
+        self.noise = NoiseStreams(seed, block_size)
+
+        # 물리 상태 변수
+        self.fridge_temp = 7.0  # 초기 온도 (높게 시작)
+        self.freezer_temp = -10.0
+        self.fridge_target = 3.0  # 희망 온도
+        self.freezer_target = -18.0
+
+        # 액추에이터 상태
+        self.compressor_on = False
+        self.damper_open = False
+
+        # 센서 상태
+        self.fridge_sensor_ok = True
+        self.freezer_sensor_ok = True
+        self.arduino_connected = True
+
+        # 장애 시뮬레이션
+        self.fridge_sensor_fail_timer = 0
+        self.freezer_sensor_fail_timer = 0
+        self.arduino_fail_timer = 0
+
+        # 시뮬레이션 시계
+        self.clock = clock if clock is not None else SimClock()
+        self.fail_ticks = max(1, self.clock.seconds_to_ticks(FAIL_SECONDS))
+        # 노이즈는 0.1초 틱 기준 표준편차 → 틱 크기에 맞춰 sqrt 배
+        self.noise_scale = math.sqrt(self.clock.tick_seconds / TICK_SECONDS)
+
+        # 데이터 기록 (그래프용)
+        self.time_data = deque(maxlen=HISTORY_LEN)
+        self.fridge_data = deque(maxlen=HISTORY_LEN)
+        self.freezer_data = deque(maxlen=HISTORY_LEN)
+
+        # 이벤트 로그 (고정 크기 링 버퍼 event_capacity 개, 표시 문자열은 볼 때 생성)
+        self.events = EventLog(event_capacity, start=self.clock.start_datetime)
+        # 프레임에 싣는 최근 이벤트 (새 이벤트가 생겼을 때만 다시 만듦)
+        self._event_tail = ()
+        self._event_tail_total = 0
+
+        # 다른 스레드(GUI)에서 보낸 명령 (다음 틱 시작 때 실행)
+        # deque 의 append / popleft 는 원자적이라 락이 필요 없다
+        self.commands = deque()
+
+        # 통계 (샘플당 O(1) 누적)
+        self.fridge_stats = RunningStats()
+        self.freezer_stats = RunningStats()
+
+        # 에너지 / 압축기 마모 집계 (power: energy.PowerModel)
+        self.energy = EnergyMeter(power, self.compressor_on, self.damper_open)
+
+        # 전체 시계열 기록기 (recorder.ColumnarRecorder 등, None 이면 기록 안 함)
+        self.recorder = None
+
+        # 텔레메트리 발행기 (telemetry.TelemetryPublisher, None 이면 발행 안 함)
+        self.telemetry = None
+
+    @property
+    def tick_count(self):
+        """진행된 틱 수"""
+        return self.clock.ticks
+
+    @property
+    def elapsed(self):
+        """시뮬레이션 경과 시간 (초)"""
+        return self.clock.elapsed
+
+    def post(self, func, *args):
+        """다른 스레드에서 엔진 메서드 호출 예약 (물리 스레드가 다음 틱에 실행)"""
+        self.commands.append((func, args))
+
+    def run_commands(self):
+        while self.commands:
+            func, args = self.commands.popleft()
+            func(*args)
+
+    def snapshot(self):
+        """현재 상태의 불변 StateFrame"""
+        return StateFrame(
+            self.clock.ticks, self.clock.elapsed,
+            self.fridge_temp, self.freezer_temp, self.fridge_target, self.freezer_target,
+            self.compressor_on, self.damper_open,
+            self.fridge_sensor_ok, self.freezer_sensor_ok, self.arduino_connected,
+            self.fridge_sensor_fail_timer, self.freezer_sensor_fail_timer, self.arduino_fail_timer,
+            self.fridge_stats.snapshot(), self.freezer_stats.snapshot(),
+            self.events.total, self.event_tail(), self.energy.snapshot(),
+        )
+
+    def event_tail(self):
+        """최근 EVENT_TAIL 개 이벤트 튜플 (이벤트 수가 바뀐 틱에만 새로 만듦)"""
+        total = self.events.total
+        if total != self._event_tail_total:
+            self._event_tail = self.events.tail(EVENT_TAIL)
+            self._event_tail_total = total
+        return self._event_tail
+
+    # === 희망 온도 ===
+    def set_fridge_target(self, value):
+        self.fridge_target = round(float(value), 1)
+        self.log_event(ev.TARGET_CHANGED, ev.FRIDGE, self.fridge_target)
+
+    def set_freezer_target(self, value):
+        self.freezer_target = round(float(value), 1)
+        self.log_event(ev.TARGET_CHANGED, ev.FREEZER, self.freezer_target)
+
+    # === 장애 시뮬레이션 ===
+    def fault_ticks(self, seconds):
+        """장애 지속 틱 수 (seconds=None 이면 기본 FAIL_SECONDS)"""
+        if seconds is None:
+            return self.fail_ticks
+        return max(1, self.clock.seconds_to_ticks(seconds))
+
+    def fail_fridge_sensor(self, seconds=None):
+        """냉장실 센서 고장 seconds 초 (이미 고장 중이면 False)"""
+        if self.fridge_sensor_fail_timer != 0 or not self.fridge_sensor_ok:
+            return False
+        self.fridge_sensor_fail_timer = self.fault_ticks(seconds)
+        self.fridge_sensor_ok = False
+        if self.degraded is None:
+            self.emergency_stop()
+        self.log_event(ev.SENSOR_FAIL, ev.FRIDGE)
+        return True
+
+    def fail_freezer_sensor(self, seconds=None):
+        """냉동실 센서 고장 seconds 초 (이미 고장 중이면 False)"""
+        if self.freezer_sensor_fail_timer != 0 or not self.freezer_sensor_ok:
+            return False
+        self.freezer_sensor_fail_timer = self.fault_ticks(seconds)
+        self.freezer_sensor_ok = False
+        if self.degraded is None:
+            self.emergency_stop()
+        self.log_event(ev.SENSOR_FAIL, ev.FREEZER)
+        return True
+
+    def fail_arduino(self, seconds=None):
+        """제어기 통신 두절 seconds 초 (이미 두절 중이면 False)"""
+        if self.arduino_fail_timer != 0:
+            return False
+        self.arduino_fail_timer = self.fault_ticks(seconds)
+        self.arduino_connected = False
+        self.emergency_stop()
+        self.log_event(ev.ARDUINO_FAIL)
+        return True
+
+    def lose_link(self):
+        """링크 응답 타임아웃 (ArduinoBridge 가 호출) - 통신 두절 처리 (이미 두절이면 False)"""
+        if not self.arduino_connected:
+            return False
+        self.arduino_connected = False
+        self.emergency_stop()
+        self.log_event(ev.ARDUINO_FAIL)
+        return True
+
+    def restore_link(self):
+        """링크 응답이 다시 옴 (고장 버튼 타이머가 돌고 있으면 그쪽이 복구)"""
+        if self.arduino_connected or self.arduino_fail_timer != 0:
+            return False
+        self.arduino_connected = True
+        self.log_event(ev.ARDUINO_RECOVERED)
+        return True
+
+    def emergency_stop(self):
+        """긴급 정지"""
+        self.compressor_on = False
+        self.damper_open = False
+        self.log_event(ev.EMERGENCY_STOP)
+
+    # === 한 틱 진행 ===
+    def step(self):
+        """명령 → 장애 타이머 → (센서 / 링크) → 제어 로직 → 물리 → 기록 순서로 한 틱 진행"""
+        if self.commands:
+            self.run_commands()
+
+        self.update_fault_timers()
+
+        if self.sensors is not None:
+            self.read_sensors()
+
+        if self.link is not None:
+            self.link.poll(self)
+
+        # 센서가 정상이고, Arduino 연결된 경우만 제어 로직 실행
+        if self.fridge_sensor_ok and self.freezer_sensor_ok and self.arduino_connected:
+            self.control_logic()
+            if self.degraded is not None:
+                self.degraded_lost = (False, False)
+                self.learn_duty(self.clock.tick_seconds)
+        elif self.degraded is not None and self.arduino_connected:
+            # 센서만 고장: 성능 저하 운전
+            self.degraded_control()
+
+        # 물리 시뮬레이션
+        self.update_physics()
+
+        self.clock.advance()
+        self.record()
+
+    def run(self, ticks):
+        """ticks 만큼 쉬지 않고 진행"""
+        for _ in range(ticks):
+            self.step()
+
+    def run_for(self, seconds):
+        """시뮬레이션 시간 seconds 초 만큼 쉬지 않고 진행"""
+        self.run(self.clock.seconds_to_ticks(seconds))
+
+    def update_fault_timers(self):
+        """장애 타이머 감소 및 복구"""
+        if self.fridge_sensor_fail_timer > 0:
+            self.fridge_sensor_fail_timer -= 1
+            if self.fridge_sensor_fail_timer == 0:
+                self.fridge_sensor_ok = True
+                self.log_event(ev.SENSOR_RECOVERED, ev.FRIDGE)
+
+        if self.freezer_sensor_fail_timer > 0:
+            self.freezer_sensor_fail_timer -= 1
+            if self.freezer_sensor_fail_timer == 0:
+                self.freezer_sensor_ok = True
+                self.log_event(ev.SENSOR_RECOVERED, ev.FREEZER)
+
+        if self.arduino_fail_timer > 0:
+            self.arduino_fail_timer -= 1
+            if self.arduino_fail_timer == 0:
+                self.arduino_connected = True
+                self.log_event(ev.ARDUINO_RECOVERED)
+
+    def read_sensors(self):
+        """센서 모델 한 틱 진행, 새로 읽은 값으로 센서 고장 / 복구 처리
+
+        단선 / 단락 값이 읽히는 동안은 복구 타이머 없이 고장 상태를 유지하고
+        정상 범위 값이 다시 읽히면 복구한다. 고장 버튼 타이머가 돌고 있으면 기다리고,
+        타이머가 끝났을 때 마지막 값이 아직 범위 밖이면 바로 다시 고장 처리한다.
+        """
+        sensors = self.sensors
+        if sensors.update(self.fridge_temp, self.freezer_temp, self.clock.tick_seconds):
+            self.sensor_valid = (bool(sensors.fridge.valid), bool(sensors.freezer.valid))
+        fridge_valid, freezer_valid = self.sensor_valid
+        if self.fridge_sensor_ok != fridge_valid and self.fridge_sensor_fail_timer == 0:
+            self.fridge_sensor_ok = fridge_valid
+            self.sensor_changed(ev.FRIDGE, fridge_valid)
+        if self.freezer_sensor_ok != freezer_valid and self.freezer_sensor_fail_timer == 0:
+            self.freezer_sensor_ok = freezer_valid
+            self.sensor_changed(ev.FREEZER, freezer_valid)
+
+    def sensor_changed(self, compartment, ok):
+        """읽은 값으로 센서가 고장 / 복구됨 - 고장이면 (성능 저하 운전이 없을 때) 긴급 정지"""
+        if ok:
+            self.log_event(ev.SENSOR_RECOVERED, compartment)
+            return
+        if self.degraded is None:
+            self.emergency_stop()
+        self.log_event(ev.SENSOR_FAIL, compartment)
+
+    def measured(self):
+        """제어 로직이 보는 온도 (센서 모델이 있으면 읽은 값)"""
+        if self.sensors is None:
+            return self.fridge_temp, self.freezer_temp
+        return float(self.sensors.fridge.reading), float(self.sensors.freezer.reading)
+
+    def control_logic(self):
+        """제어 로직 - controller 결정을 적용하고 바뀐 것만 로그"""
+        fridge, freezer = self.measured()
+        state = ControlState(fridge, freezer,
+                             self.fridge_target, self.freezer_target,
+                             self.compressor_on, self.damper_open)
+        output, self.control_memory = self.controller.decide(
+            state, self.control_memory, self.clock.tick_seconds)
+        self.apply_control(output)
+
+    def degraded_control(self):
+        """성능 저하 운전 - 고장난 센서 온도는 NaN 으로 넘김"""
+        lost = (not self.fridge_sensor_ok, not self.freezer_sensor_ok)
+        if lost != self.degraded_lost:
+            if self.degraded_lost == (False, False):
+                self.degraded_memory = self.degraded.init_memory()
+            # 새로 빠진 센서마다 로그
+            if lost[0] and not self.degraded_lost[0]:
+                self.log_event(ev.DEGRADED_MODE, ev.FRIDGE)
+            if lost[1] and not self.degraded_lost[1]:
+                self.log_event(ev.DEGRADED_MODE, ev.FREEZER)
+            self.degraded_lost = lost
+
+        fridge, freezer = self.measured()
+        state = ControlState(math.nan if lost[0] else fridge, math.nan if lost[1] else freezer,
+                             self.fridge_target, self.freezer_target,
+                             self.compressor_on, self.damper_open)
+        output, self.degraded_memory = self.degraded.decide(
+            state, self.degraded_memory, self.clock.tick_seconds)
+        self.apply_control(output)
+
+    def learn_duty(self, seconds):
+        """정상 운전 상태를 성능 저하 운전용으로 학습"""
+        self.degraded.learn(self.compressor_on, self.damper_open, seconds)
+
+    def apply_control(self, output):
+        """제어 결과 적용 + 바뀐 것만 로그"""
+        prev_compressor = self.compressor_on
+        prev_damper = self.damper_open
+        self.compressor_on = bool(output.compressor_on)
+        self.damper_open = bool(output.damper_open)
+
+        # 상태 변경 시 로그
+        if prev_compressor != self.compressor_on:
+            if self.compressor_on:
+                self.log_event(ev.COMPRESSOR_ON)
+            else:
+                self.log_event(ev.COMPRESSOR_OFF)
+
+        if prev_damper != self.damper_open:
+            if self.damper_open:
+                self.log_event(ev.DAMPER_OPEN)
+            else:
+                if self.compressor_on:
+                    self.log_event(ev.DAMPER_CLOSED)
+                else:
+                    self.log_event(ev.DAMPER_CLOSED_STOP)
+
+    def update_physics(self):
+        """물리 시뮬레이션 - 실제 냉장고 물리"""
+        p = self.params
+
+        if self.thermal is not None:
+            self.fridge_temp, self.freezer_temp = self.thermal.step(
+                self.fridge_temp, self.freezer_temp,
+                self.compressor_on, self.damper_open, self.clock.tick_seconds)
+            noise = p.noise_std * self.noise_scale
+            self.fridge_temp += self.noise.fridge.next() * noise
+            self.freezer_temp += self.noise.freezer.next() * noise
+            self.clamp_temps()
+            return
+
+        # 자연 상승 (외부 열 유입)
+        self.fridge_temp += p.fridge_heat_leak
+        self.freezer_temp += p.freezer_heat_leak
+
+        # 압축기 작동
+        if self.compressor_on:
+            self.freezer_temp -= p.freezer_cooling  # 냉동실 냉각
+
+            if self.damper_open:
+                # 댐퍼 열림: 냉동실 찬 공기가 냉장실로 이동
+                self.fridge_temp -= p.damper_fridge_cooling   # 냉장실 냉각
+                self.freezer_temp += p.damper_freezer_loss  # 냉동실 온도 상승 (찬 공기 손실!)
+            else:
+                # 댐퍼 닫혀도 약간 영향
+                self.fridge_temp -= p.closed_damper_cooling
+
+        # 가우시안 노이즈 (센서 노이즈)
+        self.fridge_temp += self.noise.fridge.next() * p.noise_std
+        self.freezer_temp += self.noise.freezer.next() * p.noise_std
+
+        self.clamp_temps()
+
+    def clamp_temps(self):
+        """온도 범위 제한"""
+        self.fridge_temp = max(FRIDGE_RANGE[0], min(FRIDGE_RANGE[1], self.fridge_temp))
+        self.freezer_temp = max(FREEZER_RANGE[0], min(FREEZER_RANGE[1], self.freezer_temp))
+
+    def record(self):
+        """그래프 / 통계용 데이터 기록"""
+        self.time_data.append(self.elapsed)
+        self.fridge_data.append(self.fridge_temp)
+        self.freezer_data.append(self.freezer_temp)
+
+        self.fridge_stats.add(self.fridge_temp)
+        self.freezer_stats.add(self.freezer_temp)
+        self.energy.update(self.compressor_on, self.damper_open, self.clock.tick_seconds)
+
+        if self.recorder is not None:
+            self.recorder.record(self)
+        if self.telemetry is not None:
+            self.telemetry.record(self)
+
+    def record_block(self, ticks, start_fridge, start_freezer, noise_std):
+        """여러 틱을 한 번에 건너뛴 뒤 기록 (fast_forward 용)
+
+        그래프에는 끝점 하나만, 통계에는 start → 현재 온도로 이어진 구간 전체를 합친다.
+        """
+        self.time_data.append(self.elapsed)
+        self.fridge_data.append(self.fridge_temp)
+        self.freezer_data.append(self.freezer_temp)
+
+        self.fridge_stats.add_path(ticks, start_fridge, self.fridge_temp, noise_std)
+        self.freezer_stats.add_path(ticks, start_freezer, self.freezer_temp, noise_std)
+        # 건너뛴 구간 동안 압축기 / 댐퍼 상태는 그대로
+        self.energy.update(self.compressor_on, self.damper_open, ticks * self.clock.tick_seconds)
+        if self.degraded is not None:
+            self.learn_duty(ticks * self.clock.tick_seconds)
+        # recorder / telemetry 는 틱마다 한 행을 가정하므로 붙어 있으면 fast_forward 가 건너뛰지 않음
+
+    def log_event(self, code, compartment=ev.NONE, value=math.nan):
+        """이벤트 기록 (현재 틱 / 시뮬레이션 시간으로)"""
+        self.events.add(self.clock.ticks, self.clock.elapsed, code, compartment, value)
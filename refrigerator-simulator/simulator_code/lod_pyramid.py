@@ -0,0 +1,159 @@
+"""최소/최대 피라미드 (그래프 LOD, 오실로스코프 방식)
+
+샘플이 들어올 때마다 여러 해상도의 (최소, 최대) 버킷을 쌓아둔다.
+- 레벨 0: 원본 샘플
+- 레벨 k: 레벨 k-1 의 버킷 FANOUT 개를 하나로 합친 것 (시간 = 첫 버킷 시간)
+
+그래프는 보여줄 시간 구간과 픽셀 폭을 주고 envelope() 를 부르면
+버킷 수가 픽셀 폭 이하가 되는 가장 세밀한 레벨을 골라 (최소, 최대) 선을 돌려준다.
+→ 10초를 보든 7일을 보든 그리는 점 수는 거의 같다.
+
+레벨마다 최근 max_len ~ 2*max_len 개만 남기고 앞쪽은 잘라내므로
+오래된 구간은 자동으로 거친 레벨에서만 보인다 (메모리 상한 있음).
+"""
+import numpy as np
+
+FANOUT = 4
+MAX_LEN = 1 << 18       # 레벨마다 남기는 버킷 수 (0.1초 샘플이면 레벨 0 은 약 7시간)
+LEVELS = 10             # 레벨 9 의 버킷 하나 = 샘플 4^9 개
+
+
+class _Level:
+    """한 해상도의 버킷 배열 (필요하면 두 배로 늘어나는 NumPy 버퍼)"""
+
+    def __init__(self, channels, capacity=1024):
+        self.times = np.empty(capacity)
+        self.mins = np.empty((channels, capacity))
+        self.maxs = np.empty((channels, capacity))
+        self.size = 0           # 버퍼에 있는 버킷 수
+        self.dropped = 0        # 앞에서 잘라낸 버킷 수 (절대 번호 = dropped + 버퍼 위치)
+        self.consumed = 0       # 윗 레벨로 합쳐진 버킷 수 (절대 번호)
+
+    @property
+    def total(self):
+        return self.dropped + self.size
+
+    def append(self, times, mins, maxs):
+        n = len(times)
+        need = self.size + n
+        if need > len(self.times):
+            capacity = max(need, 2 * len(self.times))
+            for name in ("times", "mins", "maxs"):
+                old = getattr(self, name)
+                new = np.empty(old.shape[:-1] + (capacity,))
+                new[..., :self.size] = old[..., :self.size]
+                setattr(self, name, new)
+        self.times[self.size:need] = times
+        self.mins[:, self.size:need] = mins
+        self.maxs[:, self.size:need] = maxs
+        self.size = need
+
+    def trim(self, max_len):
+        """2*max_len 을 넘으면 윗 레벨로 합쳐진 앞쪽 버킷을 잘라냄"""
+        if self.size <= 2 * max_len:
+            return
+        drop = min(self.size - max_len, self.consumed - self.dropped)
+        if drop <= 0:
+            return
+        keep = self.size - drop
+        self.times[:keep] = self.times[drop:self.size]
+        self.mins[:, :keep] = self.mins[:, drop:self.size]
+        self.maxs[:, :keep] = self.maxs[:, drop:self.size]
+        self.size = keep
+        self.dropped += drop
+
+    def pending(self):
+        """아직 윗 레벨로 합쳐지지 않은 버킷 (버퍼 위치 범위)"""
+        return self.consumed - self.dropped, self.size
+
+
+class MinMaxPyramid:
+    """채널 여러 개의 (최소, 최대) 피라미드 (같은 시간축 공유)"""
+
+    def __init__(self, channels=1, fanout=FANOUT, max_len=MAX_LEN, levels=LEVELS):
+        self.channels = channels
+        self.fanout = fanout
+        self.max_len = max_len
+        self.n_levels = levels
+        self.reset()
+
+    def reset(self):
+        self.levels = [_Level(self.channels) for _ in range(self.n_levels)]
+
+    def __len__(self):
+        """지금까지 들어온 샘플 수"""
+        return self.levels[0].total
+
+    def add(self, time, *values):
+        """샘플 하나 추가 (많이 넣을 때는 add_many 가 훨씬 빠름)"""
+        self.add_many([time], [[value] for value in values])
+
+    def add_many(self, times, values):
+        """샘플 여러 개 추가 (values: 채널별 배열, shape = (channels, n))"""
+        times = np.asarray(times, dtype=float)
+        if len(times) == 0:
+            return
+        values = np.asarray(values, dtype=float).reshape(self.channels, len(times))
+        self.levels[0].append(times, values, values)
+
+        # 아래 레벨에서 FANOUT 개가 모일 때마다 윗 레벨 버킷 하나로
+        fanout = self.fanout
+        for lower, upper in zip(self.levels, self.levels[1:]):
+            start, end = lower.pending()
+            groups = (end - start) // fanout
+            if groups == 0:
+                break
+            end = start + groups * fanout
+            shape = (self.channels, groups, fanout)
+            upper.append(lower.times[start:end:fanout],
+                         lower.mins[:, start:end].reshape(shape).min(axis=2),
+                         lower.maxs[:, start:end].reshape(shape).max(axis=2))
+            lower.consumed += groups * fanout
+            lower.trim(self.max_len)
+
+    def _tail(self, k):
+        """레벨 k 에 아직 안 들어간 최근 샘플 → 아래 레벨별 부분 버킷 (시간 순)"""
+        times, mins, maxs = [], [], []
+        for level in reversed(self.levels[:k]):
+            start, end = level.pending()
+            if end > start:
+                times.append(level.times[start])
+                mins.append(level.mins[:, start:end].min(axis=1))
+                maxs.append(level.maxs[:, start:end].max(axis=1))
+        if not times:
+            return np.empty(0), np.empty((self.channels, 0)), np.empty((self.channels, 0))
+        return np.array(times), np.array(mins).T, np.array(maxs).T
+
+    def window(self, t0, t1, max_points):
+        """[t0, t1] 구간을 max_points 개 이하 버킷으로 → (times, mins, maxs)
+
+        mins / maxs 의 shape 은 (channels, 버킷 수).
+        """
+        last = self.n_levels - 1
+        for k, level in enumerate(self.levels):
+            times = level.times[:level.size]
+            # 앞쪽을 잘라낸 레벨은 t0 까지 남아 있어야 사용
+            covers = level.dropped == 0 or (level.size and times[0] <= t0)
+            if not covers and k != last:
+                continue
+            i0 = int(np.searchsorted(times, t0, side="left"))
+            i1 = int(np.searchsorted(times, t1, side="right"))
+            tail_times, tail_mins, tail_maxs = self._tail(k)
+            keep = (tail_times >= t0) & (tail_times <= t1)
+            if (i1 - i0) + int(keep.sum()) <= max_points or k == last:
+                return (np.concatenate([times[i0:i1], tail_times[keep]]),
+                        np.concatenate([level.mins[:, i0:i1], tail_mins[:, keep]], axis=1),
+                        np.concatenate([level.maxs[:, i0:i1], tail_maxs[:, keep]], axis=1))
+
+    def envelope(self, t0, t1, max_points):
+        """그리기용 (최소, 최대) 선 → (xs, ys)
+
+        버킷마다 같은 x 에 최소 → 최대 두 점을 두어 세로 막대가 이어진 모양이 된다.
+        ys 의 shape 은 (channels, 2 * 버킷 수).
+        """
+        times, mins, maxs = self.window(t0, t1, max_points)
+        xs = np.repeat(times, 2)
+        ys = np.empty((self.channels, 2 * len(times)))
+        ys[:, 0::2] = mins
+        ys[:, 1::2] = maxs
+        return xs, ys
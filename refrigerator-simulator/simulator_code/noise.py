@@ -0,0 +1,73 @@
+"""시드 고정 난수 스트림 (블록 단위 미리 생성)
+
+전역 random 모듈 대신 시뮬레이션마다 시드 하나로 독립 스트림을 만든다.
+- fridge / freezer: 냉장실 / 냉동실 노이즈 (표준정규분포)
+- fault: 장애 주입용 (0~1 균등분포) + fault_rng (그 외 분포가 필요할 때)
+
+각 스트림은 NumPy 로 BLOCK_SIZE 개씩 한 번에 뽑아두고 인덱스로 하나씩 꺼내 쓴다.
+같은 시드면 두 실행 결과가 비트 단위로 같다 (block_size 가 달라도 같은 수열).
+블록은 ndarray 그대로 둔다 (float 리스트보다 4배 작음, 유닛 수천 대면 block_size 도 줄임).
+"""
+import numpy as np
+
+BLOCK_SIZE = 65536
+
+
+class BlockStream:
+    """미리 뽑아둔 블록에서 하나씩 꺼내는 난수 스트림"""
+
+    def __init__(self, rng, kind="normal", block_size=BLOCK_SIZE):
+        if kind not in ("normal", "uniform"):
+            raise ValueError(f"unknown kind: {kind}")
+        self.rng = rng
+        self.kind = kind
+        self.block_size = block_size
+        self._block = np.empty(0)
+        self._index = 0
+
+    def _refill(self):
+        if self.kind == "normal":
+            self._block = self.rng.standard_normal(self.block_size)
+        else:
+            self._block = self.rng.random(self.block_size)
+        self._index = 0
+
+    def next(self):
+        if self._index == len(self._block):
+            self._refill()
+        value = self._block.item(self._index)   # 파이썬 float 로 꺼냄
+        self._index += 1
+        return value
+
+    def take(self, n):
+        """n 개를 배열로 (블록 경계를 넘어가도 순서 유지)"""
+        out = np.empty(n)
+        filled = 0
+        while filled < n:
+            if self._index == len(self._block):
+                self._refill()
+            count = min(n - filled, len(self._block) - self._index)
+            out[filled:filled + count] = self._block[self._index:self._index + count]
+            self._index += count
+            filled += count
+        return out
+
+
+class NoiseStreams:
+    """시뮬레이션 하나의 난수 스트림 묶음 (시드 하나 → 독립 스트림 3개)"""
+
+    def __init__(self, seed=None, block_size=BLOCK_SIZE):
+        self.seed_sequence = np.random.SeedSequence(seed)
+        fridge_seq, freezer_seq, fault_seq = self.seed_sequence.spawn(3)
+
+        self.fridge = BlockStream(np.random.default_rng(fridge_seq), "normal", block_size)
+        self.freezer = BlockStream(np.random.default_rng(freezer_seq), "normal", block_size)
+
+        # 장애 주입: 균등분포 스트림 + 다른 분포용 Generator
+        self.fault_rng = np.random.default_rng(fault_seq)
+        self.fault = BlockStream(self.fault_rng, "uniform", block_size)
+
+    @property
+    def seed(self):
+        """실제로 쓰인 시드 (seed=None 이면 자동으로 뽑힌 값 → 재현할 때 사용)"""
+        return self.seed_sequence.entropy
@@ -0,0 +1,129 @@
+"""제어 / 물리 상수 파라미터 스윕
+
+SimParams 의 값 조합(그리드)마다 헤드리스 FridgeEngine 을 돌리고
+결과를 한 줄짜리 표로 모은다. 조합들은 ProcessPoolExecutor 로 모든 코어에 나눠 돌린다.
+
+결과 항목:
+- compressor_duty: 압축기 가동률 (0~1)
+- switches: 압축기 ON/OFF 전환 횟수
+- out_of_band: 목표 범위를 벗어난 시간 비율 (냉장실 ±FRIDGE_BAND, 냉동실 ±FREEZER_BAND)
+- fridge_mean / fridge_max / freezer_mean / freezer_max: 온도 (°C)
+
+사용 예:
+    rows = sweep({"freezer_band": [1.0, 2.0, 3.0],
+                  "freezer_cooling": [0.10, 0.15]}, hours=24)
+    print(format_table(rows))
+"""
+import csv
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+
+from fridge_engine import FridgeEngine, SimParams
+from sim_clock import SimClock
+
+# 결과 평가용 목표 범위 (°C) - 스윕하는 Hysteresis 폭과는 별개로 고정
+FRIDGE_BAND = 2.0
+FREEZER_BAND = 3.0
+
+RESULT_COLUMNS = [
+    "compressor_duty", "switches", "out_of_band",
+    "fridge_mean", "fridge_max", "freezer_mean", "freezer_max",
+]
+
+
+def make_grid(grid, base=None):
+    """{이름: [값, ...]} → SimParams 조합 리스트 (모든 조합)"""
+    base = base if base is not None else SimParams()
+    names = list(grid)
+    combos = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        combos.append(SimParams(**{**asdict(base), **dict(zip(names, values))}))
+    return combos
+
+
+def run_case(params, ticks, seed=None):
+    """조합 하나 실행 → 결과 dict (프로세스 풀 워커)"""
+    engine = FridgeEngine(params, seed=seed)
+
+    on_ticks = switches = out_ticks = 0
+    prev_compressor = engine.compressor_on
+
+    for _ in range(ticks):
+        engine.step()
+        fridge, freezer = engine.fridge_temp, engine.freezer_temp
+
+        if engine.compressor_on:
+            on_ticks += 1
+        if engine.compressor_on != prev_compressor:
+            switches += 1
+            prev_compressor = engine.compressor_on
+        if abs(fridge - engine.fridge_target) > FRIDGE_BAND or \
+           abs(freezer - engine.freezer_target) > FREEZER_BAND:
+            out_ticks += 1
+
+    ticks = max(ticks, 1)
+    return {
+        **asdict(params),
+        "seed": seed,
+        "compressor_duty": on_ticks / ticks,
+        "switches": switches,
+        "out_of_band": out_ticks / ticks,
+        "fridge_mean": engine.fridge_stats.mean,
+        "fridge_max": engine.fridge_stats.max,
+        "freezer_mean": engine.freezer_stats.mean,
+        "freezer_max": engine.freezer_stats.max,
+    }
+
+
+def sweep(grid, hours=24.0, seed=0, base=None, max_workers=None):
+    """그리드의 모든 조합을 프로세스 풀에서 실행 → 결과 dict 리스트 (그리드 순서)
+
+    모든 조합이 같은 seed 로 돈다 (공통 난수: 노이즈가 같으므로 차이는 파라미터에서만 나옴).
+    seed 에 리스트를 주면 조합마다 그 seed 들을 모두 돌린다 (조합 순서 → seed 순서).
+    """
+    seeds = list(seed) if isinstance(seed, (list, tuple, range)) else [seed]
+    cases = [(params, s) for params in make_grid(grid, base) for s in seeds]
+    ticks = SimClock().seconds_to_ticks(hours * 3600)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(run_case, [params for params, _ in cases],
+                             [ticks] * len(cases), [s for _, s in cases]))
+
+
+def format_table(rows, columns=None):
+    """결과를 보기 좋은 텍스트 표로"""
+    if not rows:
+        return ""
+    if columns is None:
+        # 조합마다 바뀐 파라미터만 보여준다
+        params = [name for name in [*asdict(SimParams()), "seed"]
+                  if len({row[name] for row in rows}) > 1]
+        columns = params + RESULT_COLUMNS
+
+    def fmt(value):
+        return f"{value:.3f}" if isinstance(value, float) else str(value)
+
+    cells = [[fmt(row[col]) for col in columns] for row in rows]
+    widths = [max(len(col), *(len(r[i]) for r in cells)) for i, col in enumerate(columns)]
+    lines = ["  ".join(col.rjust(w) for col, w in zip(columns, widths))]
+    for r in cells:
+        lines.append("  ".join(c.rjust(w) for c, w in zip(r, widths)))
+    return "\n".join(lines)
+
+
+def write_csv(rows, path):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+# 실행
+if __name__ == "__main__":
+    rows = sweep({
+        "freezer_band": [1.0, 2.0, 3.0],
+        "damper_band": [0.5, 1.0],
+        "freezer_cooling": [0.08, 0.15],
+    }, hours=6)
+    print(format_table(rows))
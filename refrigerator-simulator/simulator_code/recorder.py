@@ -0,0 +1,222 @@
+"""열(column) 단위 시계열 기록기
+
+그래프용 deque(maxlen=100) 는 최근 100개만 남는다. 긴 실행을 나중에 분석하려면
+모든 틱을 남겨야 하는데, 파이썬 float 리스트 / pickle 은 느리고 크다.
+
+ColumnarRecorder 는 채널마다 미리 할당한 타입 배열(array) 청크에 한 틱씩 채우고,
+청크가 차면 채널별 파일(<채널>.bin, 리틀 엔디언 raw) 뒤에 이어 붙인다.
+meta.json 에 채널 이름 / dtype / 행 수를 적어두므로
+load() 는 np.memmap 으로 파일을 그대로 매핑한다 (복사 없음).
+
+    recording/
+        meta.json
+        tick.bin  time.bin  fridge_temp.bin  ...
+
+pyarrow 가 설치되어 있으면 Recording.to_arrow() / to_parquet() 로 내보낼 수 있다.
+
+사용 예:
+    recorder = ColumnarRecorder("run1")
+    engine.recorder = recorder
+    engine.run_for(7 * 24 * 3600)
+    recorder.close()
+
+    rec = load("run1")
+    rec["fridge_temp"].mean()
+"""
+import json
+import os
+import sys
+from array import array
+
+import numpy as np
+
+FORMAT_NAME = "fridge-columnar"
+FORMAT_VERSION = 1
+CHUNK_ROWS = 65536
+
+# (채널 이름, array 타입 코드) — 엔진 속성 이름과 같음 (time 만 engine.elapsed)
+CHANNELS = (
+    ("tick", "q"),
+    ("time", "d"),
+    ("fridge_temp", "d"),
+    ("freezer_temp", "d"),
+    ("fridge_target", "d"),
+    ("freezer_target", "d"),
+    ("compressor_on", "B"),
+    ("damper_open", "B"),
+    ("fridge_sensor_ok", "B"),
+    ("freezer_sensor_ok", "B"),
+    ("arduino_connected", "B"),
+    ("fridge_sensor_fail_timer", "i"),
+    ("freezer_sensor_fail_timer", "i"),
+    ("arduino_fail_timer", "i"),
+)
+
+# array 타입 코드 → 파일에 적는 NumPy dtype (리틀 엔디언 고정)
+DTYPES = {"q": "<i8", "d": "<f8", "B": "u1", "i": "<i4"}
+
+
+class ColumnarRecorder:
+    """틱마다 엔진 상태 한 행을 채널별 타입 배열에 기록
+
+    path 가 None 이면 메모리에만 (완성된 청크를 리스트로 보관),
+    path 를 주면 청크가 찰 때마다 디스크로 내보내고 메모리는 청크 하나만 쓴다.
+    """
+
+    def __init__(self, path=None, chunk_rows=CHUNK_ROWS, tick_seconds=None, start=None):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.tick_seconds = tick_seconds
+        self.start = start
+        self.rows = 0               # 지금까지 기록한 전체 행 수
+        self._row = 0               # 현재 청크 안의 위치
+        self._chunks = []           # 메모리 모드: 완성된 청크 [{채널: array}]
+        self._chunk = self._new_chunk()
+        self.closed = False
+
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+            # 새 기록이므로 기존 채널 파일 비우기
+            for name, _ in CHANNELS:
+                open(self._column_path(name), "wb").close()
+            self._write_meta()
+
+    def _new_chunk(self):
+        chunk = {}
+        for name, code in CHANNELS:
+            item = array(code).itemsize
+            chunk[name] = array(code, bytes(item * self.chunk_rows))
+        return chunk
+
+    def _column_path(self, name):
+        return os.path.join(self.path, f"{name}.bin")
+
+    # === 기록 ===
+    def record(self, engine):
+        """엔진의 현재 상태를 한 행으로 기록"""
+        i = self._row
+        c = self._chunk
+        c["tick"][i] = engine.clock.ticks
+        c["time"][i] = engine.clock.elapsed
+        c["fridge_temp"][i] = engine.fridge_temp
+        c["freezer_temp"][i] = engine.freezer_temp
+        c["fridge_target"][i] = engine.fridge_target
+        c["freezer_target"][i] = engine.freezer_target
+        c["compressor_on"][i] = engine.compressor_on
+        c["damper_open"][i] = engine.damper_open
+        c["fridge_sensor_ok"][i] = engine.fridge_sensor_ok
+        c["freezer_sensor_ok"][i] = engine.freezer_sensor_ok
+        c["arduino_connected"][i] = engine.arduino_connected
+        c["fridge_sensor_fail_timer"][i] = engine.fridge_sensor_fail_timer
+        c["freezer_sensor_fail_timer"][i] = engine.freezer_sensor_fail_timer
+        c["arduino_fail_timer"][i] = engine.arduino_fail_timer
+
+        self._row = i + 1
+        self.rows += 1
+        if self._row == self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        """현재 청크를 내보내기 (파일 모드: 채널 파일 뒤에 붙임, 메모리 모드: 청크 보관)"""
+        n = self._row
+        if n == 0:
+            return
+        self._row = 0
+        if self.path is None:
+            self._chunks.append({name: column[:n] for name, column in self._chunk.items()})
+            self._chunk = self._new_chunk()
+            return
+
+        # 채널 파일 뒤에 붙인 다음 meta.json 의 행 수를 늘림 (청크 배열은 재사용)
+        for name, column in self._chunk.items():
+            data = column[:n]
+            if sys.byteorder != "little":
+                data.byteswap()
+            with open(self._column_path(name), "ab") as f:
+                data.tofile(f)
+        self._write_meta()
+
+    def close(self):
+        """남은 행까지 내보내기"""
+        if not self.closed:
+            self.flush()
+            self.closed = True
+
+    def _write_meta(self):
+        meta = {
+            "format": FORMAT_NAME,
+            "version": FORMAT_VERSION,
+            "rows": self.rows - self._row,      # 파일에 실제로 들어간 행 수
+            "chunk_rows": self.chunk_rows,
+            "tick_seconds": self.tick_seconds,
+            "start": self.start.isoformat() if self.start is not None else None,
+            "columns": [{"name": name, "dtype": DTYPES[code]} for name, code in CHANNELS],
+        }
+        # 임시 파일에 쓰고 교체 → 읽는 쪽이 반쯤 쓴 meta.json 을 보지 않음
+        tmp = os.path.join(self.path, "meta.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(meta, f, indent=1)
+        os.replace(tmp, os.path.join(self.path, "meta.json"))
+
+    # === 메모리 모드 읽기 ===
+    def column(self, name):
+        """채널 하나를 NumPy 배열로 (메모리 모드, 현재 청크 포함)"""
+        if self.path is not None:
+            return load(self.path)[name]
+        code = dict(CHANNELS)[name]
+        parts = [np.frombuffer(chunk[name], dtype=DTYPES[code]) for chunk in self._chunks]
+        parts.append(np.frombuffer(self._chunk[name], dtype=DTYPES[code])[:self._row])
+        return np.concatenate(parts)
+
+    def columns(self):
+        return {name: self.column(name) for name, _ in CHANNELS}
+
+
+class Recording:
+    """디스크에 저장된 기록 (채널마다 np.memmap, 복사 없음)"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as f:
+            self.meta = json.load(f)
+        if self.meta.get("format") != FORMAT_NAME:
+            raise ValueError(f"not a {FORMAT_NAME} recording: {path}")
+        self.rows = self.meta["rows"]
+        self.tick_seconds = self.meta["tick_seconds"]
+        self._columns = {}
+        for column in self.meta["columns"]:
+            name, dtype = column["name"], np.dtype(column["dtype"])
+            if self.rows == 0:
+                self._columns[name] = np.empty(0, dtype)
+            else:
+                self._columns[name] = np.memmap(os.path.join(path, f"{name}.bin"),
+                                                dtype=dtype, mode="r", shape=(self.rows,))
+
+    @property
+    def names(self):
+        return list(self._columns)
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, name):
+        return self._columns[name]
+
+    def to_arrow(self):
+        """pyarrow.Table 로 (숫자 채널은 복사 없이 감쌈, pyarrow 필요)"""
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("to_arrow() 는 pyarrow 가 필요합니다: pip install pyarrow")
+        return pa.table({name: pa.array(column) for name, column in self._columns.items()})
+
+    def to_parquet(self, path):
+        """Parquet 파일로 내보내기 (pyarrow 필요)"""
+        table = self.to_arrow()
+        import pyarrow.parquet as pq
+        pq.write_table(table, path)
+
+
+def load(path):
+    """ColumnarRecorder 로 저장한 디렉터리 열기"""
+    return Recording(path)
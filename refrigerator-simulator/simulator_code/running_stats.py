@@ -0,0 +1,193 @@
+"""스트리밍 통계 (샘플당 O(1) 시간 / 메모리)
+
+온도 리스트를 계속 쌓아두고 매번 sum / max / min 을 다시 도는 대신
+샘플이 들어올 때마다 누적값만 갱신한다.
+- 평균 / 분산: Welford 알고리즘
+- 최고 / 최저
+- 백분위수: P² 알고리즘 (마커 5개로 근사, 선택 시 고정 크기 윈도우 단위)
+"""
+import math
+from collections import namedtuple
+
+# 불변 통계 스냅샷 (percentiles: 생성 시 지정한 분위수 순서대로)
+StatsSnapshot = namedtuple("StatsSnapshot", ["count", "mean", "std", "min", "max", "percentiles"])
+
+
+class P2Quantile:
+    """P² 알고리즘으로 q 분위수를 근사하는 스케치 (Jain & Chlamtac, 1985)"""
+
+    def __init__(self, q):
+        self.q = q
+        self.count = 0
+        self._heights = []                       # 마커 높이 (처음 5개는 샘플 그대로)
+        self._positions = [1, 2, 3, 4, 5]        # 마커 위치
+        # 원하는 마커 위치 = 1 + (count - 1) * 비율
+        self._fractions = (0, q / 2, q, (1 + q) / 2, 1)
+
+    def add(self, x):
+        self.count += 1
+        heights = self._heights
+
+        # 처음 5개는 정렬해서 보관
+        if self.count <= 5:
+            heights.append(x)
+            heights.sort()
+            return
+
+        # 1. x 가 들어갈 칸 찾기 (양 끝 마커는 최소 / 최대 갱신)
+        #    + 그 칸보다 위에 있는 마커 위치 한 칸씩 밀기
+        positions = self._positions
+        if x < heights[0]:
+            heights[0] = x
+            k = 1
+        elif x >= heights[4]:
+            heights[4] = x
+            k = 4
+        else:
+            k = 1
+            while x >= heights[k]:
+                k += 1
+        for i in range(k, 5):
+            positions[i] += 1
+
+        # 2. 가운데 마커 3개 높이 보정
+        scale = self.count - 1
+        fractions = self._fractions
+        for i in (1, 2, 3):
+            d = 1 + scale * fractions[i] - positions[i]
+            if (d >= 1 and positions[i + 1] - positions[i] > 1) or \
+               (d <= -1 and positions[i - 1] - positions[i] < -1):
+                d = 1 if d > 0 else -1
+                h = self._parabolic(i, d)
+                if not heights[i - 1] < h < heights[i + 1]:
+                    h = self._linear(i, d)
+                heights[i] = h
+                positions[i] += d
+
+    def _parabolic(self, i, d):
+        n, h = self._positions, self._heights
+        return h[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (h[i] - h[i - 1]) / (n[i] - n[i - 1]))
+
+    def _linear(self, i, d):
+        n, h = self._positions, self._heights
+        return h[i] + d * (h[i + d] - h[i]) / (n[i + d] - n[i])
+
+    @property
+    def value(self):
+        """현재 분위수 추정값 (샘플이 없으면 nan)"""
+        if self.count == 0:
+            return math.nan
+        if self.count <= 5:
+            # 샘플이 적으면 정렬된 값에서 바로 계산
+            index = min(int(self.q * self.count), self.count - 1)
+            return self._heights[index]
+        return self._heights[2]
+
+
+class RunningStats:
+    """평균 / 분산 / 최고 / 최저 / 백분위수 누적 통계
+
+    window 를 주면 백분위수는 window 개 샘플 단위(고정 윈도우)로 다시 계산되고,
+    가장 최근에 끝난 윈도우의 값을 보여준다 (첫 윈도우가 끝나기 전엔 진행 중인 값).
+    평균 / 분산 / 최고 / 최저는 항상 전체 샘플 기준.
+    """
+
+    def __init__(self, percentiles=(0.5, 0.95), window=None):
+        self.percentiles = tuple(percentiles)
+        self.window = window
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.last = math.nan
+        self._sketches = [P2Quantile(q) for q in self.percentiles]
+        self._window_values = None
+
+    def add(self, x):
+        # Welford
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+        self.last = x
+        self._add_to_sketches(x)
+
+    def add_path(self, n, start, end, noise_std=0.0):
+        """start 에서 end 로 n 틱 동안 이어진 구간을 샘플 n 개로 한 번에 합치기
+
+        샘플을 하나씩 만들지 않고, 직선 + 가우시안 노이즈(브라운 다리) 경로의
+        평균 / 분산을 식으로 구해 병합한다 (Chan 병합 공식).
+        최고 / 최저는 양 끝점 기준, 백분위수 스케치에는 끝점만 들어간다.
+        """
+        if n <= 0:
+            return
+        delta = end - start
+        block_mean = start + delta * (n + 1) / (2 * n)
+        block_m2 = (delta * delta * (n * n - 1) / (12 * n)
+                    + noise_std * noise_std * (n * n - 1) / 6)
+
+        total = self.count + n
+        diff = block_mean - self.mean
+        self.mean += diff * n / total
+        self._m2 += block_m2 + diff * diff * self.count * n / total
+        self.count = total
+
+        self.min = min(self.min, start, end)
+        self.max = max(self.max, start, end)
+        self.last = end
+        self._add_to_sketches(end)
+
+    def _add_to_sketches(self, x):
+        for sketch in self._sketches:
+            sketch.add(x)
+
+        # 윈도우가 끝나면 값을 저장하고 스케치를 새로 시작
+        if self.window is not None and self._sketches and \
+           self._sketches[0].count >= self.window:
+            self._window_values = [s.value for s in self._sketches]
+            self._sketches = [P2Quantile(q) for q in self.percentiles]
+
+    @property
+    def variance(self):
+        """표본 분산 (샘플 2개 미만이면 0)"""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    def percentile(self, q):
+        """q 분위수 추정값 (생성 시 percentiles 에 넣은 q 만 가능)"""
+        i = self.percentiles.index(q)
+        if self._window_values is not None:
+            return self._window_values[i]
+        return self._sketches[i].value
+
+    def snapshot(self):
+        """현재 통계를 불변 튜플로 (다른 스레드에 넘길 때)"""
+        return StatsSnapshot(self.count, self.mean, self.std, self.min, self.max,
+                             tuple(self.percentile(q) for q in self.percentiles))
+
+    def summary(self):
+        """현재 통계를 dict 로"""
+        result = {
+            "count": self.count,
+            "mean": self.mean,
+            "std": self.std,
+            "min": self.min,
+            "max": self.max,
+        }
+        for q in self.percentiles:
+            result[f"p{q * 100:g}"] = self.percentile(q)
+        return result
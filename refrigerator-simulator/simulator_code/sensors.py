@@ -0,0 +1,156 @@
+"""센서 모델 (물리 → 센서 → 제어 로직)
+
+제어 로직이 실제 온도 대신 Arduino 가 읽은 값을 보도록 중간에 끼우는 층.
+틱마다:
+1. 1차 지연 (센서 프로브의 열 용량): filtered += (실제 - filtered) * (1 - exp(-dt/tau))
+표본 주기(sample_period)마다:
+2. NTC 서미스터 + 분압 저항 → 10비트 ADC 카운트 (+ 카운트 단위 가우시안 노이즈, 반올림)
+3. 펌웨어처럼 카운트 → 온도 표(LUT)로 다시 변환 (양자화 오차가 그대로 남음)
+표본 사이에는 마지막 값을 유지한다.
+
+고장 모드 (칸별, set_fault):
+- STUCK: 마지막 카운트에서 멈춤 (값은 정상처럼 보임 → 제어기가 모름)
+- OPEN: 단선 → ADC 최대값, SHORT: 단락 → ADC 0 (둘 다 범위 밖이라 감지 가능)
+
+같은 코드가 스칼라(FridgeEngine, n=None)와 (N,) 배열(FleetEngine, n=N) 모두에서 동작한다.
+매 틱 하는 일은 곱셈/덧셈 한 번이고 변환은 표본 때만 하므로 대량 배치에서도 켜둘 수 있다.
+
+사용 예:
+    engine = FridgeEngine(seed=1, sensors=SensorModel(seed=1))
+    fleet = FleetEngine(10_000, seed=1, sensors=SensorModel(n=10_000, seed=1))
+"""
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+# 고장 모드
+OK = 0
+STUCK = 1
+OPEN = 2
+SHORT = 3
+
+KELVIN = 273.15
+
+
+@dataclass(frozen=True)
+class SensorParams:
+    """센서 / ADC 상수 (기본값: 10k NTC B3950 + 10k 분압, Arduino 10비트 ADC)"""
+    adc_bits: int = 10
+    r0: float = 10_000.0            # 서미스터 25°C 저항 (Ω)
+    t0: float = 25.0                # 기준 온도 (°C)
+    beta: float = 3950.0            # B 상수 (K)
+    series: float = 10_000.0        # 분압 저항 (Ω), 서미스터는 GND 쪽
+    tau: float = 2.0                # 프로브 1차 지연 시정수 (초, 0 이면 지연 없음)
+    sample_period: float = 1.0      # 표본 주기 (초)
+    noise_lsb: float = 0.5          # ADC 노이즈 표준편차 (카운트)
+
+
+class SensorChannel:
+    """센서 하나 (스칼라 또는 (N,) 배열 상태)"""
+
+    def __init__(self, params, initial, n=None):
+        self.params = params
+        self.max_count = (1 << params.adc_bits) - 1
+        self.filtered = float(initial) if n is None else np.full(n, float(initial))
+        self.fault = OK if n is None else np.zeros(n, dtype=np.int8)
+        self.counts = self.to_counts(self.filtered)
+        self.reading = self.table()[self.counts]
+
+    def to_counts(self, temp, noise=0.0):
+        """온도 → ADC 카운트 (분압비 * 최대값, 반올림)"""
+        p = self.params
+        resistance = p.r0 * np.exp(p.beta * (1.0 / (temp + KELVIN) - 1.0 / (p.t0 + KELVIN)))
+        ratio = resistance / (resistance + p.series)
+        return np.clip(np.rint(ratio * self.max_count + noise), 0, self.max_count).astype(np.int64)
+
+    _tables = {}
+
+    def table(self):
+        """카운트 → 온도 표 (펌웨어 변환, 양 끝은 NaN = 단락 / 단선), 파라미터별로 캐시"""
+        table = SensorChannel._tables.get(self.params)
+        if table is None:
+            p = self.params
+            counts = np.arange(self.max_count + 1, dtype=float)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ratio = counts / self.max_count
+                resistance = p.series * ratio / (1.0 - ratio)
+                table = 1.0 / (1.0 / (p.t0 + KELVIN) + np.log(resistance / p.r0) / p.beta) - KELVIN
+            table[0] = table[-1] = np.nan
+            SensorChannel._tables[self.params] = table
+        return table
+
+    def lag(self, temp, alpha):
+        self.filtered = self.filtered + (temp - self.filtered) * alpha
+
+    def sample(self, noise):
+        counts = self.to_counts(self.filtered, noise)
+        fault = self.fault
+        counts = np.where(fault == STUCK, self.counts, counts)
+        counts = np.where(fault == OPEN, self.max_count, counts)
+        counts = np.where(fault == SHORT, 0, counts)
+        self.counts = counts
+        self.reading = self.table()[counts]
+
+    @property
+    def valid(self):
+        """ADC 값이 범위 안 (단선 / 단락 아님)"""
+        return (self.counts > 0) & (self.counts < self.max_count)
+
+
+class SensorModel:
+    """냉장실 / 냉동실 센서 한 쌍 (FridgeEngine / FleetEngine 의 sensors 로 사용)"""
+
+    def __init__(self, params=None, n=None, seed=None, fridge=7.0, freezer=-10.0):
+        self.params = params if params is not None else SensorParams()
+        self.n = n
+        self.rng = np.random.default_rng(seed)
+        self.fridge = SensorChannel(self.params, fridge, n)
+        self.freezer = SensorChannel(self.params, freezer, n)
+        self.since_sample = 0.0
+        self.samples = 0
+        self._alpha = {}
+
+    def alpha(self, dt):
+        """1차 지연 계수 (dt 별로 캐시)"""
+        alpha = self._alpha.get(dt)
+        if alpha is None:
+            tau = self.params.tau
+            alpha = 1.0 if tau <= 0 else 1.0 - math.exp(-dt / tau)
+            self._alpha[dt] = alpha
+        return alpha
+
+    def update(self, fridge_temp, freezer_temp, dt):
+        """실제 온도로 한 틱 진행, 표본 주기가 되면 새로 읽음 (새로 읽었으면 True)"""
+        alpha = self.alpha(dt)
+        self.fridge.lag(fridge_temp, alpha)
+        self.freezer.lag(freezer_temp, alpha)
+
+        self.since_sample += dt
+        if self.since_sample < self.params.sample_period - 1e-9:
+            return False
+        self.since_sample = 0.0 if dt >= self.params.sample_period else \
+            self.since_sample - self.params.sample_period
+        sigma = self.params.noise_lsb
+        shape = None if self.n is None else self.n
+        self.fridge.sample(self.rng.standard_normal(shape) * sigma if sigma else 0.0)
+        self.freezer.sample(self.rng.standard_normal(shape) * sigma if sigma else 0.0)
+        self.samples += 1
+        return True
+
+    def set_fault(self, compartment, mode, units=None):
+        """compartment ("fridge" / "freezer") 센서를 mode 로 (units: FleetEngine 유닛 인덱스 / 마스크)"""
+        channel = self.fridge if compartment == "fridge" else self.freezer
+        if self.n is None:
+            channel.fault = mode
+        elif units is None:
+            channel.fault[:] = mode
+        else:
+            channel.fault[units] = mode
+
+    def resolution(self, temp):
+        """temp 근처 ADC 1카운트에 해당하는 온도 (°C) - 양자화 정도 확인용"""
+        channel = self.fridge
+        counts = int(channel.to_counts(temp))
+        table = channel.table()
+        return abs(float(table[counts + 1] - table[counts]))
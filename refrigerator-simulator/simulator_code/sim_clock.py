@@ -0,0 +1,75 @@
+"""시뮬레이션 시계
+
+벽시계(time.time, datetime.now) 대신 틱 수로 시간을 센다.
+- SimClock: 엔진이 한 틱 진행할 때마다 0.1초씩 증가하는 시계
+- Pacer: GUI 에서 시뮬레이션 속도(1x, 10x, 1000x, 최대)를 맞춰주는 장치
+"""
+import time
+from datetime import datetime, timedelta
+
+TICK_SECONDS = 0.1      # 한 틱 = 0.1초
+
+# GUI 에서 고를 수 있는 속도 (None = 최대 속도, sleep 없음)
+SPEED_CHOICES = {
+    "1x": 1.0,
+    "10x": 10.0,
+    "100x": 100.0,
+    "1000x": 1000.0,
+    "최대": None,
+}
+
+
+class SimClock:
+    """틱 수로 세는 시뮬레이션 시계"""
+
+    def __init__(self, tick_seconds=TICK_SECONDS, start=None):
+        self.tick_seconds = tick_seconds
+        self.ticks = 0
+        # 로그 타임스탬프의 기준 시각 (시뮬레이션 0초)
+        self.start_datetime = start if start is not None else datetime.now()
+
+    def advance(self, ticks=1):
+        self.ticks += ticks
+
+    @property
+    def elapsed(self):
+        """시뮬레이션 경과 시간 (초)"""
+        return self.ticks * self.tick_seconds
+
+    def now(self):
+        """시뮬레이션 시각 (datetime)"""
+        return self.start_datetime + timedelta(seconds=self.elapsed)
+
+    def seconds_to_ticks(self, seconds):
+        return int(round(seconds / self.tick_seconds))
+
+
+class Pacer:
+    """시뮬레이션 시간을 벽시계에 맞춰 늦춰주는 장치
+
+    speed 배속으로 진행되도록 필요한 만큼만 sleep 한다.
+    speed 가 None 이면 sleep 하지 않는다 (CPU 가 허락하는 만큼 빠르게).
+    """
+
+    MIN_SLEEP = 0.001   # 이보다 짧은 대기는 모아서 한 번에 잔다
+
+    def __init__(self, speed=1.0, sim_elapsed=0.0):
+        self.set_speed(speed, sim_elapsed)
+
+    def set_speed(self, speed, sim_elapsed):
+        # 다른 스레드에서 읽으므로 튜플 하나로 통째로 바꾼다
+        self._anchor = (time.monotonic(), sim_elapsed, speed)
+
+    @property
+    def speed(self):
+        return self._anchor[2]
+
+    def wait(self, sim_elapsed):
+        """sim_elapsed 초가 벽시계 기준으로 도달할 때까지 대기"""
+        wall_anchor, sim_anchor, speed = self._anchor
+        if speed is None:
+            return
+        target = wall_anchor + (sim_elapsed - sim_anchor) / speed
+        delay = target - time.monotonic()
+        if delay > self.MIN_SLEEP:
+            time.sleep(delay)
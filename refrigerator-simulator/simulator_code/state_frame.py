@@ -0,0 +1,52 @@
+"""물리 스레드 → GUI 스레드 상태 전달 (락 없음)
+
+물리 스레드는 매 틱이 끝날 때 불변(immutable) StateFrame 을 만들어 FrameBuffer 에 올리고,
+GUI 스레드는 가장 최근 프레임 하나만 읽는다.
+프레임은 만들어진 뒤 절대 바뀌지 않으므로, 참조 하나를 바꿔 끼우는 것만으로
+(파이썬에서 원자적) 두 스레드가 락 없이 일관된 스냅샷을 주고받는다.
+
+로그도 프레임에 실어 보낸다 (event_tail): GUI 가 엔진의 EventLog 를 직접 읽지 않는다.
+event_tail 은 새 이벤트가 생긴 틱에만 다시 만들고, 나머지 틱은 같은 튜플을 그대로 쓴다.
+
+GUI → 엔진 방향(슬라이더, 장애 버튼)은 FridgeEngine.post() 명령 큐로 보내고
+물리 스레드가 다음 틱 시작 때 실행한다.
+"""
+from collections import namedtuple
+
+EVENT_TAIL = 100    # 프레임에 싣는 최근 이벤트 수 (GUI 로그 창 크기)
+
+StateFrame = namedtuple("StateFrame", [
+    "tick", "elapsed",
+    # 온도 / 희망 온도
+    "fridge_temp", "freezer_temp", "fridge_target", "freezer_target",
+    # 액추에이터
+    "compressor_on", "damper_open",
+    # 센서 / 통신 상태 + 장애 타이머 (틱)
+    "fridge_sensor_ok", "freezer_sensor_ok", "arduino_connected",
+    "fridge_sensor_fail_timer", "freezer_sensor_fail_timer", "arduino_fail_timer",
+    # 통계 (StatsSnapshot)
+    "fridge_stats", "freezer_stats",
+    # 이 틱까지 기록된 이벤트 수 (EventLog.total) + 최근 EVENT_TAIL 개 이벤트 (Event 튜플)
+    "event_total", "event_tail",
+    # 에너지 / 압축기 마모 (EnergySnapshot)
+    "energy",
+])
+
+
+class FrameBuffer:
+    """가장 최근 StateFrame 하나만 들고 있는 버퍼
+
+    publish / latest 모두 참조 대입 / 읽기 한 번이라 락이 필요 없다.
+    GUI 가 느리면 중간 프레임은 그냥 건너뛴다 (항상 최신 상태만 본다).
+    """
+
+    def __init__(self, frame=None):
+        self._latest = frame
+        self.published = 0
+
+    def publish(self, frame):
+        self._latest = frame
+        self.published += 1
+
+    def latest(self):
+        return self._latest
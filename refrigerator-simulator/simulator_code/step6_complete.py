@@ -1,17 +1,27 @@
 import tkinter as tk
 from tkinter import ttk
-import random
-import time
-from datetime import datetime
+from datetime import timedelta
+import os
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
-from collections import deque
 import threading
+import math
+import time
+import argparse
 
 import platform
 import matplotlib.font_manager as fm
 
+import event_log as ev
+from fridge_engine import FridgeEngine, FAIL_SECONDS, HISTORY_LEN
+from sim_clock import Pacer, SPEED_CHOICES, TICK_SECONDS
+from state_frame import FrameBuffer
+from trace_file import TraceWriter, TraceReader
+from trace_replay import TracePlayer
+from lod_pyramid import MinMaxPyramid
+from telemetry import TelemetryPublisher, MqttClient
+
 # OS별 한글 폰트 설정
 system = platform.system()
 if system == 'Windows':
@@ -24,44 +34,73 @@ else:  # Linux
 # 마이너스 기호 깨짐 방지
 plt.rcParams['axes.unicode_minus'] = False
 
+# 그래프에 보여주는 시간 폭 (초, 기본값)
+GRAPH_SPAN = HISTORY_LEN * TICK_SECONDS
+
+# 그래프 탭에서 고를 수 있는 시간 폭 (초)
+GRAPH_SPANS = {
+    "10초": GRAPH_SPAN,
+    "1분": 60,
+    "10분": 600,
+    "1시간": 3600,
+    "6시간": 6 * 3600,
+    "1일": 24 * 3600,
+    "7일": 7 * 24 * 3600,
+}
+
+# 로그 탭에 남기는 최대 줄 수
+LOG_DISPLAY_MAX = 100
+
+# 실행할 때마다 트레이스 파일을 남기는 폴더
+TRACE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "traces")
+
+# 트레이스 재생 배속 (최대 속도 없음)
+REPLAY_SPEEDS = {name: speed for name, speed in SPEED_CHOICES.items() if speed is not None}
+
 class RefrigeratorSimulator:
-    def __init__(self, root):
+    def __init__(self, root, replay_path=None, mqtt=None):
         self.root = root
         self.root.title("🧊 냉장고 시뮬레이터 - Step 6 (완전체)")
         self.root.geometry("900x750")
         
-        # 물리 상태 변수
-        self.fridge_temp = 7.0  # 초기 온도 (높게 시작)
-        self.freezer_temp = -10.0
-        self.fridge_target = 3.0  # 희망 온도
-        self.freezer_target = -18.0
-        
-        # 액추에이터 상태
-        self.compressor_on = False
-        self.damper_open = False
-        
-        # 센서 상태
-        self.fridge_sensor_ok = True
-        self.freezer_sensor_ok = True
-        self.arduino_connected = True
-        
-        # 장애 시뮬레이션
-        self.fridge_sensor_fail_timer = 0
-        self.freezer_sensor_fail_timer = 0
-        self.arduino_fail_timer = 0
-        
-        # 데이터 기록 (그래프용)
-        self.time_data = deque(maxlen=100)
-        self.fridge_data = deque(maxlen=100)
-        self.freezer_data = deque(maxlen=100)
-        self.start_time = time.time()
-        
-        # 로그 기록
-        self.logs = []
+        if replay_path is None:
+            # 시뮬레이션 엔진 (상태 + 물리 + 제어)
+            self.engine = FridgeEngine()
+            self.engine.log_event(ev.SYSTEM_START)
+            self.replay = None
+            self.tick_seconds = self.engine.clock.tick_seconds
+            
+            # 트레이스 파일 (틱마다 한 레코드, 창을 닫거나 프로세스가 죽어도 남음)
+            os.makedirs(TRACE_DIR, exist_ok=True)
+            trace_name = f"trace_{self.engine.clock.start_datetime:%Y%m%d_%H%M%S}.trace"
+            self.trace = TraceWriter(os.path.join(TRACE_DIR, trace_name),
+                                     tick_seconds=self.engine.clock.tick_seconds,
+                                     start=self.engine.clock.start_datetime)
+            self.engine.recorder = self.trace
+            self.trace_reader = TraceReader(self.trace.path)  # 그래프용 (쓰는 중인 파일 읽기)
+            
+            # 텔레메트리 (MQTT 브로커 "host:port" 를 주면 상태 / 이벤트 발행, 물리 스레드는 큐에 넣기만)
+            self.telemetry = None
+            if mqtt:
+                host, _, port = mqtt.partition(":")
+                self.telemetry = TelemetryPublisher(MqttClient(host, int(port or 1883)),
+                                                    prefix="fridge/step6")
+                self.engine.telemetry = self.telemetry
+                self.telemetry.start()
+            
+            # 물리 스레드 → GUI 상태 전달 (GUI 는 최신 프레임만 읽음)
+            self.frames = FrameBuffer(self.engine.snapshot())
+        else:
+            # 재생 모드: 물리 엔진 없이 기록된 트레이스에서 프레임을 만듦
+            self.engine = None
+            self.replay = TracePlayer(TraceReader(replay_path))
+            self.trace_reader = self.replay.reader
+            self.tick_seconds = self.replay.reader.tick_seconds
+            self.frames = FrameBuffer(self.replay.frame())
+            self.root.title(f"🧊 냉장고 시뮬레이터 - 재생: {os.path.basename(replay_path)}")
         
-        # 통계 - NEW!
-        self.fridge_temps = []
-        self.freezer_temps = []
+        # 시뮬레이션 속도 (벽시계 대비 배속)
+        self.pacer = Pacer(speed=1.0)
         
         # GUI 생성
         self.create_tabs()
@@ -71,16 +110,17 @@ class RefrigeratorSimulator:
         
         # 물리 엔진 시작 (별도 스레드) - NEW!
         self.running = True
-        self.update_thread = threading.Thread(target=self.physics_loop, daemon=True)
-        self.update_thread.start()
+        if self.replay is None:
+            self.update_thread = threading.Thread(target=self.physics_loop, daemon=True)
+            self.update_thread.start()
+        else:
+            self.replay_wall = time.monotonic()  # 재생: 마지막으로 진행시킨 벽시계 시각
         
         # GUI 업데이트
         self.update_gui()
         
         # 종료 처리
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
-        
-        self.add_log("시스템 시작")
     
     def create_tabs(self):
         """탭 구조 생성"""
@@ -97,6 +137,8 @@ class RefrigeratorSimulator:
     
     def create_main_tab(self):
         """메인 탭 GUI"""
+        initial = self.frames.latest()
+        
         # === 냉장실 섹션 ===
         fridge_frame = ttk.LabelFrame(self.main_frame, text="냉장실", padding=10)
         fridge_frame.pack(fill='x', padx=10, pady=5)
@@ -122,10 +164,10 @@ class RefrigeratorSimulator:
         ttk.Label(target_frame, text="희망 온도:").pack(side='left')
         self.fridge_target_slider = ttk.Scale(target_frame, from_=0, to=10, orient='horizontal',
                                                command=self.update_fridge_target)
-        self.fridge_target_slider.set(self.fridge_target)
+        self.fridge_target_slider.set(initial.fridge_target)
         self.fridge_target_slider.pack(side='left', fill='x', expand=True, padx=5)
         
-        self.fridge_target_label = ttk.Label(target_frame, text=f"{self.fridge_target}°C", width=8)
+        self.fridge_target_label = ttk.Label(target_frame, text=f"{initial.fridge_target}°C", width=8)
         self.fridge_target_label.pack(side='left')
         
         # === 냉동실 섹션 ===
@@ -153,10 +195,10 @@ class RefrigeratorSimulator:
         ttk.Label(target_frame2, text="희망 온도:").pack(side='left')
         self.freezer_target_slider = ttk.Scale(target_frame2, from_=-25, to=-10, orient='horizontal',
                                                 command=self.update_freezer_target)
-        self.freezer_target_slider.set(self.freezer_target)
+        self.freezer_target_slider.set(initial.freezer_target)
         self.freezer_target_slider.pack(side='left', fill='x', expand=True, padx=5)
         
-        self.freezer_target_label = ttk.Label(target_frame2, text=f"{self.freezer_target}°C", width=8)
+        self.freezer_target_label = ttk.Label(target_frame2, text=f"{initial.freezer_target}°C", width=8)
         self.freezer_target_label.pack(side='left')
         
         # === 액추에이터 상태 ===
@@ -191,6 +233,29 @@ class RefrigeratorSimulator:
                                            command=self.simulate_arduino_fail)
         self.arduino_fail_btn.pack(side='left', padx=5)
         
+        # === 시뮬레이션 속도 ===
+        speed_frame = ttk.LabelFrame(self.main_frame, text="시뮬레이션 속도", padding=10)
+        speed_frame.pack(fill='x', padx=10, pady=5)
+        
+        ttk.Label(speed_frame, text="배속:").pack(side='left')
+        speeds = SPEED_CHOICES if self.replay is None else REPLAY_SPEEDS
+        self.speed_combo = ttk.Combobox(speed_frame, values=list(speeds),
+                                        state='readonly', width=8)
+        self.speed_combo.set("1x")
+        self.speed_combo.bind("<<ComboboxSelected>>", self.update_speed)
+        self.speed_combo.pack(side='left', padx=5)
+        
+        self.sim_time_label = ttk.Label(speed_frame, text="시뮬레이션 시간: 0초", font=('Arial', 11))
+        self.sim_time_label.pack(side='right')
+        
+        # === 트레이스 재생 (재생 모드만) ===
+        if self.replay is not None:
+            self.create_replay_controls()
+            # 기록을 보는 중이므로 희망 온도 / 장애 버튼은 잠금
+            for widget in (self.fridge_target_slider, self.freezer_target_slider,
+                           self.fridge_fail_btn, self.freezer_fail_btn, self.arduino_fail_btn):
+                widget.state(['disabled'])
+        
         # === 경고 메시지 ===
         warning_frame = ttk.Frame(self.main_frame)
         warning_frame.pack(fill='x', padx=10, pady=5)
@@ -208,20 +273,85 @@ class RefrigeratorSimulator:
         )
         info_label.pack(pady=5)
     
+    def create_replay_controls(self):
+        """재생 / 일시정지 + 탐색 슬라이더"""
+        replay_frame = ttk.LabelFrame(self.main_frame, text="트레이스 재생", padding=10)
+        replay_frame.pack(fill='x', padx=10, pady=5)
+        
+        self.play_btn = ttk.Button(replay_frame, text="▶ 재생", width=10, command=self.toggle_replay)
+        self.play_btn.pack(side='left', padx=5)
+        
+        # 슬라이더를 끄는 동안에는 재생 위치로 덮어쓰지 않고, 놓을 때 그 위치로 이동
+        self.seek_var = tk.DoubleVar(value=0.0)
+        self.seek_scale = ttk.Scale(replay_frame, from_=0, to=max(self.replay.duration, 1.0),
+                                    orient='horizontal', variable=self.seek_var)
+        self.seek_scale.pack(side='left', fill='x', expand=True, padx=5)
+        self.seek_scale.bind('<ButtonPress-1>', self.on_seek_press)
+        self.seek_scale.bind('<ButtonRelease-1>', self.on_seek_release)
+        self.seeking = False
+        
+        self.replay_time_label = ttk.Label(replay_frame, text="0:00:00 / 0:00:00", width=20)
+        self.replay_time_label.pack(side='left')
+    
     def create_graph_tab(self):
-        """실시간 그래프 탭"""
+        """실시간 그래프 탭
+        
+        선(Line2D)은 한 번만 만들고 set_data 로 갱신한다.
+        축 / 격자 / 범례는 배경으로 캐시해두고 선만 다시 그린다 (블리팅).
+        x축은 현재 시각 기준 상대 시간(-표시 구간 ~ 0)이라 축이 움직이지 않는다.
+        
+        데이터는 트레이스 파일에서 읽어 최소/최대 피라미드에 쌓고,
+        표시 구간이 길면 거친 레벨을 써서 그리는 점 수를 픽셀 폭 정도로 유지한다.
+        """
+        # 표시 구간 선택
+        span_frame = ttk.Frame(self.graph_frame)
+        span_frame.pack(fill='x', padx=10, pady=(5, 0))
+        
+        ttk.Label(span_frame, text="표시 구간:").pack(side='left')
+        self.span_combo = ttk.Combobox(span_frame, values=list(GRAPH_SPANS),
+                                       state='readonly', width=8)
+        self.span_combo.set("10초")
+        self.span_combo.bind("<<ComboboxSelected>>", self.update_graph_span)
+        self.span_combo.pack(side='left', padx=5)
+        
+        # 냉장실 / 냉동실 최소/최대 피라미드 + 트레이스에서 읽어 넣은 레코드 수
+        self.graph_pyramid = MinMaxPyramid(channels=2)
+        self.graph_fed = -1  # -1: 다시 쌓아야 함
+        self.graph_span = GRAPH_SPAN
+        self.graph_unit = 1.0
+        
         # Matplotlib Figure
         self.fig = Figure(figsize=(8, 6), dpi=100)
         self.ax = self.fig.add_subplot(111)
         
-        self.ax.set_xlabel('시간 (초)')
+        self.ax.set_xlabel('시간 (초, 0 = 현재)')  # update_graph_span 에서 단위 변경
         self.ax.set_ylabel('온도 (°C)')
         self.ax.set_title('실시간 온도 변화')
         self.ax.grid(True, alpha=0.3)
-        self.ax.legend(['냉장실', '냉동실'])
+        
+        # 축 범위 고정 (온도는 물리 엔진에서 -30 ~ 15°C 로 제한됨)
+        self.ax.set_xlim(-GRAPH_SPAN, 0)
+        self.ax.set_ylim(-32, 17)
+        
+        # 온도 선 + 희망 온도 선 (animated: 배경에는 그리지 않음)
+        self.fridge_line, = self.ax.plot([], [], 'b-', label='냉장실', linewidth=2, animated=True)
+        self.freezer_line, = self.ax.plot([], [], 'r-', label='냉동실', linewidth=2, animated=True)
+        initial = self.frames.latest()
+        self.fridge_target_line = self.ax.axhline(y=initial.fridge_target, color='b', linestyle='--',
+                                                  alpha=0.5, label='냉장실 목표', animated=True)
+        self.freezer_target_line = self.ax.axhline(y=initial.freezer_target, color='r', linestyle='--',
+                                                   alpha=0.5, label='냉동실 목표', animated=True)
+        self.graph_artists = [self.fridge_line, self.freezer_line,
+                              self.fridge_target_line, self.freezer_target_line]
+        self.ax.legend(loc='upper right')
+        
+        # 블리팅 상태
+        self.graph_background = None
+        self.graph_tick = -1  # 마지막으로 그린 틱
         
         # Canvas
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.graph_frame)
+        self.canvas.mpl_connect('draw_event', self.on_graph_draw)
         self.canvas.draw()
         self.canvas.get_tk_widget().pack(fill='both', expand=True)
     
@@ -231,8 +361,9 @@ class RefrigeratorSimulator:
         stats_frame = ttk.LabelFrame(self.log_frame, text="통계", padding=10)
         stats_frame.pack(fill='both', padx=10, pady=5)
         
-        self.stats_text = tk.Text(stats_frame, height=18, width=70)
+        self.stats_text = tk.Text(stats_frame, height=26, width=70)
         self.stats_text.pack()
+        self.stats_tick = -1  # 마지막으로 표시한 틱
         
         # 로그 섹션
         log_frame = ttk.LabelFrame(self.log_frame, text="이벤트 로그", padding=10)
@@ -245,165 +376,100 @@ class RefrigeratorSimulator:
         self.log_text = tk.Text(log_frame, height=15, width=70, yscrollcommand=scrollbar.set)
         self.log_text.pack(side='left', fill='both', expand=True)
         scrollbar.config(command=self.log_text.yview)
+        
+        # 이미 화면에 넣은 로그 위치 / 화면의 줄 수
+        self.log_cursor = 0
+        self.log_line_count = 0
     
-    # === 슬라이더 콜백 ===
+    # === 슬라이더 콜백 (엔진 변경은 물리 스레드에 맡김) ===
     def update_fridge_target(self, value):
-        self.fridge_target = round(float(value), 1)
-        self.fridge_target_label.config(text=f"{self.fridge_target}°C")
-        self.add_log(f"냉장실 희망 온도 변경: {self.fridge_target}°C")
+        if self.replay is not None:
+            return
+        self.engine.post(self.engine.set_fridge_target, value)
+        self.fridge_target_label.config(text=f"{round(float(value), 1)}°C")
     
     def update_freezer_target(self, value):
-        self.freezer_target = round(float(value), 1)
-        self.freezer_target_label.config(text=f"{self.freezer_target}°C")
-        self.add_log(f"냉동실 희망 온도 변경: {self.freezer_target}°C")
+        if self.replay is not None:
+            return
+        self.engine.post(self.engine.set_freezer_target, value)
+        self.freezer_target_label.config(text=f"{round(float(value), 1)}°C")
+    
+    def update_speed(self, event=None):
+        if self.replay is not None:
+            self.replay.speed = REPLAY_SPEEDS[self.speed_combo.get()]
+            return
+        speed = SPEED_CHOICES[self.speed_combo.get()]
+        self.pacer.set_speed(speed, self.frames.latest().elapsed)
+        self.engine.post(self.engine.log_event, ev.SPEED_CHANGED, ev.NONE,
+                         speed if speed is not None else math.nan)
+    
+    # === 트레이스 재생 ===
+    def toggle_replay(self):
+        if self.replay.playing:
+            self.replay.pause()
+        else:
+            # 끝에서 누르면 처음부터
+            if self.replay.index >= len(self.replay) - 1:
+                self.seek_replay(0.0)
+            self.replay.play()
+    
+    def on_seek_press(self, event):
+        self.seeking = True
+    
+    def on_seek_release(self, event):
+        self.seeking = False
+        self.seek_replay(self.seek_var.get())
+    
+    def seek_replay(self, seconds):
+        """재생 위치 이동 (로그 / 그래프 / 통계는 새 위치 기준으로 다시 그림)"""
+        self.replay.seek(seconds)
+        self.log_text.delete('1.0', tk.END)
+        self.log_cursor = 0
+        self.log_line_count = 0
+        self.graph_tick = -1
+        self.stats_tick = -1
+        self.frames.publish(self.replay.frame())
+    
+    def update_replay(self):
+        """벽시계가 흐른 만큼 재생을 진행시키고 프레임 발행"""
+        now = time.monotonic()
+        self.frames.publish(self.replay.advance(now - self.replay_wall))
+        self.replay_wall = now
+        
+        duration = self.replay.duration
+        if not self.seeking:
+            self.seek_scale.configure(to=max(duration, 1.0))
+            self.seek_var.set(self.replay.elapsed)
+        self.play_btn.config(text="⏸ 일시정지" if self.replay.playing else "▶ 재생")
+        self.replay_time_label.config(
+            text=f"{timedelta(seconds=int(self.replay.elapsed))} / {timedelta(seconds=int(duration))}")
     
     # === 장애 시뮬레이션 ===
     def simulate_fridge_sensor_fail(self):
-        if self.fridge_sensor_fail_timer == 0:
-            self.fridge_sensor_fail_timer = 50  # 5초 (0.1초 * 50)
-            self.fridge_sensor_ok = False
-            self.emergency_stop()
-            self.add_log("🚨 냉장실 센서 고장 발생!")
-            self.fridge_fail_btn.config(text="복구 중... 5초")
+        if self.frames.latest().fridge_sensor_fail_timer == 0:
+            self.engine.post(self.engine.fail_fridge_sensor)
+            self.fridge_fail_btn.config(text=f"복구 중... {int(FAIL_SECONDS)}초")
     
     def simulate_freezer_sensor_fail(self):
-        if self.freezer_sensor_fail_timer == 0:
-            self.freezer_sensor_fail_timer = 50
-            self.freezer_sensor_ok = False
-            self.emergency_stop()
-            self.add_log("🚨 냉동실 센서 고장 발생!")
-            self.freezer_fail_btn.config(text="복구 중... 5초")
+        if self.frames.latest().freezer_sensor_fail_timer == 0:
+            self.engine.post(self.engine.fail_freezer_sensor)
+            self.freezer_fail_btn.config(text=f"복구 중... {int(FAIL_SECONDS)}초")
     
     def simulate_arduino_fail(self):
-        if self.arduino_fail_timer == 0:
-            self.arduino_fail_timer = 50
-            self.arduino_connected = False
-            self.emergency_stop()
-            self.add_log("🚨 제어기(Arduino) 통신 두절!")
-            self.arduino_fail_btn.config(text="재연결 중... 5초")
-    
-    def emergency_stop(self):
-        """긴급 정지"""
-        self.compressor_on = False
-        self.damper_open = False
-        self.add_log("⚠️ 긴급 정지 실행")
+        if self.frames.latest().arduino_fail_timer == 0:
+            self.engine.post(self.engine.fail_arduino)
+            self.arduino_fail_btn.config(text=f"재연결 중... {int(FAIL_SECONDS)}초")
     
-    # === 물리 엔진 (별도 스레드) - NEW! ===
+    # === 물리 엔진 (별도 스레드) ===
     def physics_loop(self):
         """물리 시뮬레이션 루프 (별도 스레드에서 실행)"""
         while self.running:
-            # 장애 타이머 감소
-            if self.fridge_sensor_fail_timer > 0:
-                self.fridge_sensor_fail_timer -= 1
-                if self.fridge_sensor_fail_timer == 0:
-                    self.fridge_sensor_ok = True
-                    self.add_log("✅ 냉장실 센서 복구 완료")
+            # 배속에 맞춰 대기 (최대 속도면 대기 없음)
+            self.pacer.wait(self.engine.elapsed)
+            self.engine.step()
             
-            if self.freezer_sensor_fail_timer > 0:
-                self.freezer_sensor_fail_timer -= 1
-                if self.freezer_sensor_fail_timer == 0:
-                    self.freezer_sensor_ok = True
-                    self.add_log("✅ 냉동실 센서 복구 완료")
-            
-            if self.arduino_fail_timer > 0:
-                self.arduino_fail_timer -= 1
-                if self.arduino_fail_timer == 0:
-                    self.arduino_connected = True
-                    self.add_log("✅ 제어기(Arduino) 재연결 완료")
-            
-            # 센서가 정상이고, Arduino 연결된 경우만 제어 로직 실행
-            if self.fridge_sensor_ok and self.freezer_sensor_ok and self.arduino_connected:
-                self.control_logic()
-            
-            # 물리 시뮬레이션
-            self.update_physics()
-            
-            # 데이터 기록
-            elapsed = time.time() - self.start_time
-            self.time_data.append(elapsed)
-            self.fridge_data.append(self.fridge_temp)
-            self.freezer_data.append(self.freezer_temp)
-            
-            # 통계용 데이터
-            self.fridge_temps.append(self.fridge_temp)
-            self.freezer_temps.append(self.freezer_temp)
-            
-            time.sleep(0.1)  # 0.1초마다 업데이트
-    
-    def control_logic(self):
-        """제어 로직 - 실제 냉장고 방식"""
-        # === 1. 압축기 제어 ===
-        prev_compressor = self.compressor_on
-        
-        # 압축기 ON 조건
-        if self.freezer_temp > self.freezer_target + 2:
-            # 냉동실이 더우면 무조건 ON
-            self.compressor_on = True
-        elif self.fridge_temp > self.fridge_target + 3:
-            # 냉장실이 너무 더우면 강제 ON (안전장치)
-            self.compressor_on = True
-        # 압축기 OFF 조건
-        elif self.freezer_temp < self.freezer_target - 2 and \
-             self.fridge_temp < self.fridge_target - 1:
-            # 둘 다 충분히 차가우면 OFF
-            self.compressor_on = False
-        # 그 외: 현재 상태 유지 (Hysteresis)
-        
-        # 상태 변경 시 로그
-        if prev_compressor != self.compressor_on:
-            if self.compressor_on:
-                self.add_log("압축기 ON")
-            else:
-                self.add_log("압축기 OFF")
-        
-        # === 2. 댐퍼 제어 ===
-        prev_damper = self.damper_open
-        
-        if self.compressor_on:
-            # 압축기가 돌 때만 댐퍼 제어
-            if self.fridge_temp > self.fridge_target + 1:
-                self.damper_open = True
-            elif self.fridge_temp < self.fridge_target - 1:
-                self.damper_open = False
-        else:
-            # 압축기 안 돌면 댐퍼 닫음
-            self.damper_open = False
-        
-        # 상태 변경 시 로그
-        if prev_damper != self.damper_open:
-            if self.damper_open:
-                self.add_log("댐퍼 열림")
-            else:
-                if self.compressor_on:
-                    self.add_log("댐퍼 닫힘")
-                else:
-                    self.add_log("댐퍼 닫힘 (압축기 정지)")
-    
-    def update_physics(self):
-        """물리 시뮬레이션 - 실제 냉장고 물리"""
-        # 자연 상승 (외부 열 유입)
-        self.fridge_temp += 0.02
-        self.freezer_temp += 0.01
-        
-        # 압축기 작동
-        if self.compressor_on:
-            self.freezer_temp -= 0.15  # 냉동실 냉각
-            
-            if self.damper_open:
-                # 댐퍼 열림: 냉동실 찬 공기가 냉장실로 이동
-                self.fridge_temp -= 0.08   # 냉장실 냉각
-                self.freezer_temp += 0.05  # 냉동실 온도 상승 (찬 공기 손실!)
-            else:
-                # 댐퍼 닫혀도 약간 영향
-                self.fridge_temp -= 0.01
-        
-        # 가우시안 노이즈 (센서 노이즈)
-        self.fridge_temp += random.gauss(0, 0.05)
-        self.freezer_temp += random.gauss(0, 0.05)
-        
-        # 온도 범위 제한
-        self.fridge_temp = max(-5, min(15, self.fridge_temp))
-        self.freezer_temp = max(-30, min(-5, self.freezer_temp))
+            # 틱이 끝난 상태를 불변 프레임으로 발행
+            self.frames.publish(self.engine.snapshot())
     
     # === GUI 업데이트 (메인 스레드) ===
     def update_gui(self):
@@ -411,45 +477,52 @@ class RefrigeratorSimulator:
         if not self.running:
             return
         
+        # 재생 모드: 물리 스레드 대신 트레이스에서 프레임을 만듦
+        if self.replay is not None:
+            self.update_replay()
+        
+        # 물리 스레드가 마지막으로 발행한 프레임 하나만 사용
+        frame = self.frames.latest()
+        
         # 온도 표시
-        self.fridge_temp_label.config(text=f"온도: {self.fridge_temp:.1f}°C")
-        self.freezer_temp_label.config(text=f"온도: {self.freezer_temp:.1f}°C")
+        self.fridge_temp_label.config(text=f"온도: {frame.fridge_temp:.1f}°C")
+        self.freezer_temp_label.config(text=f"온도: {frame.freezer_temp:.1f}°C")
         
         # 프로그레스바 (0-15°C 범위)
-        fridge_progress_val = max(0, min(15, self.fridge_temp))
-        freezer_progress_val = max(0, min(15, self.freezer_temp + 25))  # -25~-10 → 0~15
+        fridge_progress_val = max(0, min(15, frame.fridge_temp))
+        freezer_progress_val = max(0, min(15, frame.freezer_temp + 25))  # -25~-10 → 0~15
         self.fridge_progress['value'] = fridge_progress_val
         self.freezer_progress['value'] = freezer_progress_val
         
         # 상태 표시
-        if self.fridge_sensor_ok:
+        if frame.fridge_sensor_ok:
             self.fridge_status_label.config(text="✅ 정상", foreground='green')
         else:
             self.fridge_status_label.config(text="❌ 센서 고장", foreground='red')
         
-        if self.freezer_sensor_ok:
+        if frame.freezer_sensor_ok:
             self.freezer_status_label.config(text="✅ 정상", foreground='green')
         else:
             self.freezer_status_label.config(text="❌ 센서 고장", foreground='red')
         
         # 액추에이터 상태
-        if self.compressor_on:
+        if frame.compressor_on:
             self.compressor_label.config(text="압축기: 🔴 작동 중", foreground='red')
         else:
             self.compressor_label.config(text="압축기: ⚫ 꺼짐", foreground='gray')
         
-        if self.damper_open:
+        if frame.damper_open:
             self.damper_label.config(text="댐퍼: 🔵 열림", foreground='blue')
         else:
             self.damper_label.config(text="댐퍼: ⚫ 닫힘", foreground='gray')
         
         # 경고 메시지
         warnings = []
-        if not self.fridge_sensor_ok:
+        if not frame.fridge_sensor_ok:
             warnings.append("냉장실 센서 고장")
-        if not self.freezer_sensor_ok:
+        if not frame.freezer_sensor_ok:
             warnings.append("냉동실 센서 고장")
-        if not self.arduino_connected:
+        if not frame.arduino_connected:
             warnings.append("제어기 통신 두절")
         
         if warnings:
@@ -457,102 +530,216 @@ class RefrigeratorSimulator:
         else:
             self.warning_label.config(text="🚨 경고: (없음)", foreground='green')
         
+        # 재생 모드: 기록된 희망 온도 표시
+        if self.replay is not None:
+            self.fridge_target_label.config(text=f"{frame.fridge_target}°C")
+            self.freezer_target_label.config(text=f"{frame.freezer_target}°C")
+        
+        # 시뮬레이션 시간
+        sim_time = timedelta(seconds=int(frame.elapsed))
+        self.sim_time_label.config(text=f"시뮬레이션 시간: {sim_time}")
+        
         # 장애 버튼 텍스트
-        if self.fridge_sensor_fail_timer > 0:
-            sec = self.fridge_sensor_fail_timer // 10
+        if frame.fridge_sensor_fail_timer > 0:
+            sec = int(frame.fridge_sensor_fail_timer * self.tick_seconds)
             self.fridge_fail_btn.config(text=f"복구 중... {sec}초")
         else:
             self.fridge_fail_btn.config(text="냉장실 센서 고장")
         
-        if self.freezer_sensor_fail_timer > 0:
-            sec = self.freezer_sensor_fail_timer // 10
+        if frame.freezer_sensor_fail_timer > 0:
+            sec = int(frame.freezer_sensor_fail_timer * self.tick_seconds)
             self.freezer_fail_btn.config(text=f"복구 중... {sec}초")
         else:
             self.freezer_fail_btn.config(text="냉동실 센서 고장")
         
-        if self.arduino_fail_timer > 0:
-            sec = self.arduino_fail_timer // 10
+        if frame.arduino_fail_timer > 0:
+            sec = int(frame.arduino_fail_timer * self.tick_seconds)
             self.arduino_fail_btn.config(text=f"재연결 중... {sec}초")
         else:
             self.arduino_fail_btn.config(text="제어기(Arduino) 고장")
         
         # 그래프 업데이트
-        self.update_graph()
+        self.update_graph(frame)
         
         # 통계 업데이트
-        self.update_statistics()
+        self.update_statistics(frame)
         
         # 로그 업데이트
-        self.update_log_display()
+        self.update_log_display(frame)
         
         # 다음 업데이트 예약
         self.root.after(100, self.update_gui)
     
-    def update_graph(self):
-        """실시간 그래프 업데이트"""
-        if len(self.time_data) > 0:
-            self.ax.clear()
-            self.ax.plot(self.time_data, self.fridge_data, 'b-', label='냉장실', linewidth=2)
-            self.ax.plot(self.time_data, self.freezer_data, 'r-', label='냉동실', linewidth=2)
-            
-            # 희망 온도 선
-            self.ax.axhline(y=self.fridge_target, color='b', linestyle='--', alpha=0.5, label='냉장실 목표')
-            self.ax.axhline(y=self.freezer_target, color='r', linestyle='--', alpha=0.5, label='냉동실 목표')
-            
-            self.ax.set_xlabel('시간 (초)')
-            self.ax.set_ylabel('온도 (°C)')
-            self.ax.set_title('실시간 온도 변화')
-            self.ax.grid(True, alpha=0.3)
-            self.ax.legend(loc='upper right')
-            
-            self.canvas.draw()
+    def on_graph_draw(self, event):
+        """전체 다시 그리기(처음, 창 크기 변경 등) 후 배경 캐시"""
+        self.graph_background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self.draw_graph_artists()
+    
+    def draw_graph_artists(self):
+        for artist in self.graph_artists:
+            self.ax.draw_artist(artist)
+    
+    def update_graph_span(self, event=None):
+        """표시 구간 변경 → 축 단위 / 범위를 바꾸고 피라미드를 다시 쌓음"""
+        self.graph_span = GRAPH_SPANS[self.span_combo.get()]
+        if self.graph_span < 120:
+            unit_name, self.graph_unit = "초", 1.0
+        elif self.graph_span < 2 * 3600:
+            unit_name, self.graph_unit = "분", 60.0
+        else:
+            unit_name, self.graph_unit = "시간", 3600.0
+        
+        self.ax.set_xlabel(f'시간 ({unit_name}, 0 = 현재)')
+        self.ax.set_xlim(-self.graph_span / self.graph_unit, 0)
+        self.graph_fed = -1
+        self.graph_tick = -1
+        self.canvas.draw()  # 배경 다시 캐시 (on_graph_draw)
     
-    def update_statistics(self):
-        """통계 업데이트 - NEW!"""
-        if len(self.fridge_temps) > 0:
+    def feed_graph_pyramid(self):
+        """트레이스에서 아직 안 넣은 레코드를 피라미드에 추가"""
+        reader = self.trace_reader
+        if self.replay is None:
+            end = reader.refresh()
+        else:
+            end = min(self.replay.index + 1, reader.refresh())
+        
+        # 처음 / 뒤로 이동 / 표시 구간보다 많이 건너뜀 → 표시 구간만 다시 쌓기
+        span_records = int(self.graph_span / self.tick_seconds) + 1
+        if self.graph_fed < 0 or end < self.graph_fed or end - self.graph_fed > span_records:
+            self.graph_pyramid.reset()
+            self.graph_fed = max(0, end - span_records)
+        
+        if end > self.graph_fed:
+            records = reader.records[self.graph_fed:end]
+            self.graph_pyramid.add_many(records["time"],
+                                        (records["fridge_temp"], records["freezer_temp"]))
+            self.graph_fed = end
+    
+    def update_graph(self, frame):
+        """실시간 그래프 업데이트 (새 데이터가 있을 때만, 블리팅)"""
+        if self.graph_background is None:
+            return
+        
+        # 그래프 탭이 안 보이면 그리지 않음
+        if self.notebook.select() != str(self.graph_frame):
+            return
+        
+        # 새 샘플이 없으면 그대로
+        if frame.tick == self.graph_tick:
+            return
+        self.graph_tick = frame.tick
+        
+        self.feed_graph_pyramid()
+        if len(self.graph_pyramid) == 0:
+            return
+        
+        # 픽셀 폭 정도의 버킷만 그림 (최소/최대 세로 막대)
+        now = frame.elapsed
+        width = max(200, self.canvas.get_tk_widget().winfo_width())
+        times, (fridge, freezer) = self.graph_pyramid.envelope(now - self.graph_span, now, width)
+        xs = (times - now) / self.graph_unit
+        self.fridge_line.set_data(xs, fridge)
+        self.freezer_line.set_data(xs, freezer)
+        
+        # 희망 온도 선
+        self.fridge_target_line.set_ydata([frame.fridge_target] * 2)
+        self.freezer_target_line.set_ydata([frame.freezer_target] * 2)
+        
+        # 캐시된 배경 위에 선만 다시 그림
+        self.canvas.restore_region(self.graph_background)
+        self.draw_graph_artists()
+        self.canvas.blit(self.fig.bbox)
+    
+    def update_statistics(self, frame):
+        """통계 업데이트 (새 틱이 있을 때만)"""
+        if frame.tick == self.stats_tick:
+            return
+        self.stats_tick = frame.tick
+        
+        fridge = frame.fridge_stats
+        freezer = frame.freezer_stats
+        energy = frame.energy
+        if fridge.count > 0:
             stats = f"""
 === 냉장실 통계 ===
-현재 온도: {self.fridge_temp:.2f}°C
-평균 온도: {sum(self.fridge_temps) / len(self.fridge_temps):.2f}°C
-최고 온도: {max(self.fridge_temps):.2f}°C
-최저 온도: {min(self.fridge_temps):.2f}°C
+현재 온도: {frame.fridge_temp:.2f}°C
+평균 온도: {fridge.mean:.2f}°C (표준편차 {fridge.std:.2f})
+최고 온도: {fridge.max:.2f}°C
+최저 온도: {fridge.min:.2f}°C
+중앙값 / 95%: {fridge.percentiles[0]:.2f}°C / {fridge.percentiles[1]:.2f}°C
 
 === 냉동실 통계 ===
-현재 온도: {self.freezer_temp:.2f}°C
-평균 온도: {sum(self.freezer_temps) / len(self.freezer_temps):.2f}°C
-최고 온도: {max(self.freezer_temps):.2f}°C
-최저 온도: {min(self.freezer_temps):.2f}°C
+현재 온도: {frame.freezer_temp:.2f}°C
+평균 온도: {freezer.mean:.2f}°C (표준편차 {freezer.std:.2f})
+최고 온도: {freezer.max:.2f}°C
+최저 온도: {freezer.min:.2f}°C
+중앙값 / 95%: {freezer.percentiles[0]:.2f}°C / {freezer.percentiles[1]:.2f}°C
+
+=== 에너지 / 압축기 마모 ===
+소비 전력량: {energy.kwh * 1000:.2f} Wh
+압축기 가동: {energy.run_seconds:.0f}초 ({energy.run_seconds / max(energy.elapsed, 1e-9) * 100:.1f}%)
+기동 횟수: {energy.starts}회 (짧은 사이클 {energy.short_cycles}회)
+댐퍼 동작: {energy.damper_moves}회
 
 === 시스템 ===
-가동 시간: {int(time.time() - self.start_time)}초
-총 이벤트: {len(self.logs)}개
+가동 시간: {int(frame.elapsed)}초
+총 이벤트: {frame.event_total}개
 """
             self.stats_text.delete('1.0', tk.END)
             self.stats_text.insert('1.0', stats)
     
-    def update_log_display(self):
-        """로그 디스플레이 업데이트"""
-        # 최근 로그만 표시 (최대 100개)
-        display_logs = self.logs[-100:]
-        log_text = "\n".join(display_logs)
+    def update_log_display(self, frame):
+        """로그 디스플레이 업데이트 (새 로그만 뒤에 추가)"""
+        end = frame.event_total
+        if end == self.log_cursor:
+            return  # 새 로그 없음
+        
+        # 이벤트는 프레임에 실려 온 것만 사용 (물리 스레드가 쓰는 EventLog 는 읽지 않음)
+        # 한 번에 많이 쌓였으면 화면에 남을 만큼만 넣음 (문자열은 여기서 생성)
+        # format 은 고정된 시작 시각만 읽는다
+        log = self.engine.events if self.replay is None else self.replay.events
+        start = max(self.log_cursor, end - LOG_DISPLAY_MAX)
+        new_lines = [log.format(event) for event in frame.event_tail if event.seq >= start]
+        self.log_cursor = end
+        
+        text = "\n".join(new_lines)
+        if self.log_line_count > 0:
+            text = "\n" + text
+        self.log_text.insert(tk.END, text)
+        self.log_line_count += len(new_lines)
+        
+        # 최대 줄 수를 넘으면 위에서부터 삭제
+        overflow = self.log_line_count - LOG_DISPLAY_MAX
+        if overflow > 0:
+            self.log_text.delete('1.0', f'{overflow + 1}.0')
+            self.log_line_count -= overflow
         
-        self.log_text.delete('1.0', tk.END)
-        self.log_text.insert('1.0', log_text)
         self.log_text.see(tk.END)  # 자동 스크롤
     
-    def add_log(self, message):
-        """로그 추가"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] {message}"
-        self.logs.append(log_entry)
-    
     def on_closing(self):
         """종료 처리"""
         self.running = False
+        if self.replay is None:
+            # 물리 스레드가 끝날 때까지 기다린 뒤 트레이스 닫기
+            # (타임아웃 없음: 스레드가 살아있는 채로 닫으면 닫힌 mmap 에 레코드를 씀)
+            self.update_thread.join()
+            self.trace.close()
+            # 실행별 에너지 / 마모 집계 (트레이스 옆에 JSON)
+            self.engine.energy.export(os.path.splitext(self.trace.path)[0] + ".energy.json")
+            if self.telemetry is not None:
+                self.telemetry.stop()
+                self.telemetry.client.close()   # MQTT 네트워크 스레드 종료 + 연결 끊기
         self.root.destroy()
 
 # 실행
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="냉장고 시뮬레이터")
+    parser.add_argument("--replay", metavar="TRACE",
+                        help="기록된 트레이스 파일 재생 (물리 엔진 없이)")
+    parser.add_argument("--mqtt", metavar="HOST[:PORT]",
+                        help="MQTT 브로커로 텔레메트리 발행 (paho-mqtt 필요)")
+    args = parser.parse_args()
+    
     root = tk.Tk()
-    app = RefrigeratorSimulator(root)
+    app = RefrigeratorSimulator(root, replay_path=args.replay, mqtt=args.mqtt)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,378 @@
+"""MQTT 방식 텔레메트리 발행 (묶음 + 압축 + QoS + 오프라인 버퍼)
+
+물리 루프가 틱마다 상태 / 새 이벤트를 내보내고, 별도 발행 스레드가 묶어서 브로커로 보낸다.
+    engine.telemetry = TelemetryPublisher(broker.connect("fridge-1"))
+    engine.telemetry.start()
+
+물리 루프 쪽 (record, 틱마다 engine 이 호출):
+- 튜플 하나를 크기 제한 deque 에 넣기만 한다 (락 / 대기 / 직렬화 없음 → 절대 막히지 않음)
+- 큐가 차면 policy 에 따라 버림 (DROP_OLDEST: 가장 오래된 것, DROP_NEWEST: 새 것), dropped 로 셈
+
+발행 스레드 쪽 (interval 초마다, 또는 flush() 직접 호출):
+- batch_size 개씩 묶어 상태 / 이벤트 토픽별로 JSON → zlib 압축 → publish
+- 상태는 qos(기본 0: 한 번 보내고 끝), 이벤트는 event_qos(기본 1: 브로커 확인(ack)까지 재시도)
+- 브로커에 연결이 안 되면 묶음을 오프라인 버퍼(offline_limit 묶음, 넘치면 오래된 것부터 버림)에
+  쌓아두고, 다시 연결되면 순서대로 먼저 보낸다
+- 묶음마다 번호(seq)가 붙어 있어 받는 쪽이 중복(QoS 1 재전송) / 빠진 묶음을 알 수 있다
+
+카운터는 stats() 로 본다. 브로커는 같은 프로세스 안의 LocalBroker (테스트 / 데모용) 또는
+MqttClient (paho-mqtt 필요) 를 쓴다. 둘 다 connected / publish(topic, payload, qos) → bool 을 제공.
+
+사용 예:
+    broker = LocalBroker()
+    broker.subscribe("fridge/+/events", lambda topic, payload: print(decode_batch(payload)))
+    engine.telemetry = TelemetryPublisher(broker.connect("fridge-1"), prefix="fridge/1")
+    engine.telemetry.start()
+    ...
+    engine.telemetry.stop()        # 남은 것 보내고 스레드 종료
+"""
+import argparse
+import json
+import math
+import threading
+import time
+import zlib
+from collections import deque
+
+import numpy as np
+
+from async_runtime import DROP_OLDEST, DROP_NEWEST
+from fridge_engine import FridgeEngine
+
+# 상태 메시지 필드 (record 가 넣는 튜플 순서)
+STATE_FIELDS = (
+    "tick", "time", "fridge_temp", "freezer_temp", "compressor_on", "damper_open",
+    "fridge_sensor_ok", "freezer_sensor_ok", "arduino_connected",
+)
+EVENT_FIELDS = ("seq", "tick", "time", "code", "compartment", "value")
+
+_STATE = 0
+_EVENT = 1
+
+
+def decode_batch(payload):
+    """발행된 payload → dict (unit, seq, kind, fields, rows)"""
+    return json.loads(zlib.decompress(payload))
+
+
+class TelemetryPublisher:
+    """엔진 상태 / 이벤트를 묶어서 브로커로 발행 (engine.telemetry 로 사용)"""
+
+    def __init__(self, client, prefix="fridge/0", every=1, batch_size=200, interval=1.0,
+                 qos=0, event_qos=1, queue_size=10_000, policy=DROP_OLDEST,
+                 offline_limit=1000, max_retries=3, compress_level=6):
+        if policy not in (DROP_OLDEST, DROP_NEWEST):
+            raise ValueError(f"policy must be {DROP_OLDEST!r} or {DROP_NEWEST!r} (발행은 막히면 안 됨)")
+        self.client = client
+        self.prefix = prefix
+        self.every = every              # every 틱마다 상태 하나
+        self.batch_size = batch_size
+        self.interval = interval
+        self.qos = qos
+        self.event_qos = event_qos
+        self.queue_size = queue_size
+        self.policy = policy
+        self.offline_limit = offline_limit
+        self.max_retries = max_retries
+        self.compress_level = compress_level
+
+        # 물리 스레드 → 발행 스레드 (deque 의 append / popleft 는 원자적이라 락이 필요 없다)
+        self.queue = deque()
+        self._event_seq = 0
+        # 발행 스레드만 만지는 것
+        self.offline = deque()          # (topic, payload, qos, 메시지 수) 묶음
+        self.batch_seq = 0
+        self._lock = threading.Lock()   # flush() 를 여러 스레드에서 불러도 한 번에 하나
+        self._stop = threading.Event()
+        self._thread = None
+
+        # 카운터 (물리 스레드)
+        self.enqueued = 0
+        self.dropped = 0
+        # 카운터 (발행 스레드)
+        self.published = 0              # 브로커로 나간 메시지(상태 / 이벤트 하나) 수
+        self.batches = 0
+        self.retries = 0
+        self.failed = 0                 # 재시도해도 ack 를 못 받은 QoS 1 묶음
+        self.offline_dropped = 0        # 오프라인 버퍼가 넘쳐 버린 묶음
+        self.bytes_raw = 0
+        self.bytes_sent = 0
+
+    # === 물리 스레드 ===
+    def record(self, engine):
+        """틱마다 engine 이 호출 - 큐에 넣기만 함"""
+        tick = engine.clock.ticks
+        if tick % self.every == 0:
+            self._offer((_STATE, (tick, engine.elapsed, engine.fridge_temp, engine.freezer_temp,
+                                  engine.compressor_on, engine.damper_open,
+                                  engine.fridge_sensor_ok, engine.freezer_sensor_ok,
+                                  engine.arduino_connected)))
+        events = engine.events
+        if events.total != self._event_seq:
+            for event in events.since(self._event_seq):
+                self._offer((_EVENT, tuple(event)))
+            self._event_seq = events.total
+
+    def _offer(self, item):
+        queue = self.queue
+        if len(queue) >= self.queue_size:
+            self.dropped += 1
+            if self.policy == DROP_NEWEST:
+                return
+            try:
+                queue.popleft()
+            except IndexError:      # 그 사이 발행 스레드가 비움
+                pass
+        queue.append(item)
+        self.enqueued += 1
+
+    # === 발행 스레드 ===
+    def start(self):
+        """발행 스레드 시작 (interval 초마다 flush)"""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """발행 스레드 종료 (남은 메시지는 한 번 더 보냄)"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def flush(self):
+        """오프라인 버퍼 → 큐에 쌓인 것 순서로 발행 (발행 스레드 또는 직접 호출)"""
+        with self._lock:
+            self._send_offline()
+            queue = self.queue
+            while queue:
+                items = []
+                while queue and len(items) < self.batch_size:
+                    items.append(queue.popleft())
+                states = [row for kind, row in items if kind == _STATE]
+                # 값이 없는 이벤트(NaN)는 표준 JSON 에 맞게 null
+                events = [row[:-1] + (None if math.isnan(row[-1]) else row[-1],)
+                          for kind, row in items if kind == _EVENT]
+                if states:
+                    self._publish("state", STATE_FIELDS, states, self.qos)
+                if events:
+                    self._publish("events", EVENT_FIELDS, events, self.event_qos)
+
+    def _publish(self, kind, fields, rows, qos):
+        raw = json.dumps({"unit": self.prefix, "seq": self.batch_seq, "kind": kind,
+                          "fields": fields, "rows": rows}, separators=(",", ":"),
+                         allow_nan=False).encode()
+        payload = zlib.compress(raw, self.compress_level)
+        self.batch_seq += 1
+        self.bytes_raw += len(raw)
+        message = (f"{self.prefix}/{kind}", payload, qos, len(rows))
+        if self.offline or not self._send(message):
+            self._buffer(message)
+
+    def _send(self, message):
+        """묶음 하나 전송 (연결이 없으면 False → 오프라인 버퍼)"""
+        topic, payload, qos, count = message
+        if not self.client.connected:
+            return False
+        for attempt in range(1 + (self.max_retries if qos else 0)):
+            if attempt:
+                self.retries += 1
+            if self.client.publish(topic, payload, qos):
+                self.published += count
+                self.batches += 1
+                self.bytes_sent += len(payload)
+                return True
+            if not self.client.connected:
+                return False
+        self.failed += 1
+        return True     # 재시도 한도를 넘긴 (QoS 0 은 한 번 실패한) 묶음은 버림 (오프라인 버퍼를 막지 않게)
+
+    def _buffer(self, message):
+        if len(self.offline) >= self.offline_limit:
+            self.offline.popleft()
+            self.offline_dropped += 1
+        self.offline.append(message)
+
+    def _send_offline(self):
+        offline = self.offline
+        while offline and self._send(offline[0]):
+            offline.popleft()
+
+    def stats(self):
+        """카운터 dict"""
+        return {
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "queued": len(self.queue),
+            "published": self.published,
+            "batches": self.batches,
+            "retries": self.retries,
+            "failed": self.failed,
+            "offline": len(self.offline),
+            "offline_dropped": self.offline_dropped,
+            "bytes_raw": self.bytes_raw,
+            "bytes_sent": self.bytes_sent,
+        }
+
+
+# === 브로커 ===
+def topic_matches(pattern, topic):
+    """MQTT 토픽 필터 (+ 는 한 단계, # 는 나머지 전부)"""
+    levels = topic.split("/")
+    parts = pattern.split("/")
+    for i, part in enumerate(parts):
+        if part == "#":
+            return True
+        if i >= len(levels) or (part != "+" and part != levels[i]):
+            return False
+    return len(parts) == len(levels)
+
+
+class LocalBroker:
+    """같은 프로세스 안의 브로커 흉내 (테스트 / 데모용)
+
+    online = False 면 모든 클라이언트 연결 끊김, loss_rate 확률로 메시지 / ack 를 잃는다
+    (QoS 1 은 ack 를 잃으면 재전송 → 받는 쪽에서 중복이 보임).
+    """
+
+    def __init__(self, loss_rate=0.0, seed=None):
+        self.online = True
+        self.loss_rate = loss_rate
+        self.rng = np.random.default_rng(seed)
+        self.subscriptions = []     # (토픽 필터, 콜백)
+        self.lock = threading.Lock()
+        self.received = 0
+        self.lost = 0
+
+    def connect(self, client_id):
+        return LocalClient(self, client_id)
+
+    def subscribe(self, pattern, callback):
+        """callback(topic, payload) - 발행한 스레드에서 바로 호출됨"""
+        with self.lock:
+            self.subscriptions.append((pattern, callback))
+
+    def deliver(self, topic, payload, qos):
+        """메시지 하나 받기 → ack 여부"""
+        with self.lock:
+            if self.loss_rate and self.rng.random() < self.loss_rate:
+                self.lost += 1
+                return False
+            self.received += 1
+            callbacks = [cb for pattern, cb in self.subscriptions if topic_matches(pattern, topic)]
+            ack_lost = bool(qos) and self.loss_rate and self.rng.random() < self.loss_rate
+        for callback in callbacks:
+            callback(topic, payload)
+        return not ack_lost
+
+
+class LocalClient:
+    """LocalBroker 에 붙은 클라이언트"""
+
+    def __init__(self, broker, client_id):
+        self.broker = broker
+        self.client_id = client_id
+
+    @property
+    def connected(self):
+        return self.broker.online
+
+    def publish(self, topic, payload, qos=0):
+        if not self.broker.online:
+            return False
+        return self.broker.deliver(topic, payload, qos)
+
+
+class MqttClient:
+    """실제 MQTT 브로커 클라이언트 (paho-mqtt 필요)"""
+
+    def __init__(self, host="localhost", port=1883, client_id="", ack_timeout=2.0):
+        try:
+            import paho.mqtt.client as mqtt
+        except ImportError:
+            raise ImportError("MqttClient 는 paho-mqtt 가 필요합니다: pip install paho-mqtt")
+        if hasattr(mqtt, "CallbackAPIVersion"):     # paho-mqtt 2.0 부터 필수 인자
+            self.client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2, client_id=client_id)
+        else:
+            self.client = mqtt.Client(client_id=client_id)
+        self._success = mqtt.MQTT_ERR_SUCCESS
+        self.ack_timeout = ack_timeout
+        self.client.connect_async(host, port)
+        self.client.loop_start()
+
+    @property
+    def connected(self):
+        return self.client.is_connected()
+
+    def publish(self, topic, payload, qos=0):
+        """QoS 1 은 ack 를 받았는지, QoS 0 은 보내기 큐에 들어갔는지"""
+        info = self.client.publish(topic, payload, qos)
+        if info.rc != self._success:
+            return False
+        if qos:
+            info.wait_for_publish(self.ack_timeout)
+            return info.is_published()
+        return True
+
+    def close(self):
+        self.client.loop_stop()
+        self.client.disconnect()
+
+
+# 실행
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="텔레메트리 발행 데모 (같은 프로세스 브로커)")
+    parser.add_argument("--seconds", type=float, default=3600.0, help="시뮬레이션 시간 (초)")
+    parser.add_argument("--batch", type=int, default=200)
+    parser.add_argument("--queue", type=int, default=10_000)
+    parser.add_argument("--every", type=int, default=1)
+    parser.add_argument("--loss", type=float, default=0.0, help="브로커 메시지 / ack 손실 확률")
+    parser.add_argument("--outage", type=float, nargs=2, metavar=("START", "END"),
+                        help="이 구간(시뮬레이션 초) 동안 브로커 연결 끊김")
+    args = parser.parse_args()
+
+    broker = LocalBroker(loss_rate=args.loss, seed=0)
+    seen = {"state": set(), "events": set()}
+    rows = {"state": 0, "events": 0}
+
+    def on_message(topic, payload):
+        batch = decode_batch(payload)
+        if batch["seq"] not in seen[batch["kind"]]:     # QoS 1 재전송 중복 제거
+            seen[batch["kind"]].add(batch["seq"])
+            rows[batch["kind"]] += len(batch["rows"])
+
+    broker.subscribe("fridge/#", on_message)
+
+    engine = FridgeEngine(seed=1)
+    publisher = TelemetryPublisher(broker.connect("fridge-1"), prefix="fridge/1",
+                                   every=args.every, batch_size=args.batch,
+                                   interval=0.05, queue_size=args.queue)
+    engine.telemetry = publisher
+    publisher.start()
+
+    ticks = engine.clock.seconds_to_ticks(args.seconds)
+    outage = None
+    if args.outage:
+        outage = tuple(engine.clock.seconds_to_ticks(s) for s in args.outage)
+    start = time.perf_counter()
+    for tick in range(ticks):
+        if outage is not None:
+            broker.online = not (outage[0] <= tick < outage[1])
+        if tick == ticks // 2:
+            engine.fail_fridge_sensor()
+        engine.step()
+    elapsed = time.perf_counter() - start
+    broker.online = True
+    publisher.stop()
+
+    stats = publisher.stats()
+    print(f"{ticks} 틱 {elapsed:.2f}초 ({elapsed / ticks * 1e6:.1f} µs/틱, 발행 포함)")
+    for name, value in stats.items():
+        print(f"  {name}: {value}")
+    print(f"압축률: {stats['bytes_sent'] / max(stats['bytes_raw'], 1):.3f}")
+    print(f"받은 상태 {rows['state']}개 / 이벤트 {rows['events']}개 (중복 제외)")
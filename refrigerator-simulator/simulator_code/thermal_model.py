@@ -0,0 +1,167 @@
+"""물리 기반 열 모델 (RC 네트워크)
+
+기존 update_physics 는 "틱당 +0.02°C" 같은 고정 변화량이라 결과가 0.1초 틱에 묶여 있다.
+여기서는 칸마다 열용량(C) 과 벽 열전도(G) 를 두고 미분방정식으로 적분한다.
+
+    C_r dTr/dt = G_r (Ta - Tr) - G_d (Tr - Tf)
+    C_f dTf/dt = G_f (Ta - Tf) + G_d (Tr - Tf) - P     (P: 압축기 ON 일 때 냉각 능력)
+
+G_d (냉장실 ↔ 냉동실 결합) 는 압축기 / 댐퍼 상태에 따라 바뀐다.
+- 압축기 ON + 댐퍼 열림: damper_conductance (팬이 찬 공기를 냉장실로 보냄)
+- 압축기 ON + 댐퍼 닫힘: closed_damper_conductance (틈새로 새는 정도)
+- 압축기 OFF: 0
+
+적분 방법 (step 의 dt 는 초 단위, 틱 크기와 무관):
+- "euler": 명시적 오일러 (1차, dt < 약 30초에서 안정)
+- "rk4": 4차 룽게-쿠타
+- "exact": 상태가 고정된 구간은 선형 ODE 이므로 2x2 행렬 지수로 정확히 풂 (dt 에 상관없이 오차 없음)
+
+기본값은 목표 온도(냉장 3°C / 냉동 -18°C) 근처에서 기존 틱당 변화량을 재현하도록
+맞춘 값이다 (실제 냉장고보다 훨씬 빠르게 식고 데워짐).
+"""
+import math
+from dataclasses import dataclass
+
+INTEGRATORS = ("euler", "rk4", "exact")
+
+
+@dataclass(frozen=True)
+class ThermalParams:
+    """RC 열 모델 상수 (정규화된 맞춤값, 물리 단위 아님)
+
+    열량 단위 하나(U)를 기준으로 열용량 U/K, 열전도 U/(K·s), 냉각 능력 U/s.
+    결과에 의미가 있는 것은 비율뿐이다: 열전도 / 열용량 = 1/초 (시상수의 역수),
+    냉각 능력 / 열용량 = °C/초. 모든 값에 같은 배수를 곱해도 결과는 같다.
+    """
+    ambient: float = 25.0                       # 외기 온도 (°C)
+    fridge_capacity: float = 50.0               # 냉장실 열용량
+    freezer_capacity: float = 80.0              # 냉동실 열용량
+    fridge_conductance: float = 0.455           # 냉장실 벽 열전도
+    freezer_conductance: float = 0.186          # 냉동실 벽 열전도
+    compressor_power: float = 120.0             # 압축기 냉각 능력 (냉동실에서 빼는 열)
+    damper_conductance: float = 1.905           # 댐퍼 열림 (팬 작동) 시 두 칸 사이 열전도
+    closed_damper_conductance: float = 0.238    # 댐퍼 닫힘 (압축기 작동 중) 시 열전도
+
+
+class ThermalModel:
+    """냉장실 / 냉동실 2칸 RC 모델 + 선택 가능한 적분기"""
+
+    def __init__(self, params=None, method="exact"):
+        if method not in INTEGRATORS:
+            raise ValueError(f"unknown integrator: {method}")
+        self.params = params if params is not None else ThermalParams()
+        self.method = method
+        # (압축기, 댐퍼, dt) → exact 적분용 행렬 캐시
+        self._exact_cache = {}
+
+    # === 모드별 선형 시스템 dx/dt = A x + b ===
+    def coupling(self, compressor_on, damper_open):
+        """두 칸 사이 열전도 (U/(K·s), ThermalParams 참고)"""
+        p = self.params
+        if not compressor_on:
+            return 0.0
+        return p.damper_conductance if damper_open else p.closed_damper_conductance
+
+    def system(self, compressor_on, damper_open):
+        """((a11, a12, a21, a22), (b1, b2)) — x = (냉장실, 냉동실)"""
+        p = self.params
+        g = self.coupling(compressor_on, damper_open)
+        c_r, c_f = p.fridge_capacity, p.freezer_capacity
+        power = p.compressor_power if compressor_on else 0.0
+
+        a = (-(p.fridge_conductance + g) / c_r, g / c_r,
+             g / c_f, -(p.freezer_conductance + g) / c_f)
+        b = (p.fridge_conductance * p.ambient / c_r,
+             (p.freezer_conductance * p.ambient - power) / c_f)
+        return a, b
+
+    def derivative(self, fridge, freezer, compressor_on, damper_open):
+        """온도 변화율 (°C/초)"""
+        (a11, a12, a21, a22), (b1, b2) = self.system(compressor_on, damper_open)
+        return (a11 * fridge + a12 * freezer + b1,
+                a21 * fridge + a22 * freezer + b2)
+
+    def steady_state(self, compressor_on, damper_open):
+        """상태를 계속 유지했을 때 수렴하는 온도 (냉장실, 냉동실)"""
+        (a11, a12, a21, a22), (b1, b2) = self.system(compressor_on, damper_open)
+        det = a11 * a22 - a12 * a21
+        # x* = -A^-1 b
+        return ((-a22 * b1 + a12 * b2) / det,
+                (a21 * b1 - a11 * b2) / det)
+
+    # === 적분 ===
+    def step(self, fridge, freezer, compressor_on, damper_open, dt):
+        """dt 초 뒤 온도 (냉장실, 냉동실)"""
+        if self.method == "exact":
+            return self._step_exact(fridge, freezer, compressor_on, damper_open, dt)
+        if self.method == "rk4":
+            return self._step_rk4(fridge, freezer, compressor_on, damper_open, dt)
+        d_r, d_f = self.derivative(fridge, freezer, compressor_on, damper_open)
+        return fridge + d_r * dt, freezer + d_f * dt
+
+    def _step_rk4(self, fridge, freezer, compressor_on, damper_open, dt):
+        f = self.derivative
+        k1 = f(fridge, freezer, compressor_on, damper_open)
+        k2 = f(fridge + k1[0] * dt / 2, freezer + k1[1] * dt / 2, compressor_on, damper_open)
+        k3 = f(fridge + k2[0] * dt / 2, freezer + k2[1] * dt / 2, compressor_on, damper_open)
+        k4 = f(fridge + k3[0] * dt, freezer + k3[1] * dt, compressor_on, damper_open)
+        return (fridge + dt / 6 * (k1[0] + 2 * k2[0] + 2 * k3[0] + k4[0]),
+                freezer + dt / 6 * (k1[1] + 2 * k2[1] + 2 * k3[1] + k4[1]))
+
+    def _step_exact(self, fridge, freezer, compressor_on, damper_open, dt):
+        key = (compressor_on, damper_open, dt)
+        cached = self._exact_cache.get(key)
+        if cached is None:
+            a, _ = self.system(compressor_on, damper_open)
+            cached = (_expm2(a, dt), self.steady_state(compressor_on, damper_open))
+            self._exact_cache[key] = cached
+        (e11, e12, e21, e22), (s_r, s_f) = cached
+
+        # x(t + dt) = x* + e^(A dt) (x - x*)
+        d_r, d_f = fridge - s_r, freezer - s_f
+        return s_r + e11 * d_r + e12 * d_f, s_f + e21 * d_r + e22 * d_f
+
+
+def _expm2(a, t):
+    """2x2 행렬 지수 e^(A t) (A = (a11, a12, a21, a22))
+
+    e^(At) = e^(st) [ f0 I + f1 (A - sI) ],  s = tr/2, q² = s² - det
+    """
+    a11, a12, a21, a22 = a
+    s = (a11 + a22) / 2
+    q2 = s * s - (a11 * a22 - a12 * a21)
+    if q2 > 1e-18:
+        q = math.sqrt(q2)
+        f0, f1 = math.cosh(q * t), math.sinh(q * t) / q
+    elif q2 < -1e-18:
+        q = math.sqrt(-q2)
+        f0, f1 = math.cos(q * t), math.sin(q * t) / q
+    else:
+        f0, f1 = 1.0, t
+    scale = math.exp(s * t)
+    return (scale * (f0 + f1 * (a11 - s)), scale * f1 * a12,
+            scale * f1 * a21, scale * (f0 + f1 * (a22 - s)))
+
+
+# 실행: 적분기 / 시간 간격별 오차 비교
+if __name__ == "__main__":
+    # 압축기 ON/댐퍼 열림 5분 → OFF 5분 을 같은 dt 의 exact 해와 비교
+    phases = [(True, True, 300.0), (False, False, 300.0)]
+
+    def simulate(method, dt):
+        model = ThermalModel(method=method)
+        fridge, freezer = 7.0, -10.0
+        worst = 0.0
+        reference = ThermalModel(method="exact")
+        ref_r, ref_f = fridge, freezer
+        for compressor_on, damper_open, seconds in phases:
+            for _ in range(int(round(seconds / dt))):
+                fridge, freezer = model.step(fridge, freezer, compressor_on, damper_open, dt)
+                ref_r, ref_f = reference.step(ref_r, ref_f, compressor_on, damper_open, dt)
+                worst = max(worst, abs(fridge - ref_r), abs(freezer - ref_f))
+        return worst
+
+    print(f"{'적분기':>6} {'dt(초)':>7} {'최대 오차(°C)':>14}")
+    for method in INTEGRATORS:
+        for dt in (0.1, 1.0, 10.0):
+            print(f"{method:>6} {dt:7.1f} {simulate(method, dt):14.6f}")
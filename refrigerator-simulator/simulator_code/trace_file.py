@@ -0,0 +1,169 @@
+"""메모리 매핑(mmap) 트레이스 파일 (고정 크기 레코드, 크래시에도 안전)
+
+물리 루프가 틱마다 레코드 하나(72바이트)를 mmap 영역에 직접 쓴다.
+- 레코드를 다 쓴 다음에 헤더의 레코드 수(count)를 늘린다
+  → 프로세스가 중간에 죽어도 count 까지는 항상 완성된 레코드
+- 쓰기는 공유 매핑(페이지 캐시)에 바로 반영되므로 프로세스가 죽어도 남는다
+  (OS 자체가 죽는 경우 대비는 sync_every 틱마다 msync)
+- 읽는 쪽(TraceReader)은 같은 파일을 np.memmap 으로 열어 복사 없이 자르고,
+  시뮬레이션이 쓰는 중에도 refresh() 로 새 레코드를 볼 수 있다
+
+파일 구조:
+    [헤더 64바이트][레코드 0][레코드 1]...   (빈 자리는 미리 늘려둠, 차면 두 배로)
+
+사용 예:
+    engine.recorder = TraceWriter("soak.trace", start=engine.clock.start_datetime)
+    ...
+    trace = TraceReader("soak.trace")
+    trace["fridge_temp"][-600:]       # 최근 1분 (복사 없음)
+"""
+import mmap
+import os
+import struct
+from datetime import datetime
+
+import numpy as np
+
+from recorder import CHANNELS
+from sim_clock import TICK_SECONDS
+
+MAGIC = b"FRIDGETR"
+VERSION = 1
+
+# 헤더: magic, version, record_size, (예약), count, capacity, tick_seconds, 시작 시각(epoch)
+HEADER = struct.Struct("<8sHHIQQdd")
+HEADER_SIZE = 64
+COUNT = struct.Struct("<Q")
+COUNT_OFFSET = 16
+CAPACITY_OFFSET = 24
+
+# 레코드: CHANNELS 순서 그대로 (tick, time, 온도 4개, 플래그 5개, 장애 타이머 3개)
+RECORD = struct.Struct("<qdddddBBBBB3xiii4x")
+RECORD_SIZE = RECORD.size       # 72
+RECORD_DTYPE = np.dtype({
+    "names": [name for name, _ in CHANNELS],
+    "formats": ["<i8", "<f8", "<f8", "<f8", "<f8", "<f8",
+                "u1", "u1", "u1", "u1", "u1", "<i4", "<i4", "<i4"],
+    "offsets": [0, 8, 16, 24, 32, 40, 48, 49, 50, 51, 52, 56, 60, 64],
+    "itemsize": RECORD_SIZE,
+})
+
+INITIAL_CAPACITY = 1 << 16      # 처음 잡아두는 레코드 수 (약 4.7MB)
+SYNC_EVERY = 36000              # 이 틱마다 msync (0.1초 틱 기준 1시간)
+
+
+class TraceWriter:
+    """트레이스 파일에 틱마다 레코드 한 개씩 추가 (engine.recorder 로 사용)"""
+
+    def __init__(self, path, capacity=INITIAL_CAPACITY, tick_seconds=TICK_SECONDS,
+                 start=None, sync_every=SYNC_EVERY):
+        self.path = path
+        self.capacity = capacity
+        self.sync_every = sync_every
+        self.count = 0
+
+        self._file = open(path, "w+b")
+        self._file.truncate(HEADER_SIZE + capacity * RECORD_SIZE)
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+        start_time = (start if start is not None else datetime.now()).timestamp()
+        HEADER.pack_into(self._mm, 0, MAGIC, VERSION, RECORD_SIZE, 0,
+                         0, capacity, tick_seconds, start_time)
+
+    def record(self, engine):
+        """엔진의 현재 상태를 레코드 하나로 추가"""
+        if self.count == self.capacity:
+            self._grow()
+        RECORD.pack_into(
+            self._mm, HEADER_SIZE + self.count * RECORD_SIZE,
+            engine.clock.ticks, engine.clock.elapsed,
+            engine.fridge_temp, engine.freezer_temp,
+            engine.fridge_target, engine.freezer_target,
+            engine.compressor_on, engine.damper_open,
+            engine.fridge_sensor_ok, engine.freezer_sensor_ok, engine.arduino_connected,
+            engine.fridge_sensor_fail_timer, engine.freezer_sensor_fail_timer,
+            engine.arduino_fail_timer)
+
+        # 레코드를 다 쓴 뒤에 count 증가 → 읽는 쪽은 완성된 레코드만 봄
+        self.count += 1
+        COUNT.pack_into(self._mm, COUNT_OFFSET, self.count)
+
+        if self.sync_every and self.count % self.sync_every == 0:
+            self._mm.flush()
+
+    def _grow(self):
+        """파일 크기를 두 배로 (읽는 쪽은 refresh() 때 다시 매핑)"""
+        self.capacity *= 2
+        self._mm.resize(HEADER_SIZE + self.capacity * RECORD_SIZE)
+        COUNT.pack_into(self._mm, CAPACITY_OFFSET, self.capacity)
+
+    def flush(self):
+        self._mm.flush()
+
+    def close(self):
+        """남는 빈 자리를 잘라내고 닫기"""
+        if self._mm is None:
+            return
+        self.capacity = self.count
+        COUNT.pack_into(self._mm, CAPACITY_OFFSET, self.capacity)
+        self._mm.flush()
+        self._mm.close()
+        self._file.truncate(HEADER_SIZE + self.count * RECORD_SIZE)
+        self._file.close()
+        self._mm = None
+
+
+class TraceReader:
+    """트레이스 파일 읽기 (np.memmap, 쓰는 중인 파일도 가능)"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE:
+            raise ValueError(f"not a trace file: {path}")
+        magic, version, record_size, _, _, _, tick_seconds, start_time = HEADER.unpack_from(header)
+        if magic != MAGIC:
+            raise ValueError(f"not a trace file: {path}")
+        if version != VERSION or record_size != RECORD_SIZE:
+            raise ValueError(f"unsupported trace version {version} (record size {record_size})")
+        self.tick_seconds = tick_seconds
+        self.start_datetime = datetime.fromtimestamp(start_time)
+        self._header = np.memmap(path, dtype="<u8", mode="r", shape=(HEADER_SIZE // 8,))
+        self._records = None
+        self._map()
+
+    def _map(self):
+        capacity = (os.path.getsize(self.path) - HEADER_SIZE) // RECORD_SIZE
+        if capacity == 0:
+            self._records = np.empty(0, RECORD_DTYPE)
+        else:
+            self._records = np.memmap(self.path, dtype=RECORD_DTYPE, mode="r",
+                                      offset=HEADER_SIZE, shape=(capacity,))
+
+    @property
+    def count(self):
+        """지금까지 완성된 레코드 수 (쓰는 쪽이 계속 늘림)"""
+        return int(self._header[COUNT_OFFSET // 8])
+
+    def refresh(self):
+        """쓰는 쪽이 파일을 늘렸으면 다시 매핑, 현재 레코드 수를 돌려줌"""
+        count = self.count
+        if count > len(self._records):
+            self._map()
+        return min(count, len(self._records))
+
+    def __len__(self):
+        return min(self.count, len(self._records))
+
+    @property
+    def records(self):
+        """완성된 레코드 전체 (구조화 배열 뷰, 복사 없음)"""
+        return self._records[:len(self)]
+
+    def __getitem__(self, key):
+        """채널 이름이면 그 채널 뷰, 인덱스 / 슬라이스면 레코드"""
+        return self.records[key]
+
+    def seconds_to_index(self, seconds):
+        """시뮬레이션 시간 → 레코드 번호 (time 채널 이진 탐색)"""
+        return int(np.searchsorted(self.records["time"], seconds))
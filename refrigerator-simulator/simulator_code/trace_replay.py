@@ -0,0 +1,205 @@
+"""트레이스 재생 (물리 엔진 없이 기록된 실행을 다시 보기)
+
+TraceReader 로 연 트레이스에서 현재 위치 근처만 잘라 StateFrame 을 만든다.
+- 통계: 현재 위치 이전 STATS_WINDOW 개 레코드 (전체를 다시 훑지 않음)
+- 로그: 레코드 사이의 상태 변화(압축기, 댐퍼, 센서, 희망 온도)로 이벤트를 다시 만든다
+  탐색(seek) 하면 그 위치 이전 LOG_WINDOW 개 레코드에서 새로 만든다
+- 에너지: 처음부터 현재 위치까지의 압축기 / 댐퍼 채널로 집계
+  ENERGY_BLOCK 레코드마다 누적값 체크포인트를 두고 (블록마다 처음 지나갈 때 한 번만 계산),
+  탐색 때는 가장 가까운 체크포인트 + 남은 부분 블록만 더함, 재생 중에는 새 레코드만 더함
+
+위치는 time 채널 이진 탐색으로 찾으므로 파일 크기와 상관없이 바로 열리고 바로 이동한다
+(에너지 체크포인트는 아직 안 지나간 블록으로 처음 이동할 때만 그 블록들을 한 번 훑음).
+"""
+import copy
+import math
+
+import numpy as np
+
+import event_log as ev
+from energy import EnergyMeter
+from event_log import EventLog
+from running_stats import StatsSnapshot
+from state_frame import EVENT_TAIL, StateFrame
+
+STATS_WINDOW = 36000    # 통계를 계산할 레코드 수 (0.1초 틱 기준 1시간)
+LOG_WINDOW = 6000       # 탐색 후 로그를 다시 만들 레코드 수 (0.1초 틱 기준 10분)
+LOG_CAPACITY = 10_000   # 재생용 이벤트 로그 크기
+ENERGY_BLOCK = 1 << 16  # 에너지 체크포인트 간격 (레코드 수)
+
+# (채널, 0→1 이벤트, 1→0 이벤트, 칸)
+_FLAG_EVENTS = (
+    ("compressor_on", ev.COMPRESSOR_ON, ev.COMPRESSOR_OFF, ev.NONE),
+    ("fridge_sensor_ok", ev.SENSOR_RECOVERED, ev.SENSOR_FAIL, ev.FRIDGE),
+    ("freezer_sensor_ok", ev.SENSOR_RECOVERED, ev.SENSOR_FAIL, ev.FREEZER),
+    ("arduino_connected", ev.ARDUINO_RECOVERED, ev.ARDUINO_FAIL, ev.NONE),
+)
+
+
+def transitions(records):
+    """연속된 레코드 사이의 상태 변화 → [(레코드 번호, 코드, 칸, 값)] (번호는 records 기준)
+
+    records[0] 은 기준 상태로만 쓰고, 변화가 생긴 레코드 번호(1 이상)를 돌려준다.
+    """
+    result = []
+    if len(records) < 2:
+        return result
+
+    for name, rise, fall, compartment in _FLAG_EVENTS:
+        column = records[name].astype(np.int8)
+        for i in np.flatnonzero(np.diff(column)) + 1:
+            result.append((int(i), rise if column[i] else fall, compartment, math.nan))
+
+    # 댐퍼: 닫힘은 압축기 상태에 따라 두 가지
+    damper = records["damper_open"].astype(np.int8)
+    compressor = records["compressor_on"]
+    for i in np.flatnonzero(np.diff(damper)) + 1:
+        if damper[i]:
+            code = ev.DAMPER_OPEN
+        else:
+            code = ev.DAMPER_CLOSED if compressor[i] else ev.DAMPER_CLOSED_STOP
+        result.append((int(i), code, ev.NONE, math.nan))
+
+    for name, compartment in (("fridge_target", ev.FRIDGE), ("freezer_target", ev.FREEZER)):
+        column = records[name]
+        for i in np.flatnonzero(np.diff(column)) + 1:
+            result.append((int(i), ev.TARGET_CHANGED, compartment, float(column[i])))
+
+    result.sort(key=lambda item: item[0])
+    return result
+
+
+def _stats(values):
+    if len(values) == 0:
+        return StatsSnapshot(0, math.nan, 0.0, math.nan, math.nan, (math.nan, math.nan))
+    p50, p95 = np.percentile(values, (50, 95))
+    std = float(values.std(ddof=1)) if len(values) > 1 else 0.0
+    return StatsSnapshot(len(values), float(values.mean()), std,
+                         float(values.min()), float(values.max()), (float(p50), float(p95)))
+
+
+class TracePlayer:
+    """트레이스 위치 / 재생 상태를 들고 StateFrame 을 만들어 주는 재생기"""
+
+    def __init__(self, reader, speed=1.0, power=None):
+        self.reader = reader
+        self.speed = speed
+        self.power = power
+        self.playing = False
+        self.index = 0
+        self.events = None
+        self.energy = None
+        self._energy_checkpoints = [EnergyMeter(power)]   # k 번째 = 레코드 [0, k*ENERGY_BLOCK) 누적
+        self.seek_index(0)
+
+    def __len__(self):
+        return len(self.reader)
+
+    @property
+    def duration(self):
+        """기록된 마지막 레코드의 시뮬레이션 시간 (초)"""
+        n = self.reader.refresh()
+        return float(self.reader.records["time"][n - 1]) if n else 0.0
+
+    @property
+    def elapsed(self):
+        if len(self) == 0:
+            return 0.0
+        return float(self.reader.records["time"][self.index])
+
+    # === 재생 제어 ===
+    def play(self):
+        self.playing = True
+
+    def pause(self):
+        self.playing = False
+
+    def seek(self, seconds):
+        """시뮬레이션 시간 seconds 초 위치로 이동"""
+        self.seek_index(self.reader.seconds_to_index(seconds))
+
+    def seek_index(self, index):
+        n = self.reader.refresh()
+        self.index = max(0, min(index, n - 1))
+
+        # 로그는 이동한 위치 이전 LOG_WINDOW 개 레코드에서 새로 만든다
+        self.events = EventLog(LOG_CAPACITY, start=self.reader.start_datetime)
+        start = max(0, self.index - LOG_WINDOW)
+        self._add_events(start, self.index)
+
+        # 에너지: 체크포인트에서 시작해 부분 블록만 더함
+        end = self.index + 1
+        block = end // ENERGY_BLOCK
+        self._extend_checkpoints(block)
+        self.energy = copy.copy(self._energy_checkpoints[block])
+        self._add_energy(block * ENERGY_BLOCK, end)
+
+    def advance(self, wall_seconds):
+        """벽시계 wall_seconds 초만큼 재생 (멈춤 상태면 그대로), 현재 프레임을 돌려줌"""
+        n = self.reader.refresh()
+        if self.playing and n:
+            records = self.reader.records
+            target = float(records["time"][self.index]) + wall_seconds * self.speed
+            index = int(np.searchsorted(records["time"], target, side="right")) - 1
+            index = max(self.index, min(index, n - 1))
+            if index > self.index:
+                self._add_events(self.index, index)
+                self._add_energy(self.index + 1, index + 1)
+                self.index = index
+            if self.index == n - 1:
+                self.playing = False     # 끝까지 재생함
+        return self.frame()
+
+    def _add_events(self, start, end):
+        """레코드 start → end 사이의 상태 변화를 로그에 추가"""
+        if end <= start:
+            return
+        window = self.reader.records[start:end + 1]
+        tick_seconds = self.reader.tick_seconds
+        for i, code, compartment, value in transitions(window):
+            # 레코드는 틱이 끝난 뒤 기록됨 → 이벤트는 그 틱 시작 시점
+            record = window[i]
+            self.events.add(int(record["tick"]) - 1, float(record["time"]) - tick_seconds,
+                            code, compartment, value)
+
+    def _extend_checkpoints(self, block):
+        """block 번째 체크포인트까지 없는 것만 계산 (블록마다 한 번)"""
+        checkpoints = self._energy_checkpoints
+        while len(checkpoints) <= block:
+            meter = copy.copy(checkpoints[-1])
+            start = (len(checkpoints) - 1) * ENERGY_BLOCK
+            window = self.reader.records[start:start + ENERGY_BLOCK]
+            meter.add_samples(window["compressor_on"], window["damper_open"],
+                              self.reader.tick_seconds)
+            checkpoints.append(meter)
+
+    def _add_energy(self, start, end):
+        """레코드 [start, end) 의 압축기 / 댐퍼 상태를 에너지 집계에 추가"""
+        window = self.reader.records[start:end]
+        self.energy.add_samples(window["compressor_on"], window["damper_open"],
+                                self.reader.tick_seconds)
+
+    # === 현재 위치의 StateFrame ===
+    def frame(self):
+        records = self.reader.records
+        if len(records) == 0:
+            empty = _stats(np.empty(0))
+            return StateFrame(0, 0.0, math.nan, math.nan, math.nan, math.nan,
+                              False, False, True, True, True, 0, 0, 0,
+                              empty, empty, self.events.total,
+                              self.events.tail(EVENT_TAIL), self.energy.snapshot())
+
+        i = self.index
+        r = records[i]
+        stats = records[max(0, i - STATS_WINDOW + 1):i + 1]
+        return StateFrame(
+            int(r["tick"]), float(r["time"]),
+            float(r["fridge_temp"]), float(r["freezer_temp"]),
+            float(r["fridge_target"]), float(r["freezer_target"]),
+            bool(r["compressor_on"]), bool(r["damper_open"]),
+            bool(r["fridge_sensor_ok"]), bool(r["freezer_sensor_ok"]), bool(r["arduino_connected"]),
+            int(r["fridge_sensor_fail_timer"]), int(r["freezer_sensor_fail_timer"]),
+            int(r["arduino_fail_timer"]),
+            _stats(np.asarray(stats["fridge_temp"])), _stats(np.asarray(stats["freezer_temp"])),
+            self.events.total, self.events.tail(EVENT_TAIL), self.energy.snapshot(),
+        )
@@ -0,0 +1,5 @@
+"""테스트 공통 설정 - simulator_code 모듈을 바로 import 할 수 있게 경로 추가"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "simulator_code"))
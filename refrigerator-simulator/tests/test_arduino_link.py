@@ -0,0 +1,64 @@
+"""arduino_link: CRC 프레임 인코딩 / 디코딩, 가상 Arduino 루프백"""
+from arduino_link import (COMMAND, SENSOR, ArduinoBridge, FrameDecoder, VirtualArduino, crc16,
+                          decode_command, decode_sensor, encode, encode_command,
+                          encode_sensor, loopback_pair, run_loopback)
+from fridge_engine import ControlOutput, ControlState, FridgeEngine
+from sim_clock import SimClock
+
+
+def test_crc16_ccitt_false_check_value():
+    assert crc16(b"123456789") == 0x29B1
+
+
+def test_sensor_and_command_round_trip():
+    state = ControlState(3.14, -18.5, 3.0, -18.0, True, False)
+    frames = FrameDecoder().feed(encode_sensor(7, state, fridge_ok=False))
+    assert [(f.kind, f.seq) for f in frames] == [(SENSOR, 7)]
+    decoded, sensors_ok = decode_sensor(frames[0].payload)
+    assert decoded == state and not sensors_ok
+
+    frames = FrameDecoder().feed(encode_command(8, 7, ControlOutput(True, True)))
+    assert decode_command(frames[0].payload) == (7, ControlOutput(True, True))
+    assert frames[0].kind == COMMAND
+
+
+def test_decoder_reassembles_fragments():
+    data = b"".join(encode(SENSOR, seq, bytes([seq])) for seq in range(5))
+    decoder = FrameDecoder()
+    frames = []
+    for i in range(len(data)):
+        frames += decoder.feed(data[i:i + 1])
+    assert [f.seq for f in frames] == [0, 1, 2, 3, 4]
+    assert decoder.crc_errors == 0 and decoder.lost == 0
+
+
+def test_decoder_drops_corrupted_frame_and_resyncs():
+    frames = [bytearray(encode(SENSOR, seq, b"\x01\x02\x03")) for seq in range(3)]
+    frames[1][-3] ^= 0xFF                      # 가운데 프레임 payload 1바이트 깨짐
+    decoder = FrameDecoder()
+    received = decoder.feed(b"".join(frames))
+    assert [f.seq for f in received] == [0, 2]
+    assert decoder.crc_errors >= 1 and decoder.lost == 1
+
+
+def test_decoder_skips_garbage_and_bad_length():
+    frame = encode(SENSOR, 1, b"\x00")
+    bad_length = b"\xaa\x55\x01\x00\x00\xff"   # len 255 > MAX_PAYLOAD
+    decoder = FrameDecoder()
+    received = decoder.feed(b"\x00\x13" + bad_length + frame)
+    assert [f.seq for f in received] == [1]
+    assert decoder.crc_errors >= 1
+
+
+def test_loopback_link_runs_without_errors():
+    """오류 없는 루프백 링크로 가상 Arduino 가 제어 (응답은 한 틱 늦음)"""
+    clock = SimClock()
+    host, device = loopback_pair(115200, clock=lambda: clock.elapsed)
+    engine = FridgeEngine(seed=1, clock=clock, link=ArduinoBridge(host, timeout=1.0))
+    run_loopback(engine, VirtualArduino(device), ticks=3000)
+
+    summary = engine.link.summary()
+    assert summary["crc_errors"] == 0 and summary["lost"] == 0 and summary["timeouts"] == 0
+    assert summary["frames_received"] > 2900
+    assert engine.arduino_connected
+    assert 1.0 < engine.fridge_stats.mean < 6.0
@@ -0,0 +1,88 @@
+"""async_runtime: 구독 큐 정책 / 구독 해지"""
+import asyncio
+
+from async_runtime import AsyncRuntime, BLOCK, DROP_NEWEST, DROP_OLDEST
+from fridge_engine import FridgeEngine
+
+
+def run(coro, timeout=10.0):
+    return asyncio.run(asyncio.wait_for(coro, timeout))
+
+
+def test_unsubscribe_full_block_subscriber_does_not_hang():
+    """BLOCK 구독자가 큐가 꽉 찬 채로 해지해도 유닛은 끝까지 진행"""
+    async def main():
+        runtime = AsyncRuntime()
+        runtime.add_unit(0)
+        sub = runtime.subscribe(0, maxsize=2, policy=BLOCK)
+
+        async def reader():
+            while sub.queue.qsize() < 2:     # 큐가 찰 때까지 읽지 않음
+                await asyncio.sleep(0)
+            await asyncio.sleep(0.01)        # 유닛이 put 에서 기다리는 중
+            runtime.unsubscribe(sub)
+
+        await asyncio.gather(runtime.run(ticks=50), reader())
+        return runtime, sub
+
+    runtime, sub = run(main())
+    assert runtime.engine(0).tick_count == 50
+    assert sub.delivered == 2
+
+
+def test_default_unit_engine_is_small_and_same_as_full_engine():
+    """add_unit 기본 엔진은 작은 로그 / 노이즈 블록, 같은 seed 면 기본 엔진과 같은 결과"""
+    runtime = AsyncRuntime(event_capacity=64, block_size=128)
+    engine = runtime.add_unit(0)
+    assert engine.events.capacity == 64
+    assert engine.noise.fridge.block_size == 128
+
+    small = FridgeEngine(seed=3, event_capacity=64, block_size=128)
+    full = FridgeEngine(seed=3)
+    small.run(2000)
+    full.run(2000)
+    assert small.fridge_temp == full.fridge_temp
+    assert small.freezer_temp == full.freezer_temp
+
+
+def run_with_slow_reader(policy, maxsize=4, ticks=100):
+    """구독자가 유닛이 끝날 때까지 읽지 않고, 끝난 뒤에 한꺼번에 읽음"""
+    async def main():
+        runtime = AsyncRuntime()
+        runtime.add_unit(0)
+        sub = runtime.subscribe(0, maxsize=maxsize, policy=policy)
+        await runtime.run(ticks=ticks)
+        return runtime, sub, [frame.tick async for frame in sub]
+
+    return run(main())
+
+
+def test_drop_oldest_keeps_latest_frames():
+    runtime, sub, ticks = run_with_slow_reader(DROP_OLDEST)
+    assert ticks == [97, 98, 99, 100]
+    assert sub.delivered == 100 and sub.dropped == 96
+
+
+def test_drop_newest_keeps_first_frames():
+    runtime, sub, ticks = run_with_slow_reader(DROP_NEWEST)
+    assert ticks == [1, 2, 3, 4]
+    assert sub.delivered == 4 and sub.dropped == 96
+
+
+def test_block_slows_unit_to_reader():
+    """BLOCK: 유닛은 구독자가 읽은 만큼만 앞서 나감 (프레임 손실 없음)"""
+    async def main():
+        runtime = AsyncRuntime()
+        runtime.add_unit(0)
+        sub = runtime.subscribe(0, maxsize=2, policy=BLOCK)
+        task = asyncio.ensure_future(runtime.run(ticks=50))
+        for _ in range(20):
+            await asyncio.sleep(0)
+        ahead = runtime.engine(0).tick_count      # 아무것도 안 읽었을 때
+        frames = [frame.tick async for frame in sub]
+        await task
+        return ahead, frames
+
+    ahead, frames = run(main())
+    assert ahead <= 3                              # 큐 2칸 + put 에서 기다리는 1개
+    assert frames == list(range(1, 51))
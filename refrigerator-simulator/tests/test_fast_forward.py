@@ -0,0 +1,50 @@
+"""fast_forward: 한 틱씩 진행한 결과와의 일치"""
+import math
+
+from controllers import PIDController
+from fast_forward import can_fast_forward, fast_forward
+from fridge_engine import FridgeEngine
+from trace_file import TraceReader, TraceWriter
+from trace_replay import TracePlayer
+
+TICKS = 36000   # 1시간
+
+
+def test_idle_run_jumps_and_matches_full_run():
+    full = FridgeEngine(seed=1)
+    full.run(TICKS)
+    fast = FridgeEngine(seed=1)
+    jumps, steps = fast_forward(fast, TICKS)
+
+    assert fast.tick_count == full.tick_count == TICKS
+    assert jumps > 0 and steps < TICKS // 2
+    assert math.isclose(fast.fridge_stats.mean, full.fridge_stats.mean, abs_tol=0.05)
+    assert math.isclose(fast.freezer_stats.mean, full.freezer_stats.mean, abs_tol=0.05)
+    assert math.isclose(fast.fridge_stats.std, full.fridge_stats.std, rel_tol=0.05)
+    assert math.isclose(fast.energy.kwh, full.energy.kwh, rel_tol=0.02)
+    assert abs(fast.energy.starts - full.energy.starts) <= 0.02 * full.energy.starts
+
+
+def test_trace_attached_run_steps_every_tick(tmp_path):
+    """기록기가 붙으면 건너뛰지 않음 → 트레이스 재생 에너지 = 엔진 에너지 = 전체 실행"""
+    full = FridgeEngine(seed=1)
+    full.run(TICKS)
+
+    path = str(tmp_path / "ff.trace")
+    engine = FridgeEngine(seed=1)
+    engine.recorder = TraceWriter(path, start=engine.clock.start_datetime)
+    jumps, steps = fast_forward(engine, TICKS)
+    engine.recorder.close()
+
+    reader = TraceReader(path)
+    player = TracePlayer(reader)
+    player.seek_index(len(reader) - 1)
+
+    assert jumps == 0 and steps == TICKS and len(reader) == TICKS
+    assert math.isclose(player.energy.kwh, engine.energy.kwh, rel_tol=1e-9)
+    assert math.isclose(player.energy.kwh, full.energy.kwh, rel_tol=1e-9)
+
+
+def test_other_controllers_do_not_jump():
+    assert can_fast_forward(FridgeEngine(seed=1))
+    assert not can_fast_forward(FridgeEngine(seed=1, controller=PIDController()))
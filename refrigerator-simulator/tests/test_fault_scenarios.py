@@ -0,0 +1,44 @@
+"""fault_scenarios: 시나리오 형식 검사"""
+import copy
+
+import pytest
+
+from fault_scenarios import DEFAULT_SCENARIO, run_replica, validate
+
+
+def door_open(**changes):
+    fault = {"kind": "door_open", "compartment": "fridge", "rate_per_hour": 4,
+             "heat_per_second": 0.3, "repair": {"dist": "uniform", "low": 5, "high": 40}}
+    fault.update(changes)
+    return {"name": "test", "hours": 0.01, "faults": [fault]}
+
+
+def test_default_scenario_is_valid():
+    assert validate(copy.deepcopy(DEFAULT_SCENARIO))
+
+
+@pytest.mark.parametrize("scenario, message", [
+    (door_open(kind="meteor"), "unknown fault kind"),
+    (door_open(compartment="attic"), "compartment"),
+    (door_open(rate_per_hour=-1), "rate_per_hour"),
+    (door_open(rate_per_hour="often"), "rate_per_hour"),
+    (door_open(repair=None), "missing repair"),
+    (door_open(repair={"dist": "uniform", "low": 5}), "'high'"),
+    (door_open(repair={"dist": "gamma"}), "unknown distribution"),
+    (door_open(heat_per_second=None), "heat_per_second"),
+    (door_open(heat_per_second="hot"), "heat_per_second"),
+    ({"name": "test", "faults": [{"kind": "sensor_drift", "compartment": "freezer",
+                                  "repair": {"dist": "fixed", "value": 60}}]},
+     "drift_per_hour"),
+])
+def test_invalid_fault_raises_value_error_naming_the_fault(scenario, message):
+    with pytest.raises(ValueError, match=message) as info:
+        validate(scenario)
+    assert str(info.value).startswith("test: faults[0]")
+
+
+def test_validated_scenario_runs():
+    """검사를 통과한 시나리오는 replica 실행 중에 KeyError 가 나지 않음"""
+    scenario = validate(door_open(rate_per_hour=200))
+    result = run_replica(scenario, seed=0)
+    assert result["faults"] > 0
@@ -0,0 +1,54 @@
+"""fleet_engine: 단일 엔진(FridgeEngine)과의 일치"""
+import numpy as np
+import pytest
+
+from controllers import HysteresisController, PIDController
+from fleet_engine import FleetEngine
+from fridge_engine import FridgeEngine, SimParams
+
+UNITS = 3
+TICKS = 6000    # 10분
+
+
+@pytest.mark.parametrize("make_controller", [None, HysteresisController, PIDController])
+def test_noise_free_fleet_matches_scalar_engine(make_controller):
+    """노이즈 0이면 모든 유닛이 단일 엔진과 틱마다 같은 궤적"""
+    params = SimParams(noise_std=0.0)
+    scalar = FridgeEngine(params, controller=make_controller() if make_controller else None)
+    fleet = FleetEngine(UNITS, params, seed=1,
+                        controller=make_controller() if make_controller else None)
+
+    switches = 0
+    for _ in range(TICKS):
+        was_on = scalar.compressor_on
+        scalar.step()
+        fleet.step()
+        switches += scalar.compressor_on != was_on
+        assert (fleet.compressor_on == scalar.compressor_on).all()
+        np.testing.assert_allclose(fleet.fridge_temp, scalar.fridge_temp, atol=1e-9)
+        np.testing.assert_allclose(fleet.freezer_temp, scalar.freezer_temp, atol=1e-9)
+
+    assert switches > 0
+    assert (fleet.compressor_switches == switches).all()
+    summary = fleet.summary()
+    np.testing.assert_allclose(summary["fridge_mean"], scalar.fridge_stats.mean, atol=1e-6)
+    np.testing.assert_allclose(summary["freezer_mean"], scalar.freezer_stats.mean, atol=1e-6)
+
+
+def test_noisy_fleet_statistics_match_scalar_replicas():
+    """노이즈 스트림은 달라도 여러 유닛 평균은 단일 엔진 반복 평균과 일치"""
+    ticks = 36000   # 1시간
+    replicas = []
+    for seed in range(10):
+        engine = FridgeEngine(seed=seed)
+        engine.run(ticks)
+        replicas.append((engine.fridge_stats.mean, engine.freezer_stats.mean, engine.energy.duty))
+    fridge_mean, freezer_mean, duty = np.mean(replicas, axis=0)
+
+    fleet = FleetEngine(100, seed=1)
+    fleet.run(ticks)
+    summary = fleet.summary()
+
+    assert summary["fridge_mean"].mean() == pytest.approx(fridge_mean, abs=0.05)
+    assert summary["freezer_mean"].mean() == pytest.approx(freezer_mean, abs=0.05)
+    assert summary["compressor_duty"].mean() == pytest.approx(duty, abs=0.01)